@@ -28,6 +28,8 @@ class CustomSchemaGenerator(SchemaGenerator):
         self._enhance_users_endpoint(paths)
         self._enhance_users_telegram_endpoint(paths)
         self._enhance_renewal_endpoint(paths)
+        self._enhance_feedback_classify_endpoint(paths)
+        self._enhance_feedback_stats_endpoint(paths)
 
         return schema
 
@@ -420,3 +422,155 @@ class CustomSchemaGenerator(SchemaGenerator):
                 }
             },
         }
+
+    def _enhance_feedback_classify_endpoint(self, paths):
+        """Enhance POST /api/feedback/classify with proper request/response schemas."""
+        classify_path_item = paths.get("/api/feedback/classify")
+        if not classify_path_item or "post" not in classify_path_item:
+            return
+
+        post_op = classify_path_item["post"]
+        post_op["summary"] = "Classify feedback texts"
+        post_op["description"] = (
+            "Classify a batch of feedback texts as positive, neutral or negative "
+            "with a single model call. The batch size is capped by "
+            "FEEDBACK_CLASSIFIER_MAX_BATCH_SIZE."
+        )
+
+        post_op["requestBody"] = {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["texts"],
+                        "properties": {
+                            "texts": {
+                                "type": "array",
+                                "items": {"type": "string", "maxLength": 3000},
+                                "description": "Feedback texts to classify",
+                                "example": ["The lessons were great", "Too much homework"],
+                            },
+                        },
+                    },
+                }
+            },
+        }
+
+        responses = post_op.setdefault("responses", {})
+        responses["200"] = {
+            "description": "Texts classified successfully (results are in input order)",
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "status": {"type": "string", "example": "success"},
+                            "count": {"type": "integer", "example": 2},
+                            "results": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "label": {
+                                            "type": "string",
+                                            "enum": ["positive", "neutral", "negative"],
+                                            "example": "positive",
+                                        },
+                                        "confidence": {
+                                            "type": "number",
+                                            "description": "Probability of the predicted label",
+                                            "example": 0.912,
+                                        },
+                                    },
+                                },
+                            },
+                        },
+                    },
+                }
+            },
+        }
+        responses["400"] = {
+            "description": "Bad request - missing texts, empty text or batch too large",
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "status": {"type": "string", "example": "error"},
+                            "message": {
+                                "type": "string",
+                                "example": "At most 1000 texts can be classified per request.",
+                            },
+                        },
+                    },
+                }
+            },
+        }
+        responses["401"] = {
+            "description": "Unauthorized - missing or invalid JWT token",
+        }
+        responses["503"] = {
+            "description": "Classifier model is not available on the server",
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "status": {"type": "string", "example": "error"},
+                            "message": {
+                                "type": "string",
+                                "example": "Feedback classifier is not available.",
+                            },
+                        },
+                    },
+                }
+            },
+        }
+
+    def _enhance_feedback_stats_endpoint(self, paths):
+        """Document GET /api/feedback/stats prediction-cache counters."""
+        stats_path_item = paths.get("/api/feedback/stats")
+        if not stats_path_item or "get" not in stats_path_item:
+            return
+
+        get_op = stats_path_item["get"]
+        get_op["description"] = (
+            "Prediction-cache hit/miss counters of the worker process that served the request."
+        )
+        responses = get_op.setdefault("responses", {})
+        responses["200"] = {
+            "description": "Cache statistics",
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "status": {"type": "string", "example": "success"},
+                            "model_version": {
+                                "type": "string",
+                                "description": "Content hash of the loaded model files",
+                                "example": "3f786850e387550fdab836ed7e6dc881de23001b",
+                            },
+                            "cache": {
+                                "type": "object",
+                                "properties": {
+                                    "hits": {"type": "integer", "example": 120},
+                                    "misses": {"type": "integer", "example": 30},
+                                    "hit_rate": {"type": "number", "example": 0.8},
+                                    "size": {"type": "integer", "example": 30},
+                                    "maxsize": {"type": "integer", "example": 4096},
+                                    "ttl": {"type": "number", "example": 3600.0},
+                                },
+                            },
+                        },
+                    },
+                }
+            },
+        }
+        responses["401"] = {
+            "description": "Unauthorized - missing or invalid JWT token",
+        }
+        responses["403"] = {
+            "description": "Forbidden - authenticated user is not an admin",
+        }
@@ -1,6 +1,7 @@
 """
 Serializers for API request/response validation.
 """
+from django.conf import settings
 from rest_framework import serializers
 
 from blog.models import SubscriberRequest
@@ -58,6 +59,29 @@ class RenewalResponseSerializer(serializers.Serializer):
     upload_url = serializers.URLField(read_only=True, required=False)
 
 
+class FeedbackClassifyRequestSerializer(serializers.Serializer):
+    """Serializer for batch feedback classification request."""
+    texts = serializers.ListField(
+        child=serializers.CharField(max_length=3000, allow_blank=False),
+        allow_empty=False,
+        help_text="Feedback texts to classify"
+    )
+
+    def validate_texts(self, value):
+        max_batch = settings.FEEDBACK_CLASSIFIER_MAX_BATCH_SIZE
+        if len(value) > max_batch:
+            raise serializers.ValidationError(
+                f"At most {max_batch} texts can be classified per request."
+            )
+        return value
+
+
+class FeedbackClassificationSerializer(serializers.Serializer):
+    """Serializer for a single classified text."""
+    label = serializers.CharField(read_only=True)
+    confidence = serializers.FloatField(read_only=True)
+
+
 class ErrorResponseSerializer(serializers.Serializer):
     """Serializer for error responses."""
     status = serializers.CharField(read_only=True, default="error")
@@ -8,6 +8,8 @@ from rest_framework.schemas import get_schema_view
 from .schema import CustomSchemaGenerator
 from .views import (
     AdminTokenView,
+    FeedbackClassificationView,
+    FeedbackClassifierStatsView,
     SwaggerUIView,
     UserDetailByEmailView,
     UserDetailByTelegramView,
@@ -21,6 +23,8 @@ urlpatterns = [
     path('users', UserDetailByEmailView.as_view(), name='user-by-email'),
     path('users/telegram', UserDetailByTelegramView.as_view(), name='user-by-telegram'),
     path('user/request_renew', UserRenewalRequestView.as_view(), name='user-renewal'),
+    path('feedback/classify', FeedbackClassificationView.as_view(), name='feedback-classify'),
+    path('feedback/stats', FeedbackClassifierStatsView.as_view(), name='feedback-stats'),
     path('docs/', SwaggerUIView.as_view(), name='swagger-ui'),
     path(
         'schema/',
@@ -10,11 +10,18 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import AccessToken
+from blog.classifier import (
+    ClassifierUnavailable,
+    classify_texts,
+    get_model_version,
+    get_prediction_cache,
+)
 from blog.models import Cohort, SubscriberRequest
 from blog.google_api_utils import get_or_create_renewal_url
 from users.models import UserProfile
 
 from .serializers import (
+    FeedbackClassifyRequestSerializer,
     RenewalRequestSerializer,
     TokenRequestSerializer,
 )
@@ -361,6 +368,65 @@ class UserRenewalRequestView(APIView):
             ), None
 
 
+class FeedbackClassificationView(APIView):
+    """
+    Classify a batch of feedback texts as positive, neutral or negative.
+
+    POST /api/feedback/classify
+
+    Runs one vectorized prediction over the whole batch.
+    Requires JWT authentication.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = FeedbackClassifyRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            logger.warning("Feedback classification validation failed: %s", serializer.errors)
+            first_error = next(iter(serializer.errors.values()))
+            if isinstance(first_error, dict):
+                first_error = next(iter(first_error.values()))
+            return Response(
+                {"status": "error", "message": str(first_error[0])},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        texts = serializer.validated_data["texts"]
+        try:
+            results = classify_texts(texts)
+        except ClassifierUnavailable as e:
+            logger.error("Feedback classification failed: %s", e)
+            return Response(
+                {"status": "error", "message": str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        logger.info("Classified %s feedback texts for user_id=%s", len(texts), request.user.pk)
+        return Response({
+            "status": "success",
+            "count": len(results),
+            "results": results,
+        })
+
+
+class FeedbackClassifierStatsView(APIView):
+    """
+    Report prediction-cache statistics for the feedback classifier.
+
+    GET /api/feedback/stats
+
+    Counters are per worker process. Requires admin JWT authentication.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "status": "success",
+            "model_version": get_model_version(),
+            "cache": get_prediction_cache().stats(),
+        })
+
+
 class SwaggerUIView(TemplateView):
     """Render Swagger UI that uses the OpenAPI schema endpoint."""
     template_name = "swagger-ui.html"
@@ -5,4 +5,11 @@ source /home/ubuntu/mmdt-web-app/myenv/bin/activate
 
 # Change directory to the location of manage.py
 cd /home/ubuntu/mmdt-web-app/mmdt
+mkdir -p logs
+
+# Background workers: queued jobs (Drive folders, sheet rows, ...) and outbox emails.
+# Without them those jobs and emails are queued but never processed.
+nohup python3 manage.py run_jobs >> logs/run_jobs.out 2>&1 &
+nohup python3 manage.py send_queued_emails >> logs/send_queued_emails.out 2>&1 &
+
 python3 manage.py runserver 0.0.0.0:8000
@@ -1,13 +1,16 @@
 #!/bin/bash
 
-# Find the process ID (PID) of the Python application running on port 8000
-PID=$(ps aux | grep "python3 manage.py runserver 0.0.0.0:8000" | grep -v grep | awk '{print $2}')
+# Stop the web server (port 8000) and the background workers started by start.sh
+for CMD in "python3 manage.py runserver 0.0.0.0:8000" "python3 manage.py run_jobs" "python3 manage.py send_queued_emails"; do
+    # Find the process ID (PID) of the command
+    PID=$(ps aux | grep "$CMD" | grep -v grep | awk '{print $2}')
 
-# Check if a PID was found
-if [ -n "$PID" ]; then
-    # Kill the process
-    kill $PID
-    echo "Process with PID $PID killed."
-else
-    echo "No process found running on port 8000."
-fi
+    # Check if a PID was found
+    if [ -n "$PID" ]; then
+        # Kill the process
+        kill $PID
+        echo "Process with PID $PID ($CMD) killed."
+    else
+        echo "No process found for: $CMD"
+    fi
+done
@@ -1,7 +1,12 @@
 from django.contrib import admin
+from django.utils import timezone
 from django_summernote.admin import SummernoteModelAdmin
 
-from .models import Post, Comment, SubscriberRequest, Cohort
+from users.approvals import approve_subscriber_requests
+
+from . import search
+from .cohorts import cohorts_changed
+from .models import BackgroundJob, OutboundEmail, Post, Comment, SubscriberRequest, Cohort
 
 
 class PostAdmin(SummernoteModelAdmin):
@@ -11,6 +16,12 @@ class PostAdmin(SummernoteModelAdmin):
     search_fields = ['title', 'content']
     prepopulated_fields = {'slug': ('title',)}
 
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index instead of LIKE scans over the post HTML.
+        if not search_term or not search.is_supported():
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=search.search_post_ids(search_term)), False
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -51,6 +62,10 @@ class SubscriberRequestAdmin(admin.ModelAdmin):
         ('Status', {
             'fields': ('status', 'message')
         }),
+        ('Google Drive', {
+            'fields': ('drive_folder_url', 'drive_folder_id'),
+            'classes': ('collapse',)
+        }),
         ('Metadata', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -58,17 +73,26 @@ class SubscriberRequestAdmin(admin.ModelAdmin):
     )
 
     def approve_requests(self, request, queryset):
-        """Approve selected requests by calling save() on each to trigger signals."""
-        count = 0
-        for subscriber_request in queryset:
-            subscriber_request.status = 'approved'
-            subscriber_request.save()
-            count += 1
+        """Approve selected requests in bulk (same result as saving each one, see users.approvals)."""
+        result = approve_subscriber_requests(queryset)
+        count = len(result['new_users']) + len(result['existing_users'])
         self.message_user(
             request,
             f'Successfully approved {count} subscriber request(s). Users have been created where applicable.',
             level='success'
         )
+        if result['expired']:
+            self.message_user(
+                request,
+                f"{len(result['expired'])} request(s) were past their expiry date and marked expired.",
+                level='warning'
+            )
+        if result['skipped']:
+            self.message_user(
+                request,
+                f"Skipped (username used by another account): {', '.join(result['skipped'])}",
+                level='error'
+            )
     approve_requests.short_description = "Approve selected requests"
 
     def reject_requests(self, request, queryset):
@@ -108,6 +132,10 @@ class CohortAdmin(admin.ModelAdmin):
             'fields': ('exp_date_6', 'exp_date_12'),
             'description': 'Set expiry dates for 6-month and 12-month plans'
         }),
+        ('Google Drive', {
+            'fields': ('drive_folder_id',),
+            'classes': ('collapse',)
+        }),
         ('Metadata', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -124,10 +152,46 @@ class CohortAdmin(admin.ModelAdmin):
 
     def open_registration(self, request, queryset):
         queryset.update(is_active=True)
+        cohorts_changed()  # update() sends no post_save
         self.message_user(request, f'{queryset.count()} cohort(s) opened for registration.')
     open_registration.short_description = "Open registration for selected cohorts"
 
     def close_registration(self, request, queryset):
         queryset.update(is_active=False)
+        cohorts_changed()
         self.message_user(request, f'{queryset.count()} cohort(s) closed for registration.')
     close_registration.short_description = "Close registration for selected cohorts"
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'status', 'attempts', 'max_attempts', 'run_at', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['name', 'payload', 'attempts', 'locked_at', 'locked_by', 'last_error',
+                       'created_at', 'updated_at', 'finished_at']
+    actions = ['retry_jobs']
+
+    def retry_jobs(self, request, queryset):
+        count = queryset.exclude(status=BackgroundJob.RUNNING).update(
+            status=BackgroundJob.QUEUED, attempts=0, run_at=timezone.now(), finished_at=None
+        )
+        self.message_user(request, f'{count} job(s) queued again.')
+    retry_jobs.short_description = "Run selected jobs again"
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['id', 'subject', 'to', 'status', 'attempts', 'send_after', 'created_at', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['subject', 'to', 'last_error']
+    readonly_fields = ['subject', 'body', 'html_body', 'from_email', 'to', 'attempts', 'locked_at', 'locked_by',
+                       'last_error', 'created_at', 'sent_at']
+    actions = ['retry_emails']
+
+    def retry_emails(self, request, queryset):
+        count = queryset.filter(status=OutboundEmail.FAILED).update(
+            status=OutboundEmail.QUEUED, attempts=0, send_after=timezone.now()
+        )
+        self.message_user(request, f'{count} email(s) queued again.')
+    retry_emails.short_description = "Send selected failed emails again"
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BlogConfig(AppConfig):
@@ -7,3 +8,7 @@ class BlogConfig(AppConfig):
 
     def ready(self):
         import blog.signals
+
+        if getattr(settings, 'FEEDBACK_CLASSIFIER_PRELOAD', False):
+            from blog.classifier import warm_classifier
+            warm_classifier()
@@ -0,0 +1,26 @@
+"""
+Feedback classifier used by the PlayGround view.
+
+The model is loaded once per worker process (see ``registry``) and shared by
+all requests. Concurrent single-text calls are coalesced into one vectorized
+prediction (see ``batching``), and repeated inputs are answered from a
+bounded LRU/TTL cache (see ``cache``).
+"""
+from .batching import MicroBatcher, classify_text
+from .cache import PredictionCache, get_prediction_cache
+from .registry import get_classifier, get_model_version, reset_classifier, warm_classifier
+from .scoring import ClassifierUnavailable, classify_texts, predict_texts
+
+__all__ = [
+    'ClassifierUnavailable',
+    'MicroBatcher',
+    'PredictionCache',
+    'classify_text',
+    'classify_texts',
+    'get_classifier',
+    'get_model_version',
+    'get_prediction_cache',
+    'predict_texts',
+    'reset_classifier',
+    'warm_classifier',
+]
@@ -0,0 +1,196 @@
+"""
+Pickle-free artifact format for the feedback classifier.
+
+The sklearn pipeline (``TfidfVectorizer`` + ``MultinomialNB``) is exported to a
+directory of plain ``.npy`` arrays plus a small ``meta.json``::
+
+    vocabulary.npy          sorted UTF-8 terms (fixed-width bytes)
+    feature_index.npy       column of each term in ``vocabulary.npy``
+    idf.npy                 idf weight per column
+    feature_log_prob.npy    per-column class log-likelihoods, (n_features, n_classes)
+    class_log_prior.npy     class log priors
+    classes.npy             class labels
+
+``ArtifactClassifier`` memory-maps those arrays, so every worker process on a
+host shares the same page-cache pages, and reproduces ``predict`` /
+``predict_proba`` of the original pipeline without importing scikit-learn
+(identical labels; probabilities equal up to floating-point summation order).
+"""
+import json
+import os
+import re
+
+import numpy as np
+
+FORMAT_VERSION = 1
+META_FILENAME = 'meta.json'
+ARRAY_NAMES = (
+    'vocabulary',
+    'feature_index',
+    'idf',
+    'feature_log_prob',
+    'class_log_prior',
+    'classes',
+)
+
+
+class UnsupportedPipeline(ValueError):
+    """Raised when a pipeline cannot be represented by the artifact format."""
+
+
+def _check_vectorizer(vectorizer):
+    params = vectorizer.get_params()
+    unsupported = {
+        'analyzer': 'word',
+        'ngram_range': (1, 1),
+        'preprocessor': None,
+        'tokenizer': None,
+        'stop_words': None,
+        'strip_accents': None,
+        'binary': False,
+        'use_idf': True,
+    }
+    for name, expected in unsupported.items():
+        if params.get(name) != expected:
+            raise UnsupportedPipeline(
+                f"TfidfVectorizer.{name}={params.get(name)!r} is not supported "
+                f"(expected {expected!r})"
+            )
+    if params.get('norm') not in ('l2', None):
+        raise UnsupportedPipeline(f"TfidfVectorizer.norm={params.get('norm')!r} is not supported")
+
+
+def export_artifact(pipeline, directory):
+    """
+    Write ``pipeline`` to ``directory`` in the artifact format.
+
+    Args:
+        pipeline: Fitted sklearn ``Pipeline`` of ``TfidfVectorizer`` then ``MultinomialNB``
+        directory: Target directory (created if missing)
+
+    Returns:
+        str: The artifact directory
+
+    Raises:
+        UnsupportedPipeline: If the pipeline uses features the engine cannot reproduce
+    """
+    steps = getattr(pipeline, 'steps', None)
+    if not steps or len(steps) != 2:
+        raise UnsupportedPipeline("Expected a two-step Pipeline (vectorizer, classifier)")
+    vectorizer, model = steps[0][1], steps[1][1]
+    if not hasattr(vectorizer, 'idf_') or not hasattr(vectorizer, 'vocabulary_'):
+        raise UnsupportedPipeline("First step must be a fitted TfidfVectorizer")
+    if not hasattr(model, 'feature_log_prob_') or not hasattr(model, 'class_log_prior_'):
+        raise UnsupportedPipeline("Second step must be a fitted MultinomialNB")
+    _check_vectorizer(vectorizer)
+
+    # Sort by encoded bytes so the engine can binary-search UTF-8 tokens.
+    encoded = sorted((term.encode('utf-8'), column) for term, column in vectorizer.vocabulary_.items())
+    arrays = {
+        'vocabulary': np.array([term for term, _ in encoded], dtype=np.bytes_),
+        'feature_index': np.array([column for _, column in encoded], dtype=np.int32),
+        'idf': np.ascontiguousarray(vectorizer.idf_, dtype=np.float64),
+        'feature_log_prob': np.ascontiguousarray(model.feature_log_prob_.T, dtype=np.float64),
+        'class_log_prior': np.ascontiguousarray(model.class_log_prior_, dtype=np.float64),
+        'classes': np.array([str(label) for label in model.classes_]),
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    for name in ARRAY_NAMES:
+        np.save(os.path.join(directory, f'{name}.npy'), arrays[name], allow_pickle=False)
+
+    params = vectorizer.get_params()
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'token_pattern': params['token_pattern'],
+        'lowercase': params['lowercase'],
+        'norm': params['norm'],
+        'sublinear_tf': params['sublinear_tf'],
+        'n_features': int(len(vectorizer.idf_)),
+    }
+    with open(os.path.join(directory, META_FILENAME), 'w') as f_out:
+        json.dump(meta, f_out, indent=2)
+    return directory
+
+
+def is_artifact(directory):
+    """True if ``directory`` looks like an exported classifier artifact."""
+    return bool(directory) and os.path.isfile(os.path.join(directory, META_FILENAME))
+
+
+class ArtifactClassifier:
+    """
+    TF-IDF + multinomial naive Bayes inference over memory-mapped arrays.
+
+    Exposes the subset of the sklearn estimator API used by the site:
+    ``classes_``, ``predict`` and ``predict_proba``.
+    """
+
+    def __init__(self, directory, mmap_mode='r'):
+        with open(os.path.join(directory, META_FILENAME)) as f_in:
+            meta = json.load(f_in)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported classifier artifact version: {meta.get('format_version')!r}")
+
+        self.directory = directory
+        self.meta = meta
+        self._token_re = re.compile(meta['token_pattern'])
+        self._lowercase = meta['lowercase']
+        self._norm = meta['norm']
+        self._sublinear_tf = meta['sublinear_tf']
+
+        load = lambda name: np.load(  # noqa: E731
+            os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode, allow_pickle=False
+        )
+        self._vocabulary = load('vocabulary')
+        self._feature_index = load('feature_index')
+        self._idf = load('idf')
+        self._feature_log_prob = load('feature_log_prob')
+        self._class_log_prior = np.asarray(load('class_log_prior'))
+        self.classes_ = np.asarray(load('classes'))
+
+    def tokenize(self, text):
+        """Split ``text`` the same way the exported ``TfidfVectorizer`` does."""
+        if self._lowercase:
+            text = text.lower()
+        return self._token_re.findall(text)
+
+    def _features(self, text):
+        """Return (column ids, tf-idf weights) for one document, ids ascending."""
+        tokens = self.tokenize(text)
+        if not tokens:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        encoded = np.array([token.encode('utf-8') for token in tokens], dtype=np.bytes_)
+        positions = np.searchsorted(self._vocabulary, encoded)
+        positions = np.minimum(positions, len(self._vocabulary) - 1)
+        known = self._vocabulary[positions] == encoded
+        if not known.any():
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        columns, counts = np.unique(self._feature_index[positions[known]], return_counts=True)
+        weights = counts.astype(np.float64)
+        if self._sublinear_tf:
+            weights = np.log(weights) + 1
+        weights *= self._idf[columns]
+        if self._norm == 'l2':
+            length = np.sqrt(np.dot(weights, weights))
+            if length > 0:
+                weights /= length
+        return columns, weights
+
+    def joint_log_likelihood(self, texts):
+        jll = np.empty((len(texts), len(self.classes_)), dtype=np.float64)
+        for row, text in enumerate(texts):
+            columns, weights = self._features(text)
+            jll[row] = weights @ self._feature_log_prob[columns] + self._class_log_prior
+        return jll
+
+    def predict_proba(self, texts):
+        jll = self.joint_log_likelihood(texts)
+        top = jll.max(axis=1, keepdims=True)
+        log_norm = top + np.log(np.exp(jll - top).sum(axis=1, keepdims=True))
+        return np.exp(jll - log_norm)
+
+    def predict(self, texts):
+        return self.classes_[np.argmax(self.joint_log_likelihood(texts), axis=1)]
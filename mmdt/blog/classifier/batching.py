@@ -0,0 +1,129 @@
+"""
+In-process micro-batching for concurrent classification requests.
+
+Each caller submits one text and blocks on a future. A background thread
+collects submissions for up to ``max_wait`` seconds (or until
+``max_batch_size`` are waiting), scores them with one vectorized call and
+hands every caller its own result.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+
+from .scoring import cache_key, get_cached, predict_texts, store_cached
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item calls into batched ``predict_batch`` calls."""
+
+    def __init__(self, predict_batch, max_batch_size=32, max_wait=0.005):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait))
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def submit(self, item):
+        """Queue ``item`` and return a ``Future`` resolved with its result."""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item, timeout=None):
+        """Submit ``item`` and wait for its result (exceptions are re-raised)."""
+        return self.submit(item).result(timeout=timeout)
+
+    def _ensure_worker(self):
+        # Threads do not survive fork(), so pre-forking servers need a fresh one per child.
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, name='classifier-micro-batcher', daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = self.predict_batch(items)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            logger.debug("Micro-batch scored %s item(s)", len(batch))
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    """Return the process-wide batcher configured from settings."""
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = MicroBatcher(
+                    predict_texts,
+                    max_batch_size=settings.FEEDBACK_CLASSIFIER_BATCH_MAX_SIZE,
+                    max_wait=settings.FEEDBACK_CLASSIFIER_BATCH_MAX_WAIT_MS / 1000,
+                )
+    return _batcher
+
+
+def classify_text(text):
+    """
+    Classify one text, batching it with concurrent callers when enabled.
+
+    Cached predictions are returned without touching the model. Batching is
+    skipped when ``FEEDBACK_CLASSIFIER_BATCH_MAX_WAIT_MS`` is 0 or
+    ``FEEDBACK_CLASSIFIER_BATCH_MAX_SIZE`` is 1.
+
+    Returns:
+        dict: ``{'label': str, 'confidence': float}``
+
+    Raises:
+        ClassifierUnavailable: If the model file is missing
+    """
+    key = cache_key(text)
+    cached = get_cached(key)
+    if cached is not None:
+        return cached
+    if (settings.FEEDBACK_CLASSIFIER_BATCH_MAX_WAIT_MS <= 0
+            or settings.FEEDBACK_CLASSIFIER_BATCH_MAX_SIZE <= 1):
+        prediction = predict_texts([text])[0]
+    else:
+        prediction = get_batcher()(text)
+    store_cached(key, prediction)
+    return dict(prediction)
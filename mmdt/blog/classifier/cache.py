@@ -0,0 +1,89 @@
+"""
+Bounded LRU/TTL cache for feedback classifier predictions.
+
+Entries are keyed by a hash of the model version and the normalized input
+text, so a model swap never serves stale predictions and inputs that differ
+only in case, punctuation or spacing share one entry.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with an optional per-entry time-to-live."""
+
+    def __init__(self, maxsize=4096, ttl=3600):
+        self.maxsize = max(0, int(maxsize))
+        self.ttl = float(ttl) if ttl else 0.0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(version, normalized_text):
+        return hashlib.sha1(f'{version}\0{normalized_text}'.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached value for ``key`` or None, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        if self.maxsize == 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_prediction_cache():
+    """Return the process-wide prediction cache configured from settings."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PredictionCache(
+                    maxsize=getattr(settings, 'FEEDBACK_CLASSIFIER_CACHE_SIZE', 4096),
+                    ttl=getattr(settings, 'FEEDBACK_CLASSIFIER_CACHE_TTL', 3600),
+                )
+    return _cache
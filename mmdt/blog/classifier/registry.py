@@ -0,0 +1,124 @@
+"""
+Process-wide registry for the feedback classifier.
+
+The model is read from disk at most once per worker process; every request
+afterwards reuses the same in-memory model. The memory-mapped artifact in
+``FEEDBACK_CLASSIFIER_ARTIFACT_DIR`` is preferred; the sklearn pickle at
+``FEEDBACK_CLASSIFIER_PATH`` is the fallback.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+
+from django.conf import settings
+
+from .artifact import ARRAY_NAMES, META_FILENAME, ArtifactClassifier, is_artifact
+
+logger = logging.getLogger(__name__)
+
+
+class ClassifierRegistry:
+    """Lazily load the classifier once and hand out the shared instance."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._classifier = None
+        self._version = ''
+        self._analyzer = None
+        self._loaded = False
+
+    @property
+    def path(self):
+        return settings.FEEDBACK_CLASSIFIER_PATH
+
+    @property
+    def artifact_dir(self):
+        return getattr(settings, 'FEEDBACK_CLASSIFIER_ARTIFACT_DIR', '')
+
+    def get(self):
+        """Return the shared classifier, or None if the model file is missing."""
+        if self._loaded:
+            return self._classifier
+        with self._lock:
+            if not self._loaded:
+                self._classifier, self._version = self._load()
+                self._analyzer = self._build_analyzer(self._classifier)
+                self._loaded = True
+        return self._classifier
+
+    @property
+    def version(self):
+        """Content hash of the loaded model files ('' if no model is loaded)."""
+        self.get()
+        return self._version
+
+    def normalize(self, text):
+        """
+        Reduce ``text`` to what the model actually sees (its token sequence), so
+        inputs differing only in case, punctuation or spacing share a cache key.
+        """
+        self.get()
+        if self._analyzer is None:
+            return ' '.join(text.lower().split())
+        return ' '.join(self._analyzer(text))
+
+    def reset(self):
+        """Drop the cached model so the next ``get()`` reloads it from disk."""
+        with self._lock:
+            self._classifier = None
+            self._version = ''
+            self._analyzer = None
+            self._loaded = False
+
+    def _load(self):
+        if is_artifact(self.artifact_dir):
+            digest = hashlib.sha1()
+            for filename in (META_FILENAME,) + tuple(f'{name}.npy' for name in ARRAY_NAMES):
+                with open(os.path.join(self.artifact_dir, filename), 'rb') as f_in:
+                    digest.update(f_in.read())
+            classifier = ArtifactClassifier(self.artifact_dir)
+            logger.info("Feedback classifier memory-mapped from %s", self.artifact_dir)
+            return classifier, digest.hexdigest()
+        try:
+            with open(self.path, 'rb') as f_in:
+                data = f_in.read()
+        except FileNotFoundError:
+            logger.warning("Feedback classifier not found at %s", self.path)
+            return None, ''
+        classifier = pickle.loads(data)
+        logger.info("Feedback classifier loaded from %s", self.path)
+        return classifier, hashlib.sha1(data).hexdigest()
+
+    @staticmethod
+    def _build_analyzer(classifier):
+        if isinstance(classifier, ArtifactClassifier):
+            return classifier.tokenize
+        steps = getattr(classifier, 'steps', None)
+        if steps and hasattr(steps[0][1], 'build_analyzer'):
+            return steps[0][1].build_analyzer()
+        return None
+
+
+registry = ClassifierRegistry()
+
+
+def get_classifier():
+    """Return the process-wide classifier (loaded on first use)."""
+    return registry.get()
+
+
+def warm_classifier():
+    """Load the classifier up front, e.g. from ``AppConfig.ready``."""
+    return registry.get()
+
+
+def get_model_version():
+    """Return the version (content hash) of the loaded classifier."""
+    return registry.version
+
+
+def reset_classifier():
+    """Forget the loaded classifier (mainly for tests and model swaps)."""
+    registry.reset()
@@ -0,0 +1,104 @@
+"""
+Vectorized scoring helpers on top of the shared feedback classifier.
+
+``classify_texts`` is the cached entry point used by every caller;
+``predict_texts`` always runs the model.
+"""
+import numpy as np
+
+from .cache import get_prediction_cache
+from .registry import get_classifier, registry
+
+
+class ClassifierUnavailable(Exception):
+    """Raised when the feedback classifier model could not be loaded."""
+
+
+def _require_classifier():
+    classifier = get_classifier()
+    if classifier is None:
+        raise ClassifierUnavailable("Feedback classifier is not available.")
+    return classifier
+
+
+def predict_texts(texts):
+    """
+    Classify a batch of texts with a single ``predict_proba`` call (no cache).
+
+    Args:
+        texts: Sequence of feedback strings
+
+    Returns:
+        list[dict]: One ``{'label': str, 'confidence': float}`` per input text,
+        where ``confidence`` is the probability of the predicted label.
+
+    Raises:
+        ClassifierUnavailable: If the model file is missing
+    """
+    classifier = _require_classifier()
+    if not texts:
+        return []
+
+    probabilities = classifier.predict_proba(list(texts))
+    best = np.argmax(probabilities, axis=1)
+    labels = classifier.classes_[best]
+    confidences = probabilities[np.arange(len(best)), best]
+    return [
+        {'label': str(label), 'confidence': float(confidence)}
+        for label, confidence in zip(labels, confidences)
+    ]
+
+
+def cache_key(text):
+    """Cache key for ``text``: hash of the model version and the normalized text."""
+    return get_prediction_cache().make_key(registry.version, registry.normalize(text))
+
+
+def get_cached(key):
+    """Return a copy of the cached prediction for ``key``, or None."""
+    cached = get_prediction_cache().get(key)
+    return dict(cached) if cached is not None else None
+
+
+def store_cached(key, prediction):
+    get_prediction_cache().set(key, dict(prediction))
+
+
+def classify_texts(texts):
+    """
+    Classify a batch of texts, serving repeated inputs from the prediction cache.
+
+    Only texts missing from the cache are vectorized, each distinct one once,
+    in a single ``predict_proba`` call.
+
+    Args:
+        texts: Sequence of feedback strings
+
+    Returns:
+        list[dict]: One ``{'label': str, 'confidence': float}`` per input text
+
+    Raises:
+        ClassifierUnavailable: If the model file is missing
+    """
+    _require_classifier()
+    if not texts:
+        return []
+
+    keys = [cache_key(text) for text in texts]
+    found = {}
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key in found or key in missing:
+            continue
+        cached = get_cached(key)
+        if cached is None:
+            missing[key] = text
+        else:
+            found[key] = cached
+
+    if missing:
+        for key, prediction in zip(missing, predict_texts(list(missing.values()))):
+            store_cached(key, prediction)
+            found[key] = prediction
+
+    return [dict(found[key]) for key in keys]
@@ -0,0 +1,165 @@
+"""
+In-process cohort timeline.
+
+Cohorts change a few times a year but are looked up on every registration
+page view, ``SubscriberRequest.save()``, new user profile and several API
+calls. ``get_timeline()`` loads all cohorts once into a ``CohortTimeline``
+sorted by registration start, kept in memory per process, and answers the
+active/next-cohort questions with a binary search instead of a query.
+
+The timeline is tagged with a version stored in the shared default cache
+(``settings.CACHES``), which ``Cohort`` save/delete signals and the admin
+registration actions replace (``cohorts_changed()``). Lookups compare it at
+most every ``COHORT_VERSION_CHECK_INTERVAL`` seconds, so other workers reload
+their timeline within that interval of a change, and the process that made
+the change right away; ``COHORT_TIMELINE_TIMEOUT`` only bounds how long
+changes made without either (raw SQL) go unnoticed. Inside a transaction that
+changed a cohort, lookups read a private timeline that includes the
+uncommitted change, so a rollback never leaves it in the shared one.
+"""
+import copy
+import threading
+import time
+from bisect import bisect_right
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+VERSION_KEY = 'blog:cohorts:version'
+
+_lock = threading.Lock()
+_loaded = None  # (version, loaded_at, CohortTimeline)
+_checked_at = None  # when _loaded was last compared with the shared version
+
+
+def get_timeout():
+    return getattr(settings, 'COHORT_TIMELINE_TIMEOUT', 300)
+
+
+def get_check_interval():
+    return getattr(settings, 'COHORT_VERSION_CHECK_INTERVAL', 5)
+
+
+def get_cohort_version():
+    """Return the current cohort timeline version, creating one if it is missing."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_cohort_version():
+    """Make every process reload its cohort timeline (this one on the next lookup)."""
+    global _checked_at
+    cache.set(VERSION_KEY, time.time_ns(), None)
+    _checked_at = None
+
+
+def _changed_in_transaction(connection):
+    return connection.in_atomic_block and getattr(connection, '_cohort_change_block', None) is connection.atomic_blocks[0]
+
+
+def _committed(using):
+    connections[using]._cohort_change_block = None
+    bump_cohort_version()
+
+
+def cohorts_changed(using=DEFAULT_DB_ALIAS):
+    """Record a ``Cohort`` save/delete on database ``using``."""
+    bump_cohort_version()
+    connection = connections[using]
+    if connection.in_atomic_block:
+        connection._cohort_change_block = connection.atomic_blocks[0]
+        transaction.on_commit(partial(_committed, using), using=using)
+
+
+class CohortTimeline:
+    """
+    Cohorts sorted by ``reg_start_date`` with interval lookups.
+
+    Returned cohorts are copies, so callers may attach them to other objects
+    (or change them) without affecting the shared timeline.
+    """
+
+    def __init__(self, cohorts):
+        self.cohorts = sorted(cohorts, key=lambda c: (c.reg_start_date, c.cohort_id))
+        self._starts = [c.reg_start_date for c in self.cohorts]
+        # Latest registration end among cohorts[:i + 1], overall and for active
+        # cohorts only: once it is before the date, no earlier window can contain it.
+        self._max_end = self._running_max(self.cohorts)
+        self._max_active_end = self._running_max(self.cohorts, active_only=True)
+
+    @staticmethod
+    def _running_max(cohorts, active_only=False):
+        running, result = None, []
+        for cohort in cohorts:
+            if not active_only or cohort.is_active:
+                if running is None or cohort.reg_end_date > running:
+                    running = cohort.reg_end_date
+            result.append(running)
+        return result
+
+    def __len__(self):
+        return len(self.cohorts)
+
+    def registration_cohort(self, when=None, active_only=True):
+        """
+        Cohort whose registration window contains ``when``.
+
+        Args:
+            when: Date to look up (default: now)
+            active_only: Ignore cohorts with ``is_active=False``
+
+        Returns:
+            Cohort | None: The matching cohort with the latest registration
+            start, like ``filter(...).order_by('-reg_start_date').first()``
+        """
+        if when is None:
+            when = timezone.now()
+        max_end = self._max_active_end if active_only else self._max_end
+        i = bisect_right(self._starts, when) - 1
+        while i >= 0 and max_end[i] is not None and max_end[i] >= when:
+            cohort = self.cohorts[i]
+            if cohort.reg_end_date >= when and (cohort.is_active or not active_only):
+                return copy.copy(cohort)
+            i -= 1
+        return None
+
+    def starting_after(self, when, skip=1):
+        """
+        The ``skip``-th cohort whose registration starts strictly after ``when``.
+
+        Returns:
+            Cohort | None
+        """
+        i = bisect_right(self._starts, when) + skip - 1
+        if skip < 1 or i >= len(self.cohorts):
+            return None
+        return copy.copy(self.cohorts[i])
+
+
+def get_timeline():
+    """Return this process's ``CohortTimeline``, reloading it if it is stale."""
+    global _loaded, _checked_at
+    from .models import Cohort
+
+    if _changed_in_transaction(connections[DEFAULT_DB_ALIAS]):
+        return CohortTimeline(Cohort.objects.all())
+    loaded, checked_at, now = _loaded, _checked_at, time.monotonic()
+    if (
+        loaded is not None and checked_at is not None
+        and now - checked_at < get_check_interval() and now - loaded[1] < get_timeout()
+    ):
+        return loaded[2]
+    version = get_cohort_version()
+    with _lock:
+        loaded = _loaded
+        if loaded is None or loaded[0] != version or now - loaded[1] >= get_timeout():
+            loaded = (version, time.monotonic(), CohortTimeline(Cohort.objects.all()))
+            _loaded = loaded
+        _checked_at = now
+    return loaded[2]
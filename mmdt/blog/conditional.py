@@ -0,0 +1,91 @@
+"""
+Conditional GET (ETag / Last-Modified) support for class-based views.
+
+Views describe their content with ``get_etag_parts()`` and optionally
+``get_last_modified()``; ``ConditionalGetMixin`` answers matching
+``If-None-Match`` / ``If-Modified-Since`` requests with 304 before any
+template is rendered, and adds both headers to full responses.
+
+Every page extends ``base.html``, which shows the signed-in user's name and
+a CSRF token, so the viewer (user id and CSRF cookie) is always part of the
+ETag and no browser is ever served another visitor's copy. For the same
+reason Last-Modified, which cannot tell viewers apart, is only used for
+anonymous requests.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+# Used when DEPLOY_VERSION is not configured: every restart counts as a deploy.
+_PROCESS_STARTED = str(time.time_ns())
+
+
+def get_deploy_version():
+    return getattr(settings, 'DEPLOY_VERSION', '') or _PROCESS_STARTED
+
+
+def viewer_key(request):
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return 'anon'
+    return f"{user.pk}:{request.META.get('CSRF_COOKIE', '')}"
+
+
+def make_etag(request, *parts):
+    """Build a quoted strong ETag from ``parts``, the viewer and the deploy version."""
+    value = '|'.join(str(part) for part in (get_deploy_version(), viewer_key(request)) + parts)
+    return quote_etag(hashlib.sha1(value.encode('utf-8')).hexdigest())
+
+
+class ConditionalGetMixin:
+    """Answer conditional GET/HEAD requests with 304 when the page is unchanged."""
+
+    def get_etag_parts(self):
+        """
+        Values the rendered page depends on (besides viewer and deploy version).
+
+        Returns:
+            tuple | None: ETag inputs, or None to skip conditional handling
+        """
+        return ()
+
+    def get_last_modified(self):
+        """Return an aware datetime of the last content change, or None."""
+        return None
+
+    def not_modified(self, response):
+        """Hook called before a 304 response is returned."""
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+
+        parts = self.get_etag_parts()
+        if parts is None:
+            return super().dispatch(request, *args, **kwargs)
+        etag = make_etag(request, *parts)
+        last_modified = self.get_last_modified() if viewer_key(request) == 'anon' else None
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            return self.not_modified(response)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            if not response.has_header('ETag'):
+                response.headers['ETag'] = etag
+            if timestamp is not None and not response.has_header('Last-Modified'):
+                response.headers['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class StaticPageMixin(ConditionalGetMixin):
+    """Conditional GET for template-only pages: they change only on deploy."""
+
+    def get_etag_parts(self):
+        return (self.template_name,)
@@ -0,0 +1,115 @@
+"""
+RSS and Atom feeds of published posts.
+
+Feed readers poll often, so the items come from ``get_cached_list()`` and
+are only queried again after a ``Post`` is saved or deleted. Descriptions
+use the pre-rendered ``excerpt``; the full ``content`` is never loaded.
+
+Feed readers cannot log in, so the subscriber feed is reached through a
+per-user URL carrying a signed token (``get_subscriber_feed_url()``) instead
+of a session. The token includes the subscription expiry, so a renewal
+issues a new URL, and it is only accepted while the user is active and the
+subscription has not expired.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core import signing
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+
+from .models import Post
+from .post_cache import get_cached_list
+
+
+SUBSCRIBER_FEED_SALT = 'blog.feeds.subscribers'
+
+
+def get_feed_size():
+    return getattr(settings, 'POST_FEED_ITEMS', 20)
+
+
+def _feed_access(user):
+    """What a feed token is tied to: the user and the end of their subscription."""
+    profile = getattr(user, 'profile', None)
+    expiry_date = profile.expiry_date if profile else None
+    return [user.pk, expiry_date.isoformat() if expiry_date else None]
+
+
+def _has_feed_access(user):
+    profile = getattr(user, 'profile', None)
+    if not user.is_active or (profile and profile.expired):
+        return False
+    return not (profile and profile.expiry_date and profile.expiry_date <= timezone.now())
+
+
+def get_subscriber_feed_url(user):
+    """Return the subscriber feed URL for ``user``."""
+    token = signing.dumps(_feed_access(user), salt=SUBSCRIBER_FEED_SALT)
+    return reverse('post_feed_subscribers', kwargs={'token': token})
+
+
+class LatestPostsFeed(Feed):
+    """RSS feed of the latest public posts."""
+    title = 'Myanmar Data Tech'
+    link = reverse_lazy('home')
+    description = 'Latest posts from Myanmar Data Tech.'
+    post_cache_audience = 'public'
+    subscribers_only = False
+
+    def items(self):
+        queryset = (
+            Post.objects.filter(status=1, subscribers_only=self.subscribers_only)
+            .select_related('author')
+            .defer('content', 'content_html')
+            .order_by('-created_on')[:get_feed_size()]
+        )
+        return get_cached_list(self.post_cache_audience, f'feed:{get_feed_size()}', queryset)
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_link(self, item):
+        return reverse('post_detail', args=[item.slug])
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.created_on
+
+    def item_updateddate(self, item):
+        return item.updated_on
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    """Atom version of ``LatestPostsFeed``."""
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class SubscriberPostsFeed(LatestPostsFeed):
+    """RSS feed of subscriber-only posts for the active user named by the URL token."""
+    title = 'Myanmar Data Tech - Subscribers'
+    link = reverse_lazy('post_list_only_subscriber')
+    description = 'Latest subscriber-only posts from Myanmar Data Tech.'
+    post_cache_audience = 'subscribers'
+    subscribers_only = True
+
+    def get_object(self, request, token):
+        try:
+            access = signing.loads(token, salt=SUBSCRIBER_FEED_SALT)
+        except signing.BadSignature:
+            raise Http404('Invalid feed token')
+        if not isinstance(access, list) or not access:
+            raise Http404('Invalid feed token')
+        user = get_object_or_404(get_user_model().objects.select_related('profile'), pk=access[0])
+        if access != _feed_access(user) or not _has_feed_access(user):
+            raise Http404('Feed token is no longer valid')
+        return user
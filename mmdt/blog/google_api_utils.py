@@ -1,21 +1,29 @@
 """
 Google Drive and Sheets API utilities for subscriber automation.
-Uses OAuth 2.0 flow with token caching.
+Uses OAuth 2.0 flow with token caching; credentials, the Drive service,
+worksheet handles and cohort folder ids are reused within the process
+(see ``blog.google_clients``).
 """
 from __future__ import annotations
 
 import logging
 import os
+import re
+import threading
 from datetime import date, datetime
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-import gspread
+from googleapiclient.errors import HttpError
 from django.conf import settings
 
+from .google_clients import GoogleClientPool
+from .models import Cohort, SheetRowIndex, SubscriberRequest
+from .sheet_buffer import buffer_row, pending_cells
+from .sheet_index import SheetEmailIndex, normalize_email
+
 if TYPE_CHECKING:
     from users.models import UserProfile
 
@@ -24,6 +32,7 @@ logger = logging.getLogger(__name__)
 PARENT_FOLDER_ID = getattr(settings, "GOOGLE_PARENT_FOLDER_ID", "")
 SPREADSHEET_ID = getattr(settings, "GOOGLE_SPREADSHEET_ID", "")
 MEMBERS_SPREADSHEET_ID = getattr(settings, "GOOGLE_MEMBERS_SPREADSHEET_ID", "")
+RAW_REGISTRATION = 'raw_registration'
 MEMBERS_WORKSHEET_NAME = getattr(settings, "GOOGLE_MEMBERS_WORKSHEET_NAME", "members")
 MMDT_ADMIN_EMAIL = getattr(
     settings,
@@ -42,6 +51,9 @@ SCOPES = [
 ]
 
 NO_COHORT_FOLDER_NAME = "NO_COHORT"
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+DRIVE_BATCH_SIZE = 100  # Drive accepts at most 100 calls per batch request
+_FOLDER_URL_ID_RE = re.compile(r'/folders/([\w-]+)')
 
 
 def resolve_drive_cohort_id(
@@ -84,9 +96,9 @@ def resolve_drive_cohort_id(
     return NO_COHORT_FOLDER_NAME
 
 
-def get_credentials():
+def _load_credentials():
     """
-    Get Google API credentials using OAuth 2.0 flow.
+    Load Google API credentials using OAuth 2.0 flow.
 
     First time: Opens browser for authorization and saves tokens.
     Subsequent times: Reuses saved tokens and refreshes if expired.
@@ -135,15 +147,160 @@ def get_credentials():
                 raise
 
         # Save tokens for next time
-        try:
-            with open(TOKEN_FILE, 'w') as token:
-                token.write(creds.to_json())
-        except Exception as e:
-            logger.warning("Failed to save tokens: %s", e)
+        _save_credentials(creds)
 
     return creds
 
 
+def _save_credentials(creds):
+    try:
+        with open(TOKEN_FILE, 'w') as token:
+            token.write(creds.to_json())
+    except Exception as e:
+        logger.warning("Failed to save tokens: %s", e)
+
+
+client_pool = GoogleClientPool(_load_credentials, _save_credentials)
+
+# Cohort folder ids under PARENT_FOLDER_ID, by cohort id.
+_cohort_folder_ids = {}
+_cohort_folder_lock = threading.Lock()
+
+
+def get_credentials():
+    """
+    Get Google API credentials, cached for the process and refreshed ahead of expiry.
+
+    Returns:
+        google.oauth2.credentials.Credentials
+
+    Raises:
+        FileNotFoundError: If OAuth client secret file doesn't exist
+    """
+    return client_pool.credentials()
+
+
+def get_drive_service():
+    """Return the Drive v3 service for the current thread."""
+    return client_pool.drive()
+
+
+def get_worksheet(spreadsheet_id, title):
+    """Return a cached gspread worksheet handle."""
+    return client_pool.worksheet(spreadsheet_id, title)
+
+
+def _raw_registration_index():
+    """Email -> row index of the raw_registration worksheet (see ``blog.sheet_index``)."""
+    return SheetEmailIndex(get_worksheet(SPREADSHEET_ID, RAW_REGISTRATION), SPREADSHEET_ID)
+
+
+def _forget_cohort_folder(cohort_id):
+    with _cohort_folder_lock:
+        _cohort_folder_ids.pop(cohort_id, None)
+    Cohort.objects.filter(cohort_id=cohort_id).update(drive_folder_id='')
+
+
+def folder_id_from_url(folder_url):
+    """Return the Drive folder id in a ``.../folders/<id>`` URL, or ''."""
+    match = _FOLDER_URL_ID_RE.search(folder_url or '')
+    return match.group(1) if match else ''
+
+
+def remember_subscriber_folder(subscriber_request, folder_url, folder_id=''):
+    """
+    Store the Drive folder of ``subscriber_request`` so later registrations and
+    renewals skip the Drive search (and the sheet lookup).
+
+    Args:
+        subscriber_request: SubscriberRequest instance
+        folder_url: Folder ``webViewLink``
+        folder_id: Folder id (parsed from the URL if omitted)
+    """
+    if not folder_url or not subscriber_request.pk:
+        return
+    subscriber_request.drive_folder_url = folder_url
+    subscriber_request.drive_folder_id = folder_id or folder_id_from_url(folder_url)
+    SubscriberRequest.objects.filter(pk=subscriber_request.pk).update(
+        drive_folder_url=subscriber_request.drive_folder_url,
+        drive_folder_id=subscriber_request.drive_folder_id,
+    )
+
+
+def list_child_folders(drive_service, parent_id):
+    """
+    List the folders directly under ``parent_id`` (all pages).
+
+    Returns:
+        dict: Folder name -> ``{'id', 'webViewLink'}`` (first folder per name)
+    """
+    query = f"'{parent_id}' in parents and mimeType='{FOLDER_MIME_TYPE}' and trashed=false"
+    folders, page_token = {}, None
+    while True:
+        results = drive_service.files().list(
+            q=query,
+            spaces='drive',
+            fields='nextPageToken, files(id, name, webViewLink)',
+            pageSize=1000,
+            pageToken=page_token,
+        ).execute()
+        for folder in results.get('files', []):
+            folders.setdefault(folder['name'], folder)
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return folders
+
+
+def execute_drive_batch(drive_service, requests):
+    """
+    Send Drive API requests through the batch endpoint, DRIVE_BATCH_SIZE per HTTP call.
+
+    Args:
+        drive_service: Google Drive API service instance
+        requests: List of ``(request_id, HttpRequest)`` pairs
+
+    Returns:
+        dict: request_id -> ``(response, exception)``; a failed request does not
+        stop the others
+    """
+    results = {}
+
+    def callback(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    for start in range(0, len(requests), DRIVE_BATCH_SIZE):
+        batch = drive_service.new_batch_http_request(callback=callback)
+        for request_id, request in requests[start:start + DRIVE_BATCH_SIZE]:
+            batch.add(request, request_id=request_id)
+        batch.execute()
+    return results
+
+
+def _create_subscriber_folder_request(drive_service, subscriber_request, cohort_folder_id):
+    # User folder: fullname|email
+    folder_metadata = {
+        'name': f"{subscriber_request.name}|{subscriber_request.email}",
+        'mimeType': FOLDER_MIME_TYPE,
+        'parents': [cohort_folder_id]
+    }
+    return drive_service.files().create(body=folder_metadata, fields='id, webViewLink')
+
+
+def _permission_requests(drive_service, folder_id, email):
+    """Requests giving the subscriber and the MMDT admin edit access to ``folder_id``."""
+    return [
+        (
+            f"{folder_id}:{grantee}",
+            drive_service.permissions().create(
+                fileId=folder_id,
+                body={'type': 'user', 'role': 'writer', 'emailAddress': grantee},
+                sendNotificationEmail=False,
+            ),
+        )
+        for grantee in (email, MMDT_ADMIN_EMAIL)
+    ]
+
+
 def create_subscriber_folder(subscriber_request, user_profile: Optional["UserProfile"] = None):
     """
     Create Google Drive folder for subscriber and set permissions.
@@ -156,49 +313,23 @@ def create_subscriber_folder(subscriber_request, user_profile: Optional["UserPro
         str: URL of the created folder, or None if creation fails
     """
     try:
-        credentials = get_credentials()
-        drive_service = build('drive', 'v3', credentials=credentials)
+        drive_service = get_drive_service()
 
         cohort_id = resolve_drive_cohort_id(subscriber_request, user_profile)
         cohort_folder_id = get_or_create_cohort_folder(drive_service, cohort_id)
 
-        # Create user folder: fullname|email
-        folder_name = f"{subscriber_request.name}|{subscriber_request.email}"
-
-        folder_metadata = {
-            'name': folder_name,
-            'mimeType': 'application/vnd.google-apps.folder',
-            'parents': [cohort_folder_id]
-        }
-
-        folder = drive_service.files().create(
-            body=folder_metadata,
-            fields='id, webViewLink'
-        ).execute()
+        folder = _create_subscriber_folder_request(drive_service, subscriber_request, cohort_folder_id).execute()
 
         folder_id = folder.get('id')
         folder_url = folder.get('webViewLink')
 
-        # Set permissions: Edit access for user and MMDT admin
-        permissions = [
-            {
-                'type': 'user',
-                'role': 'writer',
-                'emailAddress': subscriber_request.email
-            },
-            {
-                'type': 'user',
-                'role': 'writer',
-                'emailAddress': MMDT_ADMIN_EMAIL
-            }
-        ]
-
-        for permission in permissions:
-            drive_service.permissions().create(
-                fileId=folder_id,
-                body=permission,
-                sendNotificationEmail=False
-            ).execute()
+        # Both permission grants go out in one batch request
+        results = execute_drive_batch(
+            drive_service, _permission_requests(drive_service, folder_id, subscriber_request.email)
+        )
+        for _, exception in results.values():
+            if exception is not None:
+                raise exception
 
         logger.info(
             "Drive folder created for subscriber email=%s spreadsheet_id=%s folder_id=%s",
@@ -206,6 +337,7 @@ def create_subscriber_folder(subscriber_request, user_profile: Optional["UserPro
             SPREADSHEET_ID or "(unset)",
             folder_id,
         )
+        remember_subscriber_folder(subscriber_request, folder_url, folder_id)
         return folder_url
 
     except FileNotFoundError as e:
@@ -213,13 +345,93 @@ def create_subscriber_folder(subscriber_request, user_profile: Optional["UserPro
         return None
     except Exception as e:
         logger.exception("Error creating Google Drive folder for email=%s", getattr(subscriber_request, "email", ""))
+        if isinstance(e, HttpError) and e.resp.status == 404:
+            # The stored cohort folder was deleted; look it up again next time.
+            _forget_cohort_folder(resolve_drive_cohort_id(subscriber_request, user_profile))
         return None
 
 
+def provision_subscriber_folders(subscriber_requests):
+    """
+    Get or create the Drive folders of many subscribers in a few HTTP calls.
+
+    Per cohort, existing ``fullname|email`` folders come from one listing of
+    the cohort folder. Missing folders are created through batch requests,
+    then their permission grants go out in further batch requests, because
+    the grants need the new folder ids. Folders are stored on the requests
+    in the same way as ``get_folder_upload_url``.
+
+    Args:
+        subscriber_requests: Iterable of SubscriberRequest
+
+    Returns:
+        dict: SubscriberRequest pk -> folder URL, or None if its folder could
+        not be created
+    """
+    drive_service = get_drive_service()
+    urls, resolved, to_create, cohort_folders = {}, [], [], {}
+    for subscriber_request in subscriber_requests:
+        if subscriber_request.drive_folder_url:
+            urls[subscriber_request.pk] = subscriber_request.drive_folder_url
+            continue
+        cohort_id = resolve_drive_cohort_id(subscriber_request)
+        if cohort_id not in cohort_folders:
+            cohort_folder_id = get_or_create_cohort_folder(drive_service, cohort_id)
+            cohort_folders[cohort_id] = (cohort_folder_id, list_child_folders(drive_service, cohort_folder_id))
+        cohort_folder_id, existing = cohort_folders[cohort_id]
+        folder = existing.get(f"{subscriber_request.name}|{subscriber_request.email}")
+        if folder:
+            resolved.append((subscriber_request, folder))
+        else:
+            to_create.append((subscriber_request, cohort_folder_id))
+
+    created = execute_drive_batch(drive_service, [
+        (str(i), _create_subscriber_folder_request(drive_service, subscriber_request, cohort_folder_id))
+        for i, (subscriber_request, cohort_folder_id) in enumerate(to_create)
+    ])
+    new_folders, grants = {}, []
+    for i, (subscriber_request, _) in enumerate(to_create):
+        folder, exception = created.get(str(i), (None, None))
+        if exception is not None or not folder:
+            logger.error("Error creating Google Drive folder for email=%s: %s", subscriber_request.email, exception)
+            urls[subscriber_request.pk] = None
+            continue
+        new_folders[folder['id']] = (subscriber_request, folder)
+        grants.extend(_permission_requests(drive_service, folder['id'], subscriber_request.email))
+
+    for request_id, (_, exception) in execute_drive_batch(drive_service, grants).items():
+        folder_id = request_id.split(':', 1)[0]
+        if exception is not None and folder_id in new_folders:
+            subscriber_request, _ = new_folders.pop(folder_id)
+            logger.error(
+                "Error sharing Google Drive folder %s for email=%s: %s", folder_id, subscriber_request.email, exception
+            )
+            urls[subscriber_request.pk] = None
+    resolved.extend(new_folders.values())
+
+    for subscriber_request, folder in resolved:
+        subscriber_request.drive_folder_id = folder['id']
+        subscriber_request.drive_folder_url = folder.get('webViewLink', '')
+        urls[subscriber_request.pk] = subscriber_request.drive_folder_url
+    SubscriberRequest.objects.bulk_update(
+        [subscriber_request for subscriber_request, _ in resolved],
+        ['drive_folder_id', 'drive_folder_url'],
+        batch_size=500,
+    )
+    logger.info(
+        "Provisioned Drive folders: %s existing, %s created, %s failed",
+        len(resolved) - len(new_folders), len(new_folders), sum(url is None for url in urls.values()),
+    )
+    return urls
+
+
 def get_or_create_cohort_folder(drive_service, cohort_id):
     """
     Get or create cohort folder under parent folder.
 
+    The id is kept in ``Cohort.drive_folder_id`` (and cached per process), so
+    Drive is only searched the first time a cohort's folder is needed.
+
     Args:
         drive_service: Google Drive API service instance
         cohort_id: Cohort ID string
@@ -227,6 +439,19 @@ def get_or_create_cohort_folder(drive_service, cohort_id):
     Returns:
         str: Folder ID of cohort folder
     """
+    with _cohort_folder_lock:
+        folder_id = _cohort_folder_ids.get(cohort_id)
+    if not folder_id:
+        folder_id = Cohort.objects.filter(cohort_id=cohort_id).values_list('drive_folder_id', flat=True).first()
+        if not folder_id:
+            folder_id = _find_or_create_cohort_folder(drive_service, cohort_id)
+            Cohort.objects.filter(cohort_id=cohort_id).update(drive_folder_id=folder_id)
+        with _cohort_folder_lock:
+            _cohort_folder_ids[cohort_id] = folder_id
+    return folder_id
+
+
+def _find_or_create_cohort_folder(drive_service, cohort_id):
     # Search for existing cohort folder
     query = (
         f"name='{cohort_id}' and "
@@ -245,7 +470,72 @@ def get_or_create_cohort_folder(drive_service, cohort_id):
 
     if files:
         return files[0]['id']
+    return _create_cohort_folder(drive_service, cohort_id)
+
+
+def backfill_drive_folders():
+    """
+    Fill ``Cohort.drive_folder_id`` and ``SubscriberRequest.drive_folder_id``/
+    ``drive_folder_url`` for rows resolved before they were stored.
+
+    Nothing is created: cohort folders come from one listing of
+    PARENT_FOLDER_ID; subscriber folders from column H of raw_registration,
+    else from one listing per cohort folder (``fullname|email``).
 
+    Returns:
+        dict: Counts of ``cohorts`` and ``subscribers`` filled, and of
+        subscribers still ``missing`` a folder
+    """
+    drive_service = get_drive_service()
+    counts = {'cohorts': 0, 'subscribers': 0, 'missing': 0}
+
+    parent_folders = list_child_folders(drive_service, PARENT_FOLDER_ID)
+    cohorts = [
+        cohort for cohort in Cohort.objects.filter(drive_folder_id='')
+        if cohort.cohort_id in parent_folders
+    ]
+    for cohort in cohorts:
+        cohort.drive_folder_id = parent_folders[cohort.cohort_id]['id']
+    Cohort.objects.bulk_update(cohorts, ['drive_folder_id'])
+    counts['cohorts'] = len(cohorts)
+
+    pending = list(SubscriberRequest.objects.filter(drive_folder_url=''))
+    if not pending:
+        return counts
+
+    cohort_folder_ids = {name: folder['id'] for name, folder in parent_folders.items()}
+    cohort_folder_ids.update(Cohort.objects.exclude(drive_folder_id='').values_list('cohort_id', 'drive_folder_id'))
+    _raw_registration_index().rebuild()
+    sheet_urls = dict(
+        SheetRowIndex.objects.filter(spreadsheet_id=SPREADSHEET_ID, worksheet=RAW_REGISTRATION)
+        .exclude(folder_url='')
+        .values_list('email', 'folder_url')
+    )
+
+    listings, found = {}, []
+    for subscriber_request in pending:
+        folder_url = sheet_urls.get(normalize_email(subscriber_request.email), '')
+        folder_id = folder_id_from_url(folder_url)
+        if not folder_url:
+            cohort_id = subscriber_request.cohort_id or NO_COHORT_FOLDER_NAME
+            if cohort_id not in listings:
+                parent_id = cohort_folder_ids.get(cohort_id)
+                listings[cohort_id] = list_child_folders(drive_service, parent_id) if parent_id else {}
+            folder = listings[cohort_id].get(f"{subscriber_request.name}|{subscriber_request.email}")
+            if folder:
+                folder_url, folder_id = folder.get('webViewLink', ''), folder['id']
+        if folder_url:
+            subscriber_request.drive_folder_url = folder_url
+            subscriber_request.drive_folder_id = folder_id
+            found.append(subscriber_request)
+    SubscriberRequest.objects.bulk_update(found, ['drive_folder_id', 'drive_folder_url'], batch_size=500)
+    counts['subscribers'] = len(found)
+    counts['missing'] = len(pending) - len(found)
+    logger.info("Backfilled Drive folders: %s", counts)
+    return counts
+
+
+def _create_cohort_folder(drive_service, cohort_id):
     # Create new cohort folder
     folder_metadata = {
         'name': cohort_id,
@@ -273,12 +563,7 @@ def log_to_spreadsheet(subscriber_request, folder_url):
         bool: True if successful, False otherwise
     """
     try:
-        credentials = get_credentials()
-        gc = gspread.authorize(credentials)
-
-        # Open the spreadsheet
-        spreadsheet = gc.open_by_key(SPREADSHEET_ID)
-        worksheet = spreadsheet.worksheet('raw_registration')
+        index = _raw_registration_index()
 
         # Prepare row data based on sheet columns:
         # name, email, tele_name, country, plan, status, created_at, payment_url
@@ -296,7 +581,7 @@ def log_to_spreadsheet(subscriber_request, folder_url):
         ]
 
         # Append row to sheet
-        worksheet.append_row(row_data)
+        index.append(row_data)
         logger.info(
             "Sheet append raw_registration email=%s spreadsheet_id=%s column_H_has_url=%s",
             subscriber_request.email,
@@ -318,24 +603,11 @@ def log_to_spreadsheet(subscriber_request, folder_url):
         return False
 
 
-def _find_row_number_by_email_column_b(worksheet, email):
-    """Return 1-based row number where column B matches email (case-insensitive), or None."""
-    try:
-        rows = worksheet.get_all_values()
-    except Exception as e:
-        logger.warning("Error reading sheet rows for email lookup: %s", e)
-        return None
-    target = (email or '').strip().lower()
-    for i, row in enumerate(rows, start=1):
-        if len(row) >= 2 and row[1].strip().lower() == target:
-            return i
-    return None
-
-
 def upsert_log_to_spreadsheet(subscriber_request, folder_url):
     """
     Insert or update a row in raw_registration for this subscriber.
     If column B already has this email, update that row; otherwise append.
+    The write is buffered and sent with the next batch (``blog.sheet_buffer``).
 
     Args:
         subscriber_request: SubscriberRequest instance
@@ -345,12 +617,6 @@ def upsert_log_to_spreadsheet(subscriber_request, folder_url):
         bool: True if successful, False otherwise
     """
     try:
-        credentials = get_credentials()
-        gc = gspread.authorize(credentials)
-
-        spreadsheet = gc.open_by_key(SPREADSHEET_ID)
-        worksheet = spreadsheet.worksheet('raw_registration')
-
         plan_display = subscriber_request.get_plan_display()
         row_data = [
             subscriber_request.name,
@@ -363,30 +629,14 @@ def upsert_log_to_spreadsheet(subscriber_request, folder_url):
             folder_url or '',
         ]
 
-        row_num = _find_row_number_by_email_column_b(worksheet, subscriber_request.email)
-        if row_num:
-            worksheet.update(
-                f'A{row_num}:H{row_num}',
-                [row_data],
-                value_input_option='USER_ENTERED',
-            )
-            logger.info(
-                "Sheet upsert UPDATE row=%s worksheet=raw_registration email=%s "
-                "spreadsheet_id=%s column_H_has_url=%s",
-                row_num,
-                subscriber_request.email,
-                SPREADSHEET_ID or "(unset)",
-                bool(folder_url),
-            )
-        else:
-            worksheet.append_row(row_data)
-            logger.info(
-                "Sheet upsert APPEND worksheet=raw_registration email=%s spreadsheet_id=%s "
-                "column_H_has_url=%s",
-                subscriber_request.email,
-                SPREADSHEET_ID or "(unset)",
-                bool(folder_url),
-            )
+        buffer_row(SPREADSHEET_ID, RAW_REGISTRATION, subscriber_request.email, row_data)
+        logger.info(
+            "Sheet upsert QUEUED worksheet=raw_registration email=%s spreadsheet_id=%s "
+            "column_H_has_url=%s",
+            subscriber_request.email,
+            SPREADSHEET_ID or "(unset)",
+            bool(folder_url),
+        )
 
         return True
 
@@ -405,7 +655,8 @@ def upsert_log_to_spreadsheet(subscriber_request, folder_url):
 def get_or_create_subscriber_folder_url(subscriber_request):
     """
     For new subscriber requests:
-    1. If raw_registration already has this email with a folder URL (column H), reuse it
+    1. If the folder is already stored on the request (``drive_folder_url``), or
+       raw_registration already has this email with a folder URL (column H), reuse it
        (``find_url_in_spreadsheet``).
     2. Otherwise get or create the folder under the cohort (``get_folder_upload_url``:
        searches Drive by ``fullname|email``, then creates if missing).
@@ -418,6 +669,15 @@ def get_or_create_subscriber_folder_url(subscriber_request):
         str: Folder URL, or None if folder creation failed and no existing URL in sheet.
     """
     try:
+        if subscriber_request.drive_folder_url:
+            logger.info(
+                "Subscriber folder: reused stored URL email=%s spreadsheet_id=%s",
+                subscriber_request.email,
+                SPREADSHEET_ID or "(unset)",
+            )
+            upsert_log_to_spreadsheet(subscriber_request, subscriber_request.drive_folder_url)
+            return subscriber_request.drive_folder_url
+
         existing_url = find_url_in_spreadsheet(
             subscriber_request.email, update_status=False
         )
@@ -427,6 +687,7 @@ def get_or_create_subscriber_folder_url(subscriber_request):
                 subscriber_request.email,
                 SPREADSHEET_ID or "(unset)",
             )
+            remember_subscriber_folder(subscriber_request, existing_url)
             upsert_log_to_spreadsheet(subscriber_request, existing_url)
             return existing_url
 
@@ -456,7 +717,9 @@ def get_folder_upload_url(
 ):
     """
     Get the upload URL for an existing subscriber's folder.
-    If the folder doesn't exist, creates it.
+    If the folder doesn't exist, creates it. The result is stored on the request
+    (``drive_folder_id``/``drive_folder_url``) and returned without any Drive call
+    from then on.
 
     Args:
         subscriber_request: SubscriberRequest instance
@@ -465,9 +728,11 @@ def get_folder_upload_url(
     Returns:
         str: URL of the folder for uploading, or None if operation fails
     """
+    if subscriber_request.drive_folder_url:
+        return subscriber_request.drive_folder_url
+
     try:
-        credentials = get_credentials()
-        drive_service = build('drive', 'v3', credentials=credentials)
+        drive_service = get_drive_service()
 
         cohort_id = resolve_drive_cohort_id(subscriber_request, user_profile)
         cohort_folder_id = get_or_create_cohort_folder(drive_service, cohort_id)
@@ -497,6 +762,7 @@ def get_folder_upload_url(
                 subscriber_request.email,
                 SPREADSHEET_ID or "(unset)",
             )
+            remember_subscriber_folder(subscriber_request, url, files[0].get('id'))
             return url
         logger.info(
             "Drive folder not found; creating new email=%s spreadsheet_id=%s",
@@ -516,6 +782,14 @@ def get_folder_upload_url(
         return None
 
 
+def _queue_renewal_status(email, plan=None):
+    """Buffer plan (column E, if given) and status (column F) = 'Renewal Requested' for ``email``."""
+    buffer_row(
+        SPREADSHEET_ID, RAW_REGISTRATION, email,
+        [None, None, None, None, plan or None, 'Renewal Requested', None, None],
+    )
+
+
 def find_url_in_spreadsheet(email, update_status=False, plan=None):
     """
     Search for an existing entry in the Google Sheet by email.
@@ -529,27 +803,33 @@ def find_url_in_spreadsheet(email, update_status=False, plan=None):
         str: Folder URL if found, None otherwise
     """
     try:
-        credentials = get_credentials()
-        gc = gspread.authorize(credentials)
+        # A buffered write not flushed yet is newer than the sheet.
+        pending = pending_cells(SPREADSHEET_ID, RAW_REGISTRATION, email)
+        if pending and pending[7]:
+            if update_status:
+                _queue_renewal_status(email, plan)
+            logger.info(
+                "Sheet lookup: folder URL in pending write email=%s spreadsheet_id=%s "
+                "update_status=%s",
+                email,
+                SPREADSHEET_ID or "(unset)",
+                update_status,
+            )
+            return pending[7]
 
-        spreadsheet = gc.open_by_key(SPREADSHEET_ID)
-        worksheet = spreadsheet.worksheet('raw_registration')
+        index = _raw_registration_index()
 
-        # Find cell with matching email (column B = email)
-        cell = worksheet.find(email)
-        if cell:
-            # Get the folder URL from the same row (column H = payment_url)
-            row_values = worksheet.row_values(cell.row)
+        # Find the row with matching email (column B = email)
+        row_num, row_values = index.lookup(email)
+        if row_num:
+            # Folder URL from the same row (column H = payment_url)
             if len(row_values) >= 8 and row_values[7]:
                 if update_status:
-                    # Update plan column (column E = index 5) and status column (column F = index 6)
-                    if plan:
-                        worksheet.update_cell(cell.row, 5, plan)
-                    worksheet.update_cell(cell.row, 6, 'Renewal Requested')
+                    _queue_renewal_status(email, plan)
                 logger.info(
                     "Sheet lookup: folder URL in column H row=%s email=%s spreadsheet_id=%s "
                     "update_status=%s",
-                    cell.row,
+                    row_num,
                     email,
                     SPREADSHEET_ID or "(unset)",
                     update_status,
@@ -563,13 +843,6 @@ def find_url_in_spreadsheet(email, update_status=False, plan=None):
         )
         return None
 
-    except gspread.exceptions.CellNotFound:
-        logger.info(
-            "Sheet lookup: email not found in column B email=%s spreadsheet_id=%s",
-            email,
-            SPREADSHEET_ID or "(unset)",
-        )
-        return None
     except Exception as e:
         logger.exception(
             "find_url_in_spreadsheet failed email=%s spreadsheet_id=%s",
@@ -584,6 +857,7 @@ def upsert_renewal_to_spreadsheet(subscriber_request, folder_url, plan):
     Insert or update a renewal row in raw_registration (key: email in column B).
 
     Always upserts so duplicate API calls or retries cannot create two rows for the same email.
+    The write is buffered and sent with the next batch (``blog.sheet_buffer``).
 
     Args:
         subscriber_request: SubscriberRequest instance
@@ -594,12 +868,6 @@ def upsert_renewal_to_spreadsheet(subscriber_request, folder_url, plan):
         bool: True if successful, False otherwise
     """
     try:
-        credentials = get_credentials()
-        gc = gspread.authorize(credentials)
-
-        spreadsheet = gc.open_by_key(SPREADSHEET_ID)
-        worksheet = spreadsheet.worksheet('raw_registration')
-
         from django.utils import timezone
 
         # name, email, tele_name, country, plan, status, created_at, payment_url
@@ -614,31 +882,14 @@ def upsert_renewal_to_spreadsheet(subscriber_request, folder_url, plan):
             folder_url or '',
         ]
 
-        row_num = _find_row_number_by_email_column_b(worksheet, subscriber_request.email)
-        if row_num:
-            worksheet.update(
-                f'A{row_num}:H{row_num}',
-                [row_data],
-                value_input_option='USER_ENTERED',
-            )
-            logger.info(
-                "Renewal sheet upsert UPDATE row=%s email=%s spreadsheet_id=%s plan=%s "
-                "column_H_has_url=%s",
-                row_num,
-                subscriber_request.email,
-                SPREADSHEET_ID or "(unset)",
-                plan,
-                bool(folder_url),
-            )
-        else:
-            worksheet.append_row(row_data)
-            logger.info(
-                "Renewal sheet upsert APPEND email=%s spreadsheet_id=%s plan=%s column_H_has_url=%s",
-                subscriber_request.email,
-                SPREADSHEET_ID or "(unset)",
-                plan,
-                bool(folder_url),
-            )
+        buffer_row(SPREADSHEET_ID, RAW_REGISTRATION, subscriber_request.email, row_data)
+        logger.info(
+            "Renewal sheet upsert QUEUED email=%s spreadsheet_id=%s plan=%s column_H_has_url=%s",
+            subscriber_request.email,
+            SPREADSHEET_ID or "(unset)",
+            plan,
+            bool(folder_url),
+        )
 
         return True
 
@@ -660,9 +911,11 @@ def get_or_create_renewal_url(
     Get existing URL from spreadsheet or create new folder and log to sheet.
 
     For renewal requests:
-    1. First checks if user already has an entry in the spreadsheet
-    2. If found, updates status to 'Renewal Requested' and returns the existing folder URL
-    3. If not found, creates folder, upserts spreadsheet row (by email), and returns URL
+    1. If the folder is stored on the request (``drive_folder_url``), queues the
+       plan/status update of the row and returns it without any Drive or sheet read
+    2. Otherwise checks if user already has an entry in the spreadsheet
+    3. If found, updates status to 'Renewal Requested' and returns the existing folder URL
+    4. If not found, creates folder, upserts spreadsheet row (by email), and returns URL
 
     Args:
         subscriber_request: SubscriberRequest instance
@@ -670,13 +923,25 @@ def get_or_create_renewal_url(
         user_profile: UserProfile for the renewing user (used for Drive cohort when request has no cohort)
 
     Returns:
-        tuple: (folder_url, is_existing) where is_existing indicates if URL was from sheet
-               Returns (None, False) if operation fails
+        tuple: (folder_url, is_existing) where is_existing indicates if URL was stored
+               or from sheet. Returns (None, False) if operation fails
     """
     try:
+        if subscriber_request.drive_folder_url:
+            # Same update as the sheet-found path: plan (E) and status (F) only.
+            _queue_renewal_status(subscriber_request.email, plan)
+            logger.info(
+                "Renewal: reused stored folder URL email=%s spreadsheet_id=%s plan=%s",
+                subscriber_request.email,
+                SPREADSHEET_ID or "(unset)",
+                plan,
+            )
+            return (subscriber_request.drive_folder_url, True)
+
         # First, check if URL exists in spreadsheet and update status/plan if found
         existing_url = find_url_in_spreadsheet(subscriber_request.email, update_status=True, plan=plan)
         if existing_url:
+            remember_subscriber_folder(subscriber_request, existing_url)
             logger.info(
                 "Renewal: reused folder URL from sheet email=%s spreadsheet_id=%s plan=%s",
                 subscriber_request.email,
@@ -792,10 +1057,7 @@ def fetch_members_expiry_rows() -> List[Tuple[str, date]]:
     if not MEMBERS_SPREADSHEET_ID:
         raise ValueError("GOOGLE_MEMBERS_SPREADSHEET_ID is not configured")
 
-    credentials = get_credentials()
-    gc = gspread.authorize(credentials)
-    spreadsheet = gc.open_by_key(MEMBERS_SPREADSHEET_ID)
-    worksheet = spreadsheet.worksheet(MEMBERS_WORKSHEET_NAME)
+    worksheet = get_worksheet(MEMBERS_SPREADSHEET_ID, MEMBERS_WORKSHEET_NAME)
     rows = worksheet.get_all_values()
     if not rows:
         return []
@@ -857,10 +1119,7 @@ def fetch_members_sheet_emails() -> List[str]:
     if not MEMBERS_SPREADSHEET_ID:
         raise ValueError("GOOGLE_MEMBERS_SPREADSHEET_ID is not configured")
 
-    credentials = get_credentials()
-    gc = gspread.authorize(credentials)
-    spreadsheet = gc.open_by_key(MEMBERS_SPREADSHEET_ID)
-    worksheet = spreadsheet.worksheet(MEMBERS_WORKSHEET_NAME)
+    worksheet = get_worksheet(MEMBERS_SPREADSHEET_ID, MEMBERS_WORKSHEET_NAME)
     rows = worksheet.get_all_values()
     if not rows:
         return []
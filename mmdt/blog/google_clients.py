@@ -0,0 +1,131 @@
+"""
+Per-process pool of Google API clients.
+
+Building clients from scratch for every Drive/Sheets helper re-reads the
+token file, may refresh the token, and opens the spreadsheet and worksheet
+again (two metadata round-trips) before the call that does the work.
+``GoogleClientPool`` keeps, per process:
+
+* the credentials, loaded once and refreshed under a lock
+  ``GOOGLE_CREDENTIALS_REFRESH_MARGIN`` seconds before they expire;
+* one Drive service per thread (``httplib2`` connections are not
+  thread-safe), rebuilt only when the credentials are replaced;
+* one gspread client and its worksheet handles, kept for
+  ``GOOGLE_WORKSHEET_CACHE_TIMEOUT`` seconds.
+
+``reset()`` drops everything (e.g. after the token was revoked).
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from google.auth.transport.requests import Request
+from googleapiclient.discovery import build
+import gspread
+
+logger = logging.getLogger(__name__)
+
+
+def get_refresh_margin():
+    return getattr(settings, 'GOOGLE_CREDENTIALS_REFRESH_MARGIN', 300)
+
+
+def get_worksheet_timeout():
+    return getattr(settings, 'GOOGLE_WORKSHEET_CACHE_TIMEOUT', 3600)
+
+
+class GoogleClientPool:
+    """
+    Thread-safe cache of Google credentials and API clients.
+
+    Args:
+        load_credentials: Callable returning ``Credentials`` (reads the token
+            file, running the OAuth flow if needed)
+        save_credentials: Callable storing refreshed ``Credentials``
+    """
+
+    def __init__(self, load_credentials, save_credentials=None):
+        self._load_credentials = load_credentials
+        self._save_credentials = save_credentials
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._credentials = None
+        self._gspread_client = None
+        self._worksheets = {}
+
+    def _needs_refresh(self, credentials):
+        if not credentials.valid:
+            return True
+        if credentials.expiry is None:
+            return False
+        # google-auth keeps ``expiry`` as naive UTC.
+        return credentials.expiry - timedelta(seconds=get_refresh_margin()) <= datetime.utcnow()
+
+    def credentials(self):
+        """Return the cached credentials, loading or refreshing them if needed."""
+        with self._lock:
+            credentials = self._credentials
+            if credentials is None:
+                credentials = self._load_credentials()
+            elif self._needs_refresh(credentials) and credentials.refresh_token:
+                try:
+                    credentials.refresh(Request())
+                except Exception as e:
+                    logger.warning("Failed to refresh Google token ahead of expiry: %s", e)
+                    if not credentials.valid:
+                        # Fall back to the loader (token file or OAuth flow).
+                        credentials = self._load_credentials()
+                else:
+                    if self._save_credentials:
+                        self._save_credentials(credentials)
+            if credentials is not self._credentials:
+                self._credentials = credentials
+                self._gspread_client = None
+                self._worksheets.clear()
+            return credentials
+
+    def drive(self):
+        """Return this thread's Drive v3 service."""
+        credentials = self.credentials()
+        local = self._local
+        if getattr(local, 'drive_credentials', None) is not credentials:
+            local.drive = build('drive', 'v3', credentials=credentials, cache_discovery=False)
+            local.drive_credentials = credentials
+        return local.drive
+
+    def sheets(self):
+        """Return the shared gspread client."""
+        credentials = self.credentials()
+        with self._lock:
+            if self._gspread_client is None:
+                self._gspread_client = gspread.authorize(credentials)
+            return self._gspread_client
+
+    def worksheet(self, spreadsheet_id, title):
+        """Return a cached handle to worksheet ``title`` of ``spreadsheet_id``."""
+        client = self.sheets()
+        key = (spreadsheet_id, title)
+        with self._lock:
+            cached = self._worksheets.get(key)
+            if cached is not None and time.monotonic() - cached[1] < get_worksheet_timeout():
+                return cached[0]
+        worksheet = client.open_by_key(spreadsheet_id).worksheet(title)
+        with self._lock:
+            if self._gspread_client is client:
+                self._worksheets[key] = (worksheet, time.monotonic())
+        return worksheet
+
+    def forget_worksheet(self, spreadsheet_id, title):
+        """Drop a cached worksheet handle (e.g. after the sheet was renamed)."""
+        with self._lock:
+            self._worksheets.pop((spreadsheet_id, title), None)
+
+    def reset(self):
+        """Drop the credentials and every cached client."""
+        with self._lock:
+            self._credentials = None
+            self._gspread_client = None
+            self._worksheets.clear()
+            self._local = threading.local()
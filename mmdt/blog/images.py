@@ -0,0 +1,171 @@
+"""
+Responsive image derivatives for uploaded images.
+
+For an upload such as ``images/photo.jpg`` this stores, next to the original
+and in the same storage (local media or S3)::
+
+    images/photo__w320.webp   images/photo__w320.jpg
+    images/photo__w640.webp   images/photo__w640.jpg
+    ...
+    images/photo__variants.json   manifest: original size + variant names
+
+one WebP and one original-format copy per width in ``IMAGE_VARIANT_WIDTHS``
+that is smaller than the original (images are never upscaled). Variants are
+generated once, when a ``Post`` or poll ``Question`` image is saved, or
+lazily the first time a template asks for them. The manifest is cached so
+rendering a page does not touch the storage.
+
+Templates use ``{% responsive_image %}`` from ``blog.templatetags.responsive_images``.
+"""
+import json
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_SUFFIX = '__variants.json'
+# Pillow format name, file extension and save options per output format.
+FORMATS = {
+    'JPEG': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'PNG': ('png', {'optimize': True}),
+    'WEBP': ('webp', {'quality': 80, 'method': 6}),
+}
+CONTENT_TYPES = {'webp': 'image/webp', 'jpg': 'image/jpeg', 'png': 'image/png'}
+
+
+def get_widths():
+    return sorted(set(getattr(settings, 'IMAGE_VARIANT_WIDTHS', (320, 640, 1024, 1600))))
+
+
+def variant_name(name, width, extension):
+    root, _ = os.path.splitext(name)
+    return f'{root}__w{width}.{extension}'
+
+
+def manifest_name(name):
+    root, _ = os.path.splitext(name)
+    return root + MANIFEST_SUFFIX
+
+
+def _cache_key(storage, name):
+    return f'image-variants:{storage.__class__.__name__}:{name}'
+
+
+def _encode(image, pillow_format):
+    extension, options = FORMATS[pillow_format]
+    if pillow_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, format=pillow_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def _save(storage, name, content):
+    # Overwrite instead of letting the storage pick another name.
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, content)
+
+
+def generate_variants(field_file):
+    """
+    Create the resized and WebP variants of ``field_file`` and its manifest.
+
+    Args:
+        field_file: ``FieldFile`` of an ``ImageField`` (e.g. ``post.image``)
+
+    Returns:
+        dict | None: The manifest, or None if the file is missing or not an image
+    """
+    if not field_file:
+        return None
+    storage, name = field_file.storage, field_file.name
+    try:
+        with storage.open(name, 'rb') as f_in:
+            image = Image.open(f_in)
+            image.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning("Cannot generate variants for %s: not a readable image", name)
+        return None
+
+    original_format = 'PNG' if image.format == 'PNG' or image.mode in ('RGBA', 'LA', 'P') else 'JPEG'
+    image = ImageOps.exif_transpose(image)
+    manifest = {'width': image.width, 'height': image.height, 'variants': []}
+    for width in get_widths():
+        if width >= image.width:
+            break
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        variant = {'width': width, 'height': height}
+        for pillow_format in ('WEBP', original_format):
+            extension = FORMATS[pillow_format][0]
+            variant[extension] = _save(storage, variant_name(name, width, extension), _encode(resized, pillow_format))
+        manifest['variants'].append(variant)
+
+    _save(storage, manifest_name(name), ContentFile(json.dumps(manifest).encode('utf-8')))
+    cache.set(_cache_key(storage, name), manifest, None)
+    logger.info("Generated %s image variants for %s", len(manifest['variants']), name)
+    return manifest
+
+
+def get_variants(field_file, generate=None):
+    """
+    Return the manifest for ``field_file``, generating it on first use.
+
+    Args:
+        field_file: ``FieldFile`` of an ``ImageField``
+        generate: Create missing variants (default: ``IMAGE_VARIANTS_LAZY``)
+
+    Returns:
+        dict | None: ``{'width', 'height', 'variants': [...]}`` or None
+    """
+    if not field_file:
+        return None
+    storage, name = field_file.storage, field_file.name
+    key = _cache_key(storage, name)
+    manifest = cache.get(key)
+    if manifest is not None:
+        return manifest
+
+    try:
+        with storage.open(manifest_name(name), 'rb') as f_in:
+            manifest = json.loads(f_in.read().decode('utf-8'))
+    except (OSError, ValueError):
+        manifest = None
+    if manifest is None:
+        if generate is None:
+            generate = getattr(settings, 'IMAGE_VARIANTS_LAZY', True)
+        if not generate:
+            return None
+        manifest = generate_variants(field_file)
+        if manifest is None:
+            # Unreadable or missing file: serve the original and retry in an hour.
+            cache.set(key, {'variants': []}, 3600)
+            return None
+    cache.set(key, manifest, None)
+    return manifest
+
+
+def build_srcsets(field_file, manifest):
+    """
+    Return ``{extension: srcset}`` for the variants in ``manifest``.
+
+    The original file closes the original-format srcset so wide screens still
+    get full resolution.
+    """
+    storage = field_file.storage
+    srcsets = {}
+    for variant in manifest['variants']:
+        for extension in CONTENT_TYPES:
+            if extension in variant:
+                srcsets.setdefault(extension, []).append(f"{storage.url(variant[extension])} {variant['width']}w")
+    fallback = next((ext for ext in srcsets if ext != 'webp'), None)
+    if fallback:
+        srcsets[fallback].append(f"{field_file.url} {manifest['width']}w")
+    return {extension: ', '.join(entries) for extension, entries in srcsets.items()}
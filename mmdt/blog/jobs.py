@@ -0,0 +1,196 @@
+"""
+Database-backed background job queue.
+
+Slow side effects (Google Drive/Sheets calls, SMTP) are queued as
+``BackgroundJob`` rows instead of running inside the request, and executed
+by a worker::
+
+    python manage.py run_jobs          # keep polling
+    python manage.py run_jobs --once   # drain due jobs and exit (cron)
+
+Handlers are plain functions registered under a name with ``@register``;
+``enqueue(name, **payload)`` stores a job whose JSON payload becomes the
+handler's keyword arguments. A job that raises is retried with exponential
+backoff (``BACKGROUND_JOB_RETRY_DELAY`` doubling up to
+``BACKGROUND_JOB_RETRY_MAX_DELAY``) until ``max_attempts`` is reached, then
+marked failed with its traceback; failed jobs can be re-queued from the
+admin. Jobs left running by a crashed worker are picked up again after
+``BACKGROUND_JOB_LOCK_TIMEOUT`` seconds, so handlers should be idempotent.
+
+Handlers run outside any transaction: they call Google and SMTP, and on
+SQLite an open write transaction would hold the database lock across those
+round-trips (and a rollback after a successful remote call would repeat it
+on retry). Handlers wrap their own database-only steps in
+``transaction.atomic()`` where they need it. Done jobs are deleted after
+``BACKGROUND_JOB_RETENTION_DAYS`` (``prune_done_jobs``, run by ``run_jobs``).
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def register(name):
+    """Decorator registering a job handler under ``name``."""
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def get_handler(name):
+    return _handlers.get(name)
+
+
+def get_max_attempts():
+    return getattr(settings, 'BACKGROUND_JOB_MAX_ATTEMPTS', 5)
+
+
+def get_lock_timeout():
+    return getattr(settings, 'BACKGROUND_JOB_LOCK_TIMEOUT', 900)
+
+
+def get_retention_days():
+    return getattr(settings, 'BACKGROUND_JOB_RETENTION_DAYS', 14)
+
+
+def retry_delay(attempts):
+    """Seconds to wait before attempt ``attempts + 1``."""
+    base = getattr(settings, 'BACKGROUND_JOB_RETRY_DELAY', 60)
+    cap = getattr(settings, 'BACKGROUND_JOB_RETRY_MAX_DELAY', 3600)
+    return min(cap, base * 2 ** max(0, attempts - 1))
+
+
+def default_worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def enqueue(name, *, run_at=None, max_attempts=None, **payload):
+    """
+    Queue job ``name`` with ``payload`` as handler keyword arguments.
+
+    The job row is written in the caller's transaction, so it is only
+    visible to workers once the triggering change is committed.
+
+    Returns:
+        BackgroundJob: The queued job
+    """
+    if name not in _handlers:
+        raise ValueError(f'No handler registered for job "{name}"')
+    return BackgroundJob.objects.create(
+        name=name,
+        payload=payload,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or get_max_attempts(),
+    )
+
+
+def claim_job(worker=None):
+    """
+    Lock the next due job for ``worker``.
+
+    Claiming is a conditional UPDATE, so concurrent workers never run the
+    same job (no ``SELECT ... FOR UPDATE`` needed, which SQLite lacks).
+
+    Returns:
+        BackgroundJob | None: The claimed job, with ``attempts`` already counted
+    """
+    worker = worker or default_worker_id()
+    now = timezone.now()
+    stale = now - timedelta(seconds=get_lock_timeout())
+    due = (
+        BackgroundJob.objects
+        .filter(Q(status=BackgroundJob.QUEUED, run_at__lte=now) | Q(status=BackgroundJob.RUNNING, locked_at__lt=stale))
+        .order_by('run_at', 'pk')
+        .values_list('pk', 'status', 'locked_at')[:10]
+    )
+    for pk, status, locked_at in due:
+        claimed = BackgroundJob.objects.filter(pk=pk, status=status, locked_at=locked_at).update(
+            status=BackgroundJob.RUNNING,
+            locked_at=now,
+            locked_by=worker,
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return BackgroundJob.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """
+    Run a claimed job and record the outcome.
+
+    Returns:
+        str: The job's new status (``done``, ``queued`` for a retry, or ``failed``)
+    """
+    handler = _handlers.get(job.name)
+    now = timezone.now()
+    try:
+        if handler is None:
+            raise LookupError(f'No handler registered for job "{job.name}"')
+        handler(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = BackgroundJob.FAILED
+            job.finished_at = timezone.now()
+            logger.error("Job %s failed after %s attempts", job, job.attempts, exc_info=True)
+        else:
+            job.status = BackgroundJob.QUEUED
+            job.run_at = now + timedelta(seconds=retry_delay(job.attempts))
+            logger.warning("Job %s failed (attempt %s/%s), retrying at %s",
+                           job, job.attempts, job.max_attempts, job.run_at, exc_info=True)
+    else:
+        job.status = BackgroundJob.DONE
+        job.finished_at = timezone.now()
+        job.last_error = ''
+    job.locked_at = None
+    job.locked_by = ''
+    with transaction.atomic():
+        job.save(update_fields=['status', 'run_at', 'locked_at', 'locked_by', 'last_error', 'finished_at', 'updated_at'])
+    return job.status
+
+
+def prune_done_jobs(days=None):
+    """
+    Delete jobs that finished successfully more than ``days`` ago.
+
+    Failed jobs are kept for inspection in the admin.
+
+    Returns:
+        int: Number of jobs deleted
+    """
+    days = get_retention_days() if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = BackgroundJob.objects.filter(status=BackgroundJob.DONE, finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def run_pending_jobs(max_jobs=None, worker=None):
+    """
+    Run due jobs until none is left (or ``max_jobs`` have run).
+
+    Returns:
+        dict: Counts of jobs ``done``, ``retried`` and ``failed``
+    """
+    counts = {'done': 0, 'retried': 0, 'failed': 0}
+    outcome = {BackgroundJob.DONE: 'done', BackgroundJob.QUEUED: 'retried', BackgroundJob.FAILED: 'failed'}
+    while max_jobs is None or sum(counts.values()) < max_jobs:
+        job = claim_job(worker)
+        if job is None:
+            break
+        counts[outcome[run_job(job)]] += 1
+    return counts
@@ -0,0 +1,23 @@
+"""
+Store the Google Drive folder ids of cohorts and subscriber requests.
+
+Folders are recorded on the ``Cohort`` and ``SubscriberRequest`` rows the
+first time they are resolved; run this once to fill rows resolved before
+that, so their registrations and renewals skip the Drive search too::
+
+    python manage.py backfill_drive_folders
+"""
+from django.core.management.base import BaseCommand
+
+from blog.google_api_utils import backfill_drive_folders
+
+
+class Command(BaseCommand):
+    help = 'Fill the stored Google Drive folder ids of cohorts and subscriber requests'
+
+    def handle(self, *args, **options):
+        counts = backfill_drive_folders()
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {counts['cohorts']} cohort folders and {counts['subscribers']} subscriber folders "
+            f"({counts['missing']} subscribers have no folder yet)"
+        ))
@@ -0,0 +1,197 @@
+"""
+Score a CSV or JSONL dump of feedback texts with the PlayGround classifier.
+
+Rows are read, scored and written in fixed-size chunks, so memory stays
+bounded regardless of the file size. With ``--workers N`` chunks are scored
+in a pool of N processes (at most 2*N chunks in flight); output rows are
+always written in input order.
+
+Each output row is the input row plus ``label`` and ``confidence``; rows
+with an empty text get empty values::
+
+    python manage.py classify_feedback feedback.csv --output scored.csv
+    python manage.py classify_feedback dump.jsonl --output scored.jsonl --text-column text --workers 4
+"""
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.classifier import ClassifierUnavailable, classify_texts, warm_classifier
+
+OUTPUT_FIELDS = ('label', 'confidence')
+
+
+def _init_worker():
+    # Spawned workers start without Django configured; forked ones already have it.
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    warm_classifier()
+
+
+def score_chunk(texts):
+    """Classify ``texts`` and return one result per entry (None for empty texts)."""
+    present = [text for text in texts if text]
+    predictions = iter(classify_texts(present))
+    return [next(predictions) if text else None for text in texts]
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _CsvFormat:
+    def __init__(self, f_in, f_out, text_column):
+        self.reader = csv.DictReader(f_in)
+        if self.reader.fieldnames is None or text_column not in self.reader.fieldnames:
+            raise CommandError(f'Column "{text_column}" not found in the CSV header')
+        self.text_column = text_column
+        fieldnames = list(self.reader.fieldnames)
+        fieldnames += [name for name in OUTPUT_FIELDS if name not in fieldnames]
+        self.writer = csv.DictWriter(f_out, fieldnames=fieldnames)
+        self.writer.writeheader()
+
+    def rows(self):
+        return iter(self.reader)
+
+    def text(self, row):
+        return (row.get(self.text_column) or '').strip()
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+
+class _JsonlFormat:
+    def __init__(self, f_in, f_out, text_column):
+        self.f_in = f_in
+        self.f_out = f_out
+        self.text_column = text_column
+
+    def rows(self):
+        for line_number, line in enumerate(self.f_in, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise CommandError(f'Invalid JSON on line {line_number}: {e}') from e
+            if not isinstance(row, dict):
+                raise CommandError(f'Line {line_number} is not a JSON object')
+            yield row
+
+    def text(self, row):
+        value = row.get(self.text_column)
+        return value.strip() if isinstance(value, str) else ''
+
+    def write(self, row):
+        self.f_out.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+FORMATS = {'csv': _CsvFormat, 'jsonl': _JsonlFormat}
+
+
+class Command(BaseCommand):
+    help = 'Classify feedback texts from a CSV or JSONL file in bounded-memory chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='CSV or JSONL file of feedback texts')
+        parser.add_argument('--output', required=True, help='File to write scored rows to')
+        parser.add_argument(
+            '--format',
+            choices=sorted(FORMATS),
+            help='Input/output format (default: guessed from the input file extension)',
+        )
+        parser.add_argument(
+            '--text-column',
+            default='feedback',
+            help='CSV column / JSON field holding the text (default: feedback)',
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows scored per chunk (default: 1000)')
+        parser.add_argument('--workers', type=int, default=1, help='Scoring processes (default: 1, in-process)')
+
+    def handle(self, *args, **options):
+        source = options['input']
+        self.verbosity = options['verbosity']
+        chunk_size = options['chunk_size']
+        workers = options['workers']
+        if chunk_size < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        if workers < 1:
+            raise CommandError('--workers must be at least 1')
+
+        file_format = options['format'] or os.path.splitext(source)[1].lstrip('.').lower()
+        if file_format == 'ndjson':
+            file_format = 'jsonl'
+        if file_format not in FORMATS:
+            raise CommandError('Cannot guess the file format; pass --format csv or --format jsonl')
+
+        try:
+            warm_classifier()
+            score_chunk([])
+        except ClassifierUnavailable as e:
+            raise CommandError(str(e)) from e
+
+        try:
+            f_in = open(source, newline='', encoding='utf-8')
+        except FileNotFoundError as e:
+            raise CommandError(f'Input file not found: {source}') from e
+
+        with f_in, open(options['output'], 'w', newline='', encoding='utf-8') as f_out:
+            handler = FORMATS[file_format](f_in, f_out, options['text_column'])
+            if workers == 1:
+                totals = self._score_serial(handler, chunk_size)
+            else:
+                totals = self._score_parallel(handler, chunk_size, workers)
+
+        rows, scored = totals
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Classified {scored} of {rows} rows from {source} -> {options["output"]}'
+            )
+        )
+
+    def _score_serial(self, handler, chunk_size):
+        rows = scored = 0
+        for chunk in _chunks(handler.rows(), chunk_size):
+            results = score_chunk([handler.text(row) for row in chunk])
+            rows, scored = self._write_chunk(handler, chunk, results, rows, scored)
+        return rows, scored
+
+    def _score_parallel(self, handler, chunk_size, workers):
+        rows = scored = 0
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            for chunk in _chunks(handler.rows(), chunk_size):
+                texts = [handler.text(row) for row in chunk]
+                pending.append((chunk, executor.submit(score_chunk, texts)))
+                # Bound the rows held in memory while keeping every worker busy.
+                if len(pending) >= 2 * workers:
+                    done_chunk, future = pending.popleft()
+                    rows, scored = self._write_chunk(handler, done_chunk, future.result(), rows, scored)
+            while pending:
+                done_chunk, future = pending.popleft()
+                rows, scored = self._write_chunk(handler, done_chunk, future.result(), rows, scored)
+        return rows, scored
+
+    def _write_chunk(self, handler, chunk, results, rows, scored):
+        for row, result in zip(chunk, results):
+            if result is None:
+                row.update({'label': '', 'confidence': ''})
+            else:
+                row.update({'label': result['label'], 'confidence': round(result['confidence'], 6)})
+                scored += 1
+            handler.write(row)
+        if self.verbosity > 1:
+            self.stdout.write(f'Scored {rows + len(chunk)} rows')
+        return rows + len(chunk), scored
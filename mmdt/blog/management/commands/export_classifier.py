@@ -0,0 +1,81 @@
+"""
+Export the pickled feedback classifier to the pickle-free artifact format.
+
+Reads ``FEEDBACK_CLASSIFIER_PATH`` (sklearn pipeline pickle) and writes
+``FEEDBACK_CLASSIFIER_ARTIFACT_DIR`` (``.npy`` arrays + ``meta.json``), then
+checks that the artifact engine reproduces the pipeline's predictions.
+
+Re-run after retraining the model::
+
+    python manage.py export_classifier
+"""
+import pickle
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.classifier.artifact import ArtifactClassifier, UnsupportedPipeline, export_artifact
+
+
+def _sample_texts(pipeline, count=200, words_per_text=12, seed=0):
+    """Build pseudo-documents from the model's own vocabulary for verification."""
+    vocabulary = sorted(pipeline.steps[0][1].vocabulary_)
+    rng = np.random.default_rng(seed)
+    texts = [
+        ' '.join(rng.choice(vocabulary, size=words_per_text))
+        for _ in range(count)
+    ]
+    return texts + ['', 'out-of-vocabulary zzzzqqq', 'GOOD good Good!!']
+
+
+class Command(BaseCommand):
+    help = 'Export the pickled feedback classifier to memory-mappable NumPy arrays'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            default=settings.FEEDBACK_CLASSIFIER_PATH,
+            help='Path to the sklearn pipeline pickle (default: FEEDBACK_CLASSIFIER_PATH)',
+        )
+        parser.add_argument(
+            '--output',
+            default=settings.FEEDBACK_CLASSIFIER_ARTIFACT_DIR,
+            help='Artifact directory to write (default: FEEDBACK_CLASSIFIER_ARTIFACT_DIR)',
+        )
+
+    def handle(self, *args, **options):
+        source = options['source']
+        output = options['output']
+
+        try:
+            with open(source, 'rb') as f_in:
+                pipeline = pickle.load(f_in)
+        except FileNotFoundError as e:
+            raise CommandError(f'Classifier pickle not found: {source}') from e
+
+        try:
+            export_artifact(pipeline, output)
+        except UnsupportedPipeline as e:
+            raise CommandError(f'Cannot export classifier: {e}') from e
+
+        engine = ArtifactClassifier(output)
+        texts = _sample_texts(pipeline)
+        expected_labels = pipeline.predict(texts)
+        expected_proba = pipeline.predict_proba(texts)
+        labels = engine.predict(texts)
+        proba = engine.predict_proba(texts)
+
+        if not np.array_equal(expected_labels, labels):
+            raise CommandError('Exported artifact does not reproduce the pipeline labels')
+        max_diff = float(np.abs(expected_proba - proba).max())
+        if not np.allclose(expected_proba, proba, rtol=0, atol=1e-12):
+            raise CommandError(f'Exported artifact probabilities differ by {max_diff:.3g}')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Exported {source} -> {output} '
+                f'({len(engine.classes_)} classes, {engine.meta["n_features"]} features, '
+                f'verified on {len(texts)} texts, max probability diff {max_diff:.3g})'
+            )
+        )
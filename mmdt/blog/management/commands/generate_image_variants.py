@@ -0,0 +1,40 @@
+"""
+Generate responsive image variants for existing Post and poll images.
+
+New uploads get their variants when saved; run this once to backfill images
+uploaded earlier, or with ``--force`` after changing ``IMAGE_VARIANT_WIDTHS``::
+
+    python manage.py generate_image_variants
+"""
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_variants, get_variants
+from blog.models import Post
+from polls.models import Question
+
+
+class Command(BaseCommand):
+    help = 'Generate resized and WebP variants for Post and poll Question images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants even if they already exist',
+        )
+
+    def handle(self, *args, **options):
+        generated = failed = 0
+        for model in (Post, Question):
+            for obj in model.objects.exclude(image='').exclude(image__isnull=True).only('pk', 'image').iterator():
+                if options['force']:
+                    manifest = generate_variants(obj.image)
+                else:
+                    manifest = get_variants(obj.image, generate=True)
+                if manifest is None:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f'Skipped {obj.image.name}: not a readable image'))
+                else:
+                    generated += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Image variants ready for {generated} images ({failed} skipped)'))
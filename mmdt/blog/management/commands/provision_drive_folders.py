@@ -0,0 +1,34 @@
+"""
+Get or create the Google Drive upload folders of a cohort's subscribers.
+
+Folders are normally created one at a time when a request is submitted; run
+this to provision a whole cohort (e.g. after importing requests) with a few
+batched Drive requests instead of three calls per subscriber::
+
+    python manage.py provision_drive_folders 2025_01
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.google_api_utils import provision_subscriber_folders
+from blog.models import Cohort, SubscriberRequest
+
+
+class Command(BaseCommand):
+    help = 'Get or create the Google Drive folders of every subscriber request in a cohort'
+
+    def add_arguments(self, parser):
+        parser.add_argument('cohort_id', help='Cohort whose subscriber requests get folders')
+
+    def handle(self, *args, **options):
+        cohort = Cohort.objects.filter(pk=options['cohort_id']).first()
+        if cohort is None:
+            raise CommandError(f"Cohort {options['cohort_id']} does not exist")
+
+        requests = (
+            SubscriberRequest.objects.filter(cohort=cohort, drive_folder_url='').select_related('cohort').order_by('pk')
+        )
+        urls = provision_subscriber_folders(requests)
+        failed = sum(url is None for url in urls.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Drive folders ready for {len(urls) - failed} subscriber requests ({failed} failed)'
+        ))
@@ -0,0 +1,40 @@
+"""
+Recompute the "related posts" index shown on post detail pages.
+
+Similarities are recomputed for all published posts, but only posts whose
+neighbour list changed are rewritten, so it is cheap to run after every
+publishing session or from cron::
+
+    python manage.py rebuild_related_posts
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.related import get_related_count, rebuild_related_posts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the precomputed related-posts index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=get_related_count(),
+            help='Related posts kept per post (default: RELATED_POSTS_COUNT)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rewrite every post, not only those whose neighbours changed',
+        )
+
+    def handle(self, *args, **options):
+        if options['count'] < 1:
+            raise CommandError('--count must be at least 1')
+        result = rebuild_related_posts(k=options['count'], force=options['force'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Related posts: {result['posts']} posts, {result['updated']} updated, "
+                f"{result['removed']} removed"
+            )
+        )
@@ -0,0 +1,27 @@
+"""
+Rebuild the blog post full-text search index from the posts table.
+
+The index is normally kept in sync by the Post save/delete signals; run this
+after bulk imports, ``QuerySet.update()`` calls or restoring a database::
+
+    python manage.py rebuild_search_index
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from blog import search
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for blog posts'
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError('The full-text search index requires SQLite with FTS5')
+
+        with transaction.atomic():
+            search.create_index(connection)
+            count = search.rebuild_index(Post.objects.only('id', 'title', 'content').iterator())
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} posts'))
@@ -0,0 +1,47 @@
+"""
+Recompute the pre-rendered post columns (sanitized HTML, excerpt, reading time).
+
+``Post.save()`` keeps them current; run this after changing the rendering
+rules in ``blog.rendering`` or after editing ``content`` with
+``QuerySet.update()``::
+
+    python manage.py render_posts
+"""
+from django.core.management.base import BaseCommand
+
+from blog.models import RENDERED_FIELDS, Post
+from blog.post_cache import bump_post_cache_version
+
+
+class Command(BaseCommand):
+    help = 'Recompute content_html, excerpt and reading_time for all posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Posts loaded and updated per batch (default: 200)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch = []
+        updated = 0
+        for post in Post.objects.only('pk', 'content', *RENDERED_FIELDS).iterator(chunk_size=batch_size):
+            before = tuple(getattr(post, name) for name in RENDERED_FIELDS)
+            post.render_content()
+            if tuple(getattr(post, name) for name in RENDERED_FIELDS) != before:
+                batch.append(post)
+            if len(batch) >= batch_size:
+                Post.objects.bulk_update(batch, RENDERED_FIELDS)
+                updated += len(batch)
+                batch = []
+        if batch:
+            Post.objects.bulk_update(batch, RENDERED_FIELDS)
+            updated += len(batch)
+        if updated:
+            # bulk_update() sends no signals; drop cached list pages explicitly.
+            bump_post_cache_version()
+
+        self.stdout.write(self.style.SUCCESS(f'Re-rendered {updated} posts'))
@@ -0,0 +1,80 @@
+"""
+Run queued background jobs (subscriber automation emails, Drive folders, ...).
+
+Keep one worker running next to the web server, or drain the queue from
+cron::
+
+    python manage.py run_jobs
+    python manage.py run_jobs --once
+
+Done jobs older than ``BACKGROUND_JOB_RETENTION_DAYS`` are deleted on start
+and then hourly.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.jobs import default_worker_id, prune_done_jobs, run_pending_jobs
+
+PRUNE_INTERVAL = 3600  # seconds
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs that are due now, then exit',
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            default=None,
+            help='Stop after this many jobs',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5.0,
+            help='Seconds to wait when the queue is empty (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        max_jobs = options['max_jobs']
+        if max_jobs is not None and max_jobs < 1:
+            raise CommandError('--max-jobs must be at least 1')
+        if options['sleep'] <= 0:
+            raise CommandError('--sleep must be positive')
+
+        worker = default_worker_id()
+        totals = {'done': 0, 'retried': 0, 'failed': 0}
+        pruned_at = None
+        try:
+            while True:
+                if pruned_at is None or time.monotonic() - pruned_at >= PRUNE_INTERVAL:
+                    pruned = prune_done_jobs()
+                    pruned_at = time.monotonic()
+                    if pruned and options['verbosity'] > 1:
+                        self.stdout.write(f'Deleted {pruned} finished jobs')
+                remaining = None if max_jobs is None else max_jobs - sum(totals.values())
+                counts = run_pending_jobs(max_jobs=remaining, worker=worker)
+                for key, value in counts.items():
+                    totals[key] += value
+                if options['verbosity'] > 1 and any(counts.values()):
+                    self.stdout.write(
+                        f"{counts['done']} done, {counts['retried']} retried, {counts['failed']} failed"
+                    )
+                if options['once'] or (max_jobs is not None and sum(totals.values()) >= max_jobs):
+                    break
+                if not any(counts.values()):
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Jobs: {totals['done']} done, {totals['retried']} retried, {totals['failed']} failed"
+            )
+        )
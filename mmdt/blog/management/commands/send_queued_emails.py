@@ -0,0 +1,66 @@
+"""
+Send the emails waiting in the outbox (see ``blog.outbox``).
+
+Keep one sender running next to the web server, or drain the outbox from
+cron::
+
+    python manage.py send_queued_emails
+    python manage.py send_queued_emails --once
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.outbox import get_batch_size, send_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbox emails in batches over one SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Send the messages that are due now, then exit',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=get_batch_size(),
+            help='Messages sent per SMTP connection (default: EMAIL_OUTBOX_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5.0,
+            help='Seconds to wait when the outbox is empty (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if options['sleep'] <= 0:
+            raise CommandError('--sleep must be positive')
+
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        try:
+            while True:
+                counts = send_queued_emails(batch_size=options['batch_size'])
+                for key, value in counts.items():
+                    totals[key] += value
+                if options['verbosity'] > 1 and any(counts.values()):
+                    self.stdout.write(
+                        f"{counts['sent']} sent, {counts['retried']} retried, {counts['failed']} failed"
+                    )
+                if options['once']:
+                    break
+                if not any(counts.values()):
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Emails: {totals['sent']} sent, {totals['retried']} retried, {totals['failed']} failed"
+            )
+        )
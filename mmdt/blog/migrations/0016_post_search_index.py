@@ -0,0 +1,54 @@
+# Creates the SQLite FTS5 index used by blog.search
+#
+# The table definition and text extraction are copied here (not imported from
+# blog.search/blog.rendering) so later changes to those modules cannot change
+# what this migration does.
+import html
+import re
+
+from django.db import migrations
+from django.utils.html import strip_tags
+
+FTS_TABLE = "blog_post_fts"
+_INVISIBLE_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+
+def html_to_text(value):
+    value = _INVISIBLE_RE.sub(" ", value or "")
+    return " ".join(html.unescape(strip_tags(value.replace("<", " <"))).split())
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    Post = apps.get_model("blog", "Post")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5(title, body, tokenize='unicode61 remove_diacritics 2')"
+        )
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)",
+            [
+                (post.pk, post.title, html_to_text(post.content))
+                for post in Post.objects.only("id", "title", "content").iterator()
+            ],
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0015_remove_subscriberrequest_renewal_plan_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
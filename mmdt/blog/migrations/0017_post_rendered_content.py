@@ -0,0 +1,97 @@
+# Generated by Django 4.2.4 on 2026-10-17 10:52
+
+import html
+import math
+import re
+
+import bleach
+from bleach.css_sanitizer import CSSSanitizer
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+# Rendering as of this migration, copied from blog.rendering so later changes
+# there cannot change what this migration does.
+_INVISIBLE_RE = re.compile(r"<(script|style)\b.*?(?:</\1\s*>|$)", re.IGNORECASE | re.DOTALL)
+_URI_IGNORED_RE = re.compile(r"[`\000-\040\177-\240\s]+")
+
+ALLOWED_TAGS = frozenset({
+    "a", "abbr", "b", "blockquote", "br", "code", "div", "em", "font", "h1", "h2", "h3", "h4",
+    "h5", "h6", "hr", "i", "iframe", "img", "li", "ol", "p", "pre", "s", "small", "span",
+    "strike", "strong", "sub", "sup", "table", "tbody", "td", "th", "thead", "tr", "u", "ul",
+})
+ALLOWED_ATTRIBUTES = {
+    "*": ["class", "style", "title"],
+    "a": ["href", "target", "rel"],
+    "font": ["color", "face", "size"],
+    "iframe": ["src", "width", "height", "frameborder", "allowfullscreen"],
+    "img": ["src", "alt", "width", "height"],
+    "td": ["colspan", "rowspan"],
+    "th": ["colspan", "rowspan"],
+}
+
+
+def allow_attribute(tag, name, value):
+    if name not in ALLOWED_ATTRIBUTES.get(tag, ()) and name not in ALLOWED_ATTRIBUTES["*"]:
+        return False
+    if name in ("href", "src"):
+        uri = _URI_IGNORED_RE.sub("", value).lower()
+        if uri.startswith("data:"):
+            return tag == "img" and name == "src" and uri.startswith("data:image/")
+    return True
+
+
+def render_post_fields(content):
+    text = _INVISIBLE_RE.sub(" ", content or "")
+    text = " ".join(html.unescape(strip_tags(text.replace("<", " <"))).split())
+    excerpt = text
+    if len(text) > 400:
+        excerpt = text[:400].rsplit(" ", 1)[0].rstrip(" ,.;:") + "…"
+    return {
+        "content_html": bleach.clean(
+            _INVISIBLE_RE.sub("", content or ""),
+            tags=ALLOWED_TAGS,
+            attributes=allow_attribute,
+            protocols={"http", "https", "mailto", "data"},
+            css_sanitizer=CSSSanitizer(),
+            strip=True,
+            strip_comments=True,
+        ),
+        "excerpt": excerpt,
+        "reading_time": max(1, math.ceil(len(text.split()) / 200)),
+    }
+
+
+def render_existing_posts(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    posts = list(Post.objects.only("id", "content"))
+    for post in posts:
+        for name, value in render_post_fields(post.content).items():
+            setattr(post, name, value)
+    Post.objects.bulk_update(posts, ["content_html", "excerpt", "reading_time"], batch_size=200)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0016_post_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="content_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="reading_time",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Minutes"
+            ),
+        ),
+        migrations.RunPython(render_existing_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.4 on 2026-10-17 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0020_outboundemail"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SheetRowIndex",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("spreadsheet_id", models.CharField(max_length=100)),
+                ("worksheet", models.CharField(max_length=100)),
+                (
+                    "email",
+                    models.CharField(
+                        help_text="Column B value, stripped and lowercased",
+                        max_length=254,
+                    ),
+                ),
+                ("row", models.PositiveIntegerField()),
+                (
+                    "folder_url",
+                    models.CharField(
+                        blank=True,
+                        help_text="Column H when last read or written",
+                        max_length=500,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["spreadsheet_id", "worksheet", "row"],
+                "indexes": [
+                    models.Index(
+                        fields=["spreadsheet_id", "worksheet", "row"],
+                        name="blog_sheet_row_row",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="sheetrowindex",
+            constraint=models.UniqueConstraint(
+                fields=("spreadsheet_id", "worksheet", "email"),
+                name="blog_sheet_row_unique_email",
+            ),
+        ),
+    ]
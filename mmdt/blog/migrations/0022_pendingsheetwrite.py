@@ -0,0 +1,54 @@
+# Generated by Django 4.2.4 on 2026-10-17 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0021_sheetrowindex"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingSheetWrite",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("spreadsheet_id", models.CharField(max_length=100)),
+                ("worksheet", models.CharField(max_length=100)),
+                (
+                    "email",
+                    models.CharField(
+                        help_text="Column B value, stripped and lowercased",
+                        max_length=254,
+                    ),
+                ),
+                (
+                    "cells",
+                    models.JSONField(
+                        default=list,
+                        help_text="Columns A-H; null keeps the value in the sheet",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["created_at", "id"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pendingsheetwrite",
+            constraint=models.UniqueConstraint(
+                fields=("spreadsheet_id", "worksheet", "email"),
+                name="blog_sheet_write_unique_email",
+            ),
+        ),
+    ]
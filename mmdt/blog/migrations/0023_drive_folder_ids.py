@@ -0,0 +1,37 @@
+# Generated by Django 4.2.4 on 2026-10-17 11:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0022_pendingsheetwrite"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cohort",
+            name="drive_folder_id",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Google Drive folder of this cohort (filled on first use; clear to look it up again)",
+                max_length=100,
+            ),
+        ),
+        migrations.AddField(
+            model_name="subscriberrequest",
+            name="drive_folder_id",
+            field=models.CharField(blank=True, default="", max_length=100),
+        ),
+        migrations.AddField(
+            model_name="subscriberrequest",
+            name="drive_folder_url",
+            field=models.URLField(
+                blank=True,
+                default="",
+                help_text="Google Drive upload folder (filled on first use; clear to look it up again)",
+                max_length=500,
+            ),
+        ),
+    ]
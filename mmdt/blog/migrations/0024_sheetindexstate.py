@@ -0,0 +1,42 @@
+# Generated by Django 4.2.4 on 2026-10-17 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0023_drive_folder_ids"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SheetIndexState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("spreadsheet_id", models.CharField(max_length=100)),
+                ("worksheet", models.CharField(max_length=100)),
+                (
+                    "last_row",
+                    models.PositiveIntegerField(
+                        default=0, help_text="0 for an empty column B"
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="sheetindexstate",
+            constraint=models.UniqueConstraint(
+                fields=("spreadsheet_id", "worksheet"),
+                name="blog_sheet_index_state_unique",
+            ),
+        ),
+    ]
@@ -4,6 +4,11 @@ from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.db import models
 
+from .cohorts import get_timeline
+from .rendering import render_post_fields
+
+RENDERED_FIELDS = ('content_html', 'excerpt', 'reading_time')
+
 STATUS = (
     (0, "Draft"),
     (1, "Publish")
@@ -21,6 +26,10 @@ class Post(models.Model):
     image = models.ImageField(upload_to='images', null=True, blank=True)
     view_count = models.IntegerField(default=0, null=True, blank=True)
     subscribers_only = models.BooleanField(default=False)
+    # Derived from content on save (see blog.rendering); not edited directly.
+    content_html = models.TextField(blank=True, default='', editable=False)
+    excerpt = models.TextField(blank=True, default='', editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False, help_text='Minutes')
 
     class Meta:
         ordering = ['-created_on']
@@ -28,6 +37,36 @@ class Post(models.Model):
     def __str__(self):
         return self.title
 
+    def render_content(self):
+        """Recompute ``content_html``, ``excerpt`` and ``reading_time`` from ``content``."""
+        for name, value in render_post_fields(self.content).items():
+            setattr(self, name, value)
+
+    def save(self, *args, **kwargs):
+        self.render_content()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | set(RENDERED_FIELDS)
+        super().save(*args, **kwargs)
+
+
+class RelatedPost(models.Model):
+    """Precomputed "related posts" neighbours (see blog.related)."""
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['post', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'rank'], name='unique_related_post_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} -> {self.related_id} ({self.score:.3f})"
+
 
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
@@ -52,6 +91,10 @@ class Cohort(models.Model):
     exp_date_6 = models.DateTimeField(help_text="Expiry date for 6-month plan")
     exp_date_12 = models.DateTimeField(help_text="Expiry date for 12-month plan")
     is_active = models.BooleanField(default=True, help_text="Is this cohort accepting registrations?")
+    drive_folder_id = models.CharField(
+        max_length=100, blank=True, default='',
+        help_text="Google Drive folder of this cohort (filled on first use; clear to look it up again)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -72,13 +115,18 @@ class Cohort(models.Model):
 
     @classmethod
     def get_active_cohort(cls, submission_date=None):
-        if submission_date is None:
-            submission_date = timezone.now()
-        return cls.objects.filter(
-            is_active=True,
-            reg_start_date__lte=submission_date,
-            reg_end_date__gte=submission_date
-        ).first()
+        """Active cohort whose registration window contains ``submission_date`` (default: now)."""
+        return get_timeline().registration_cohort(submission_date)
+
+    @classmethod
+    def get_registration_cohort(cls, date):
+        """Cohort whose registration window contains ``date``, active or not."""
+        return get_timeline().registration_cohort(date, active_only=False)
+
+    @classmethod
+    def get_upcoming_cohort(cls, date=None):
+        """First cohort whose registration opens after ``date`` (default: now)."""
+        return get_timeline().starting_after(date or timezone.now())
 
     def get_next_cohort(self, skip=1):
         """
@@ -90,13 +138,7 @@ class Cohort(models.Model):
         Returns:
             Cohort instance or None if not found
         """
-        next_cohorts = Cohort.objects.filter(
-            reg_start_date__gt=self.reg_start_date
-        ).order_by('reg_start_date')[:skip]
-        
-        if next_cohorts.count() >= skip:
-            return list(next_cohorts)[-1]
-        return None
+        return get_timeline().starting_after(self.reg_start_date, skip=skip)
 
 
 class SubscriberRequest(models.Model):
@@ -131,6 +173,11 @@ class SubscriberRequest(models.Model):
         related_name='subscriber_requests',
         help_text="Auto-assigned based on submission date"
     )
+    drive_folder_id = models.CharField(max_length=100, blank=True, default='')
+    drive_folder_url = models.URLField(
+        max_length=500, blank=True, default='',
+        help_text="Google Drive upload folder (filled on first use; clear to look it up again)"
+    )
 
     def calculate_expiry_date(self):
         if self.cohort:
@@ -166,3 +213,136 @@ class SubscriberRequest(models.Model):
 
     def __str__(self):
         return f"{self.name} - {self.email}"
+
+
+class BackgroundJob(models.Model):
+    """A unit of deferred work run by ``manage.py run_jobs`` (see blog.jobs)."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now, help_text="Not run before this time (retry backoff)")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='blog_job_status_run_at'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class OutboundEmail(models.Model):
+    """An email waiting in the outbox for ``manage.py send_queued_emails`` (see blog.outbox)."""
+    QUEUED = 'queued'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254, blank=True)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    send_after = models.DateTimeField(default=timezone.now, help_text="Not sent before this time (retry backoff)")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['send_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'send_after'], name='blog_outbox_status_send_after'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+
+class SheetRowIndex(models.Model):
+    """Row of an email in a Google worksheet, so lookups read one row (see blog.sheet_index)."""
+    spreadsheet_id = models.CharField(max_length=100)
+    worksheet = models.CharField(max_length=100)
+    email = models.CharField(max_length=254, help_text="Column B value, stripped and lowercased")
+    row = models.PositiveIntegerField()
+    folder_url = models.CharField(max_length=500, blank=True, help_text="Column H when last read or written")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['spreadsheet_id', 'worksheet', 'row']
+        constraints = [
+            models.UniqueConstraint(fields=['spreadsheet_id', 'worksheet', 'email'], name='blog_sheet_row_unique_email'),
+        ]
+        indexes = [
+            models.Index(fields=['spreadsheet_id', 'worksheet', 'row'], name='blog_sheet_row_row'),
+        ]
+
+    def __str__(self):
+        return f"{self.worksheet}!{self.row} {self.email}"
+
+
+class SheetIndexState(models.Model):
+    """Last row with a column B value in an indexed worksheet (see blog.sheet_index)."""
+    spreadsheet_id = models.CharField(max_length=100)
+    worksheet = models.CharField(max_length=100)
+    last_row = models.PositiveIntegerField(default=0, help_text="0 for an empty column B")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['spreadsheet_id', 'worksheet'], name='blog_sheet_index_state_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.worksheet}: {self.last_row} rows"
+
+
+class PendingSheetWrite(models.Model):
+    """A worksheet row upsert waiting to be flushed with others (see blog.sheet_buffer)."""
+    spreadsheet_id = models.CharField(max_length=100)
+    worksheet = models.CharField(max_length=100)
+    email = models.CharField(max_length=254, help_text="Column B value, stripped and lowercased")
+    cells = models.JSONField(default=list, help_text="Columns A-H; null keeps the value in the sheet")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['spreadsheet_id', 'worksheet', 'email'], name='blog_sheet_write_unique_email'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.worksheet} {self.email}"
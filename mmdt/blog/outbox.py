@@ -0,0 +1,214 @@
+"""
+Email outbox.
+
+Request threads and jobs call ``queue_email()``, which only stores an
+``OutboundEmail`` row. ``manage.py send_queued_emails`` drains the outbox in
+batches, sending each batch over one SMTP connection from
+``get_connection()`` instead of a TLS handshake and login per message, and
+at most ``EMAIL_OUTBOX_RATE_LIMIT`` messages per minute (Gmail throttles
+bursts, e.g. when a cohort opens).
+
+Every message keeps its own status, attempt counter and ``send_after``
+time: a failed send is retried with the same backoff as background jobs
+(``blog.jobs.retry_delay``) until ``max_attempts``, then marked failed with
+the error, visible and re-queueable in the admin.
+"""
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .jobs import get_lock_timeout, get_max_attempts, retry_delay
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def get_batch_size():
+    return getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+
+
+def get_rate_limit():
+    """Messages per minute; 0 disables throttling."""
+    return getattr(settings, 'EMAIL_OUTBOX_RATE_LIMIT', 60)
+
+
+def _outbound_email(subject, body, to, html_body='', from_email=None):
+    return OutboundEmail(
+        subject=subject,
+        body=body,
+        html_body=html_body or '',
+        from_email=from_email or '',
+        to=list(to),
+        max_attempts=get_max_attempts(),
+    )
+
+
+def queue_email(subject, body, to, html_body='', from_email=None):
+    """
+    Add a message to the outbox.
+
+    Args:
+        subject: Subject line
+        body: Plain-text body
+        to: List of recipient addresses
+        html_body: Optional HTML alternative
+        from_email: Sender (default: ``DEFAULT_FROM_EMAIL``)
+
+    Returns:
+        OutboundEmail: The queued message
+    """
+    outbound = _outbound_email(subject, body, to, html_body=html_body, from_email=from_email)
+    outbound.save()
+    return outbound
+
+
+def queue_emails(messages):
+    """
+    Add several messages to the outbox with one INSERT.
+
+    Args:
+        messages: Iterable of dicts of ``queue_email()`` keyword arguments
+
+    Returns:
+        list[OutboundEmail]: The queued messages
+    """
+    return OutboundEmail.objects.bulk_create([_outbound_email(**message) for message in messages])
+
+
+def claim_batch(size=None):
+    """
+    Lock up to ``size`` due messages for this sender.
+
+    Returns:
+        list[OutboundEmail]: The claimed messages, oldest first
+    """
+    size = size or get_batch_size()
+    now = timezone.now()
+    stale = now - timedelta(seconds=get_lock_timeout())
+    token = uuid.uuid4().hex
+    due = list(
+        OutboundEmail.objects
+        .filter(Q(status=OutboundEmail.QUEUED, send_after__lte=now) | Q(status=OutboundEmail.SENDING, locked_at__lt=stale))
+        .order_by('send_after', 'pk')
+        .values_list('pk', flat=True)[:size]
+    )
+    if not due:
+        return []
+    # Conditional update: rows another sender claimed in the meantime are skipped.
+    OutboundEmail.objects.filter(
+        Q(status=OutboundEmail.QUEUED) | Q(status=OutboundEmail.SENDING, locked_at__lt=stale), pk__in=due
+    ).update(status=OutboundEmail.SENDING, locked_at=now, locked_by=token)
+    return list(OutboundEmail.objects.filter(locked_by=token, status=OutboundEmail.SENDING).order_by('send_after', 'pk'))
+
+
+def _build_message(outbound, connection):
+    message = EmailMultiAlternatives(
+        subject=outbound.subject,
+        body=outbound.body,
+        from_email=outbound.from_email or None,
+        to=outbound.to,
+        connection=connection,
+    )
+    if outbound.html_body:
+        message.attach_alternative(outbound.html_body, 'text/html')
+    return message
+
+
+def _record_failure(outbound, error):
+    outbound.attempts += 1
+    outbound.last_error = error
+    if outbound.attempts >= outbound.max_attempts:
+        outbound.status = OutboundEmail.FAILED
+        logger.error("Giving up on email %s to %s after %s attempts: %s",
+                     outbound.pk, outbound.to, outbound.attempts, error)
+    else:
+        outbound.status = OutboundEmail.QUEUED
+        outbound.send_after = timezone.now() + timedelta(seconds=retry_delay(outbound.attempts))
+        logger.warning("Email %s to %s failed (attempt %s/%s): %s",
+                       outbound.pk, outbound.to, outbound.attempts, outbound.max_attempts, error)
+    outbound.locked_at = None
+    outbound.locked_by = ''
+    outbound.save(update_fields=['attempts', 'last_error', 'status', 'send_after', 'locked_at', 'locked_by'])
+
+
+def send_batch(batch):
+    """
+    Send claimed messages over a single connection.
+
+    Returns:
+        dict: Counts of messages ``sent``, ``retried`` and ``failed``
+    """
+    counts = {'sent': 0, 'retried': 0, 'failed': 0}
+    if not batch:
+        return counts
+
+    rate_limit = get_rate_limit()
+    interval = 60.0 / rate_limit if rate_limit else 0.0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        for outbound in batch:
+            _record_failure(outbound, f"Connection failed: {e}")
+            counts['failed' if outbound.status == OutboundEmail.FAILED else 'retried'] += 1
+        return counts
+
+    next_slot = time.monotonic()
+    try:
+        for outbound in batch:
+            if interval:
+                delay = next_slot - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_slot = max(next_slot, time.monotonic()) + interval
+            try:
+                _build_message(outbound, connection).send()
+            except Exception as e:
+                _record_failure(outbound, f"{type(e).__name__}: {e}")
+                counts['failed' if outbound.status == OutboundEmail.FAILED else 'retried'] += 1
+                # The server may have dropped us; start the next message on a fresh session.
+                connection.close()
+                connection.open()
+                continue
+            outbound.status = OutboundEmail.SENT
+            outbound.attempts += 1
+            outbound.sent_at = timezone.now()
+            outbound.last_error = ''
+            outbound.locked_at = None
+            outbound.locked_by = ''
+            outbound.save(update_fields=['status', 'attempts', 'sent_at', 'last_error', 'locked_at', 'locked_by'])
+            counts['sent'] += 1
+    except Exception as e:
+        # Reconnecting failed: put the rest of the batch back for the next run.
+        for outbound in batch:
+            if outbound.status == OutboundEmail.SENDING:
+                _record_failure(outbound, f"Connection failed: {e}")
+                counts['failed' if outbound.status == OutboundEmail.FAILED else 'retried'] += 1
+    finally:
+        connection.close()
+    return counts
+
+
+def send_queued_emails(batch_size=None, max_batches=None):
+    """
+    Send due outbox messages until none is left (or ``max_batches`` were sent).
+
+    Returns:
+        dict: Counts of messages ``sent``, ``retried`` and ``failed``
+    """
+    totals = {'sent': 0, 'retried': 0, 'failed': 0}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        batch = claim_batch(batch_size)
+        if not batch:
+            break
+        for key, value in send_batch(batch).items():
+            totals[key] += value
+        batches += 1
+    return totals
@@ -0,0 +1,192 @@
+"""
+Keyset (cursor) pagination.
+
+Django's ``Paginator`` runs ``COUNT(*)`` and then an ``OFFSET`` query, and
+both get slower the deeper the page. ``KeysetPaginator`` orders by a unique
+key such as ``('-created_on', '-id')`` and fetches the rows after (or
+before) a given row instead, so every page costs one query on the ordering
+index whatever its depth, and no total count is ever needed.
+
+Positions travel in the query string as opaque cursors: url-safe base64 of
+the key values of a row and a direction. A cursor only moves the window
+over the same queryset, so a hand-edited one cannot reveal other rows; an
+unreadable one raises ``InvalidCursor``. NULL key values sort last.
+"""
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import date, datetime
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(ValueError):
+    """The cursor is malformed or does not match the paginator's ordering."""
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()  # full precision, unlike DjangoJSONEncoder
+    return str(value)
+
+
+class KeysetPage(Sequence):
+    """One page of a ``KeysetPaginator``; behaves like a Django ``Page`` without numbers."""
+
+    number = None
+
+    def __init__(self, object_list, cursor, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<KeysetPage {self.cursor or "first"}>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate ``queryset`` by the values of ``ordering``.
+
+    Args:
+        queryset: Rows to page through (its own ordering is replaced)
+        per_page: Rows per page
+        ordering: Field names, ``-`` for descending; together they must be
+            unique, so end with ``id``
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-created_on', '-id')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.keys = []
+        model = queryset.model
+        for name in ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            self.keys.append((field.attname, descending, field))
+
+    def _values(self, obj):
+        return [getattr(obj, attname) for attname, _, _ in self.keys]
+
+    def encode_cursor(self, values, direction):
+        payload = json.dumps([direction, values], default=_json_default, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).rstrip(b'=').decode('ascii')
+
+    def decode_cursor(self, cursor):
+        """
+        Return ``(values, direction)`` for ``cursor``.
+
+        Raises:
+            InvalidCursor: If the cursor cannot be read
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, raw_values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+            raise InvalidCursor('Malformed cursor.') from exc
+        if direction not in (NEXT, PREVIOUS) or not isinstance(raw_values, list) or len(raw_values) != len(self.keys):
+            raise InvalidCursor('Cursor does not match this listing.')
+        try:
+            values = [
+                None if raw is None else field.to_python(raw)
+                for (_, _, field), raw in zip(self.keys, raw_values)
+            ]
+        except (ValidationError, TypeError) as exc:
+            raise InvalidCursor('Malformed cursor.') from exc
+        return values, direction
+
+    def cursor_after(self, obj):
+        """Cursor of the page that starts right after ``obj``."""
+        return self.encode_cursor(self._values(obj), NEXT)
+
+    def cursor_before(self, obj):
+        """Cursor of the page that ends right before ``obj``."""
+        return self.encode_cursor(self._values(obj), PREVIOUS)
+
+    def _order_by(self, forward):
+        expressions = []
+        for attname, descending, field in self.keys:
+            if not forward:
+                descending = not descending
+            nulls = {'nulls_last': True} if forward else {'nulls_first': True}
+            expression = F(attname).desc if descending else F(attname).asc
+            expressions.append(expression(**nulls) if field.null else expression())
+        return expressions
+
+    def _beyond(self, values, forward):
+        """Filter for the rows strictly after ``values`` (before, if not ``forward``)."""
+        clauses = []
+        equal = Q()
+        for (attname, descending, field), value in zip(self.keys, values):
+            if forward:
+                if value is not None:
+                    lookup = 'lt' if descending else 'gt'
+                    beyond = Q(**{f'{attname}__{lookup}': value})
+                    if field.null:
+                        beyond |= Q(**{f'{attname}__isnull': True})
+                    clauses.append(equal & beyond)
+            elif value is None:
+                clauses.append(equal & Q(**{f'{attname}__isnull': False}))
+            else:
+                lookup = 'gt' if descending else 'lt'
+                clauses.append(equal & Q(**{f'{attname}__{lookup}': value}))
+            equal &= Q(**{f'{attname}__isnull': True}) if value is None else Q(**{attname: value})
+        return reduce(or_, clauses) if clauses else Q(pk__in=[])
+
+    def page(self, cursor=None):
+        """
+        Return the ``KeysetPage`` at ``cursor`` (the first page if it is empty).
+
+        Raises:
+            InvalidCursor: If the cursor cannot be read
+        """
+        queryset = self.queryset
+        forward = True
+        values = None
+        if cursor:
+            values, direction = self.decode_cursor(cursor)
+            forward = direction == NEXT
+            queryset = queryset.filter(self._beyond(values, forward))
+
+        # One extra row tells whether there is another page in this direction.
+        rows = list(queryset.order_by(*self._order_by(forward))[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        has_next = more if forward else bool(cursor)
+        has_previous = bool(cursor) if forward else more
+        next_cursor = previous_cursor = None
+        if rows:
+            next_cursor = self.cursor_after(rows[-1]) if has_next else None
+            previous_cursor = self.cursor_before(rows[0]) if has_previous else None
+        elif cursor:
+            # Nothing left on this side of the cursor (e.g. rows were deleted): allow going back.
+            next_cursor = None if forward else self.encode_cursor(values, NEXT)
+            previous_cursor = self.encode_cursor(values, PREVIOUS) if forward else None
+        return KeysetPage(rows, cursor or None, next_cursor, previous_cursor)
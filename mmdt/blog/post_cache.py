@@ -0,0 +1,79 @@
+"""
+Cache for the published post list pages.
+
+Every entry is keyed by a post cache version stored in the default cache.
+The version is replaced whenever a ``Post`` is saved or deleted (see
+``blog.signals``), so stale pages are never served; old entries simply
+expire after ``POST_LIST_CACHE_TIMEOUT`` seconds. The same version is used
+as a vary-on value by the ``{% cache %}`` fragments in the list templates.
+The RSS/Atom feeds and the sitemap read their posts through
+``get_cached_list()``.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = 'blog:posts:version'
+
+
+def get_timeout():
+    return getattr(settings, 'POST_LIST_CACHE_TIMEOUT', 300)
+
+
+def get_post_cache_version():
+    """Return the current post cache version, creating one if it is missing."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_post_cache_version():
+    """Invalidate every cached post list page."""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def _key(audience, *parts):
+    return ':'.join(['blog:posts', audience, str(get_post_cache_version())] + [str(p) for p in parts])
+
+
+def get_cached_count(audience, queryset):
+    """Return ``queryset.count()`` for ``audience``, cached until the next post change."""
+    key = _key(audience, 'count')
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, get_timeout())
+    return count
+
+
+def get_cached_posts(audience, page):
+    """Return the posts of ``page`` as a list, cached per audience, page number and size."""
+    key = _key(audience, 'page', page.number, page.paginator.per_page)
+    posts = cache.get(key)
+    if posts is None:
+        posts = list(page.object_list)
+        cache.set(key, posts, get_timeout())
+    return posts
+
+
+def get_cached_keyset_page(audience, paginator, cursor):
+    """Return ``paginator.page(cursor)`` (a ``KeysetPage``), cached per audience, cursor and size."""
+    key = _key(audience, 'cursor', paginator.per_page, cursor)
+    page = cache.get(key)
+    if page is None:
+        page = paginator.page(cursor)
+        cache.set(key, page, get_timeout())
+    return page
+
+
+def get_cached_list(audience, name, queryset):
+    """Return ``list(queryset)`` cached per audience and ``name`` until the next post change."""
+    key = _key(audience, name)
+    items = cache.get(key)
+    if items is None:
+        items = list(queryset)
+        cache.set(key, items, get_timeout())
+    return items
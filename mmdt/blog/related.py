@@ -0,0 +1,142 @@
+"""
+"Related posts" recommendations from a precomputed TF-IDF similarity index.
+
+``rebuild_related_posts()`` vectorizes every published post (title counted
+twice, plus the plain text of its content), computes cosine similarities
+block by block with one sparse matrix product per block and keeps the top
+``RELATED_POSTS_COUNT`` neighbours of each post in the ``RelatedPost``
+table. Only posts whose neighbour list actually changed are rewritten.
+
+Public posts are only related to other public posts, so the block never
+links anonymous readers to subscriber-only content.
+"""
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .models import Post, RelatedPost
+from .rendering import html_to_text
+
+BLOCK_SIZE = 256
+# Scores are compared at this precision so float noise does not cause rewrites.
+SCORE_DECIMALS = 4
+
+
+def get_related_count():
+    return getattr(settings, 'RELATED_POSTS_COUNT', 3)
+
+
+def build_documents(posts):
+    return [f'{post.title} {post.title} {html_to_text(post.content)}' for post in posts]
+
+
+def top_k_neighbours(matrix, k, public=None, block_size=BLOCK_SIZE):
+    """
+    Top-``k`` most similar rows for every row of an l2-normalized matrix.
+
+    Args:
+        matrix: Sparse (n_posts, n_terms) TF-IDF matrix with unit-length rows
+        k: Neighbours to keep per row
+        public: Optional boolean array; public rows only get public neighbours
+        block_size: Rows multiplied at once (bounds memory to block_size * n_posts)
+
+    Returns:
+        list[list[tuple[int, float]]]: Per row, (column, similarity) best first;
+        pairs without any shared term are left out
+    """
+    n_rows = matrix.shape[0]
+    neighbours = []
+    if n_rows < 2 or k < 1:
+        return [[] for _ in range(n_rows)]
+    k = min(k, n_rows - 1)
+    transposed = matrix.T.tocsc()
+    private_columns = np.flatnonzero(~public) if public is not None else np.empty(0, dtype=int)
+
+    for start in range(0, n_rows, block_size):
+        stop = min(start + block_size, n_rows)
+        similarities = (matrix[start:stop] @ transposed).toarray()
+        rows = np.arange(stop - start)
+        similarities[rows, rows + start] = -np.inf
+        if private_columns.size:
+            public_rows = np.flatnonzero(public[start:stop])
+            similarities[np.ix_(public_rows, private_columns)] = -np.inf
+
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        for columns, scores in zip(top, top_scores):
+            neighbours.append([
+                (int(column), float(score)) for column, score in zip(columns, scores) if score > 0
+            ])
+    return neighbours
+
+
+def compute_related(k=None):
+    """
+    Compute the neighbour lists of all published posts.
+
+    Returns:
+        dict[int, list[tuple[int, float]]]: post id -> [(related post id, score), ...]
+    """
+    # Imported here: web workers import this module for get_related_posts() and
+    # should not pay for loading scikit-learn.
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    k = get_related_count() if k is None else k
+    posts = list(Post.objects.filter(status=1).only('pk', 'title', 'content', 'subscribers_only').order_by('pk'))
+    if not posts:
+        return {}
+    vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+    try:
+        matrix = vectorizer.fit_transform(build_documents(posts))
+    except ValueError:  # every document is empty or stop words only
+        return {post.pk: [] for post in posts}
+    public = np.array([not post.subscribers_only for post in posts])
+    ids = [post.pk for post in posts]
+    return {
+        ids[row]: [(ids[column], round(score, SCORE_DECIMALS)) for column, score in row_neighbours]
+        for row, row_neighbours in enumerate(top_k_neighbours(matrix, k, public=public))
+    }
+
+
+def rebuild_related_posts(k=None, force=False):
+    """
+    Bring the ``RelatedPost`` table up to date.
+
+    Args:
+        k: Neighbours per post (default: ``RELATED_POSTS_COUNT``)
+        force: Rewrite every post, even if its neighbours did not change
+
+    Returns:
+        dict: Counts of ``posts``, ``updated`` and ``removed`` posts
+    """
+    related = compute_related(k)
+
+    stored = {}
+    for post_id, related_id, score in RelatedPost.objects.order_by('post_id', 'rank').values_list(
+        'post_id', 'related_id', 'score'
+    ):
+        stored.setdefault(post_id, []).append((related_id, round(score, SCORE_DECIMALS)))
+
+    changed = [post_id for post_id, pairs in related.items() if force or stored.get(post_id, []) != pairs]
+    removed = [post_id for post_id in stored if post_id not in related]
+
+    with transaction.atomic():
+        RelatedPost.objects.filter(post_id__in=changed + removed).delete()
+        RelatedPost.objects.bulk_create([
+            RelatedPost(post_id=post_id, related_id=related_id, rank=rank, score=score)
+            for post_id in changed
+            for rank, (related_id, score) in enumerate(related[post_id])
+        ], batch_size=500)
+
+    return {'posts': len(related), 'updated': len(changed), 'removed': len(removed)}
+
+
+def get_related_posts(post, include_subscriber_posts=False):
+    """Return the stored related posts of ``post``, best first (one query)."""
+    links = RelatedPost.objects.filter(post=post, related__status=1).select_related('related')
+    if not include_subscriber_posts:
+        links = links.filter(related__subscribers_only=False)
+    return [link.related for link in links.defer('related__content', 'related__content_html')]
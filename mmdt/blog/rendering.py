@@ -0,0 +1,104 @@
+"""
+Pre-rendered fields derived from a post's Summernote HTML.
+
+``Post.save()`` stores the results in ``content_html`` (sanitized HTML),
+``excerpt`` (plain-text preview) and ``reading_time`` (minutes), so list
+pages never have to load or process the full ``content``.
+"""
+import html
+import math
+import re
+
+import bleach
+from bleach.css_sanitizer import CSSSanitizer
+from django.utils.html import strip_tags
+
+_css_sanitizer = CSSSanitizer()
+
+# A script/style element with its contents; an unclosed one runs to the end, as in browsers.
+_INVISIBLE_RE = re.compile(r'<(script|style)\b.*?(?:</\1\s*>|$)', re.IGNORECASE | re.DOTALL)
+
+EXCERPT_LENGTH = 400
+WORDS_PER_MINUTE = 200
+
+# Markup the Summernote toolbar produces.
+ALLOWED_TAGS = frozenset({
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'font', 'h1', 'h2', 'h3', 'h4',
+    'h5', 'h6', 'hr', 'i', 'iframe', 'img', 'li', 'ol', 'p', 'pre', 's', 'small', 'span',
+    'strike', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'u', 'ul',
+})
+ALLOWED_ATTRIBUTES = {
+    '*': ['class', 'style', 'title'],
+    'a': ['href', 'target', 'rel'],
+    'font': ['color', 'face', 'size'],
+    'iframe': ['src', 'width', 'height', 'frameborder', 'allowfullscreen'],
+    'img': ['src', 'alt', 'width', 'height'],
+    'td': ['colspan', 'rowspan'],
+    'th': ['colspan', 'rowspan'],
+}
+# ``data:`` must pass bleach's protocol check for pasted images; _allow_attribute
+# then limits it to ``img src="data:image/..."``.
+ALLOWED_PROTOCOLS = frozenset({'http', 'https', 'mailto', 'data'})
+URI_ATTRIBUTES = frozenset({'href', 'src'})
+# Characters browsers ignore inside a URI scheme (as stripped by bleach).
+_URI_IGNORED_RE = re.compile(r'[`\000-\040\177-\240\s]+')
+
+
+def _allow_attribute(tag, name, value):
+    """Attribute filter: ``ALLOWED_ATTRIBUTES``, with ``data:`` URIs only for inline images."""
+    if name not in ALLOWED_ATTRIBUTES.get(tag, ()) and name not in ALLOWED_ATTRIBUTES['*']:
+        return False
+    if name in URI_ATTRIBUTES:
+        uri = _URI_IGNORED_RE.sub('', value).lower()
+        if uri.startswith('data:'):
+            return tag == 'img' and name == 'src' and uri.startswith('data:image/')
+    return True
+
+
+def sanitize_html(value):
+    """Strip scripts, event handlers, unknown markup and non-image ``data:`` URIs from post HTML."""
+    # strip=True keeps the text of removed tags, which for scripts and styles is code.
+    return bleach.clean(
+        _INVISIBLE_RE.sub('', value or ''),
+        tags=ALLOWED_TAGS,
+        attributes=_allow_attribute,
+        protocols=ALLOWED_PROTOCOLS,
+        css_sanitizer=_css_sanitizer,
+        strip=True,
+        strip_comments=True,
+    )
+
+
+def html_to_text(value):
+    """Reduce post HTML to the words a reader sees."""
+    value = _INVISIBLE_RE.sub(' ', value or '')
+    # Space before every tag so "<p>a</p><p>b</p>" reads "a b", not "ab".
+    return ' '.join(html.unescape(strip_tags(value.replace('<', ' <'))).split())
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """Cut plain ``text`` at a word boundary to at most ``length`` characters."""
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0].rstrip(' ,.;:')
+    return cut + '…'
+
+
+def estimate_reading_time(text, words_per_minute=WORDS_PER_MINUTE):
+    """Reading time of plain ``text`` in whole minutes (at least 1)."""
+    return max(1, math.ceil(len(text.split()) / words_per_minute))
+
+
+def render_post_fields(content):
+    """
+    Compute the denormalized post columns from Summernote HTML.
+
+    Returns:
+        dict: ``content_html``, ``excerpt`` and ``reading_time``
+    """
+    text = html_to_text(content)
+    return {
+        'content_html': sanitize_html(content),
+        'excerpt': make_excerpt(text),
+        'reading_time': estimate_reading_time(text),
+    }
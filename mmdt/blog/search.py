@@ -0,0 +1,146 @@
+"""
+Full-text search over blog posts backed by an SQLite FTS5 index.
+
+The ``blog_post_fts`` virtual table holds each post's title and the plain
+text of its Summernote HTML, with ``rowid`` equal to the post id. It is
+created by migration ``0016_post_search_index``, kept in sync by the
+``Post`` save/delete signals in ``blog.signals`` and can be rebuilt with
+``manage.py rebuild_search_index``.
+
+On databases other than SQLite the index is not available and searches fall
+back to ``icontains`` filters.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, When
+
+from .rendering import html_to_text
+
+FTS_TABLE = 'blog_post_fts'
+# bm25 column weights: a hit in the title counts ten times a hit in the body.
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_supported(conn=None):
+    """True if the database can host the FTS5 index."""
+    return (conn or connection).vendor == 'sqlite'
+
+
+def create_index(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5(title, body, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+
+def drop_index(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def index_post(post):
+    """Add or replace ``post`` in the search index."""
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)",
+            [post.pk, post.title, html_to_text(post.content)],
+        )
+
+
+def remove_post(post_id):
+    """Remove a post from the search index."""
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post_id])
+
+
+def rebuild_index(posts, conn=None):
+    """
+    Replace the whole index with ``posts``.
+
+    Args:
+        posts: Iterable of objects with ``pk``, ``title`` and ``content``
+        conn: Database connection (default: the default connection)
+
+    Returns:
+        int: Number of posts indexed
+    """
+    conn = conn or connection
+    count = 0
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        batch = []
+        for post in posts:
+            batch.append((post.pk, post.title, html_to_text(post.content)))
+            if len(batch) >= 500:
+                cursor.executemany(f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)", batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)", batch)
+            count += len(batch)
+    return count
+
+
+def build_match_query(query):
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word is quoted (so FTS5 operators and punctuation in user input are
+    treated as text) and matched as a prefix; all words must match.
+    """
+    tokens = _TOKEN_RE.findall(query or '')
+    return ' '.join('"{}"*'.format(token.replace('"', '""')) for token in tokens)
+
+
+def search_post_ids(query, limit=None):
+    """
+    Return ids of posts matching ``query``, best match first (bm25).
+
+    Returns:
+        list[int]: Matching post ids (empty for a query without words)
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+    sql = (
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+        f"ORDER BY bm25({FTS_TABLE}, {TITLE_WEIGHT}, {BODY_WEIGHT})"
+    )
+    params = [match]
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_posts(queryset, query, limit=500):
+    """
+    Filter ``queryset`` to the ``limit`` posts best matching ``query``, ordered by relevance.
+
+    Falls back to ``icontains`` on title/content where FTS5 is unavailable.
+    """
+    if not is_supported():
+        words = _TOKEN_RE.findall(query or '')
+        if not words:
+            return queryset.none()
+        for word in words:
+            queryset = queryset.filter(Q(title__icontains=word) | Q(content__icontains=word))
+        return queryset
+
+    ids = search_post_ids(query, limit=limit)
+    if not ids:
+        return queryset.none()
+    rank = Case(*[When(pk=pk, then=position) for position, pk in enumerate(ids)], output_field=IntegerField())
+    return queryset.filter(pk__in=ids).annotate(search_rank=rank).order_by('search_rank')
@@ -0,0 +1,162 @@
+"""
+Batched worksheet writes.
+
+Registration and renewal logging used to send one ``update`` or
+``append_row`` per subscriber, which runs into the Sheets per-minute write
+quota during a registration rush. ``buffer_row()`` stores the row as a
+``PendingSheetWrite`` instead, keyed by email: a later write for the same
+email is merged into it (cells given as ``None`` keep the earlier value,
+or the value already in the sheet).
+
+``flush_sheet_writes()`` sends everything pending for a worksheet with one
+``batch_get`` to locate the rows (``SheetEmailIndex.locate``), one
+``batch_update`` for rows already in the sheet and one multi-row append
+for the rest. It runs as a background job (``manage.py run_jobs``)
+scheduled ``SHEET_WRITE_MAX_DELAY`` seconds after the first pending write,
+or right away once ``SHEET_WRITE_BATCH_SIZE`` writes are pending; a failed
+flush is retried like any job and nothing is lost.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import jobs
+from .models import BackgroundJob, PendingSheetWrite
+from .sheet_index import EMAIL_COLUMN, FOLDER_URL_COLUMN, SheetEmailIndex, normalize_email
+
+logger = logging.getLogger(__name__)
+
+SHEET_FLUSH_JOB = 'sheet_writes.flush'
+ROW_WIDTH = 8  # A-H
+
+
+def get_batch_size():
+    return getattr(settings, 'SHEET_WRITE_BATCH_SIZE', 20)
+
+
+def get_max_delay():
+    return getattr(settings, 'SHEET_WRITE_MAX_DELAY', 30)
+
+
+def _pending(spreadsheet_id, title):
+    return PendingSheetWrite.objects.filter(spreadsheet_id=spreadsheet_id, worksheet=title)
+
+
+def buffer_row(spreadsheet_id, title, email, cells):
+    """
+    Queue an upsert of the row whose column B is ``email``.
+
+    Args:
+        spreadsheet_id: Spreadsheet to write to
+        title: Worksheet title
+        email: Row key (column B)
+        cells: Values for columns A-H; ``None`` leaves a cell unchanged
+
+    Returns:
+        PendingSheetWrite: The pending write, merged with any earlier one
+    """
+    email = normalize_email(email)
+    cells = (list(cells) + [None] * ROW_WIDTH)[:ROW_WIDTH]
+    with transaction.atomic():
+        pending = _pending(spreadsheet_id, title).select_for_update().filter(email=email).first()
+        if pending is None:
+            pending = PendingSheetWrite.objects.create(
+                spreadsheet_id=spreadsheet_id, worksheet=title, email=email, cells=cells
+            )
+        else:
+            pending.cells = [new if new is not None else old for new, old in zip(cells, pending.cells)]
+            pending.save(update_fields=['cells', 'updated_at'])
+        _schedule_flush(spreadsheet_id, title)
+    return pending
+
+
+def pending_cells(spreadsheet_id, title, email):
+    """Return the not yet flushed cells (A-H) for ``email``, or ``None``."""
+    pending = _pending(spreadsheet_id, title).filter(email=normalize_email(email)).first()
+    return pending.cells if pending else None
+
+
+def _schedule_flush(spreadsheet_id, title):
+    now = timezone.now()
+    if _pending(spreadsheet_id, title).count() >= get_batch_size():
+        run_at = now
+    else:
+        run_at = now + timedelta(seconds=get_max_delay())
+    queued = BackgroundJob.objects.filter(
+        name=SHEET_FLUSH_JOB,
+        status=BackgroundJob.QUEUED,
+        payload__spreadsheet_id=spreadsheet_id,
+        payload__worksheet=title,
+    )
+    if queued.exists():
+        queued.filter(run_at__gt=run_at).update(run_at=run_at, updated_at=now)
+    else:
+        jobs.enqueue(SHEET_FLUSH_JOB, run_at=run_at, spreadsheet_id=spreadsheet_id, worksheet=title)
+
+
+def flush_sheet_writes(worksheet, spreadsheet_id):
+    """
+    Write every pending row of ``worksheet`` in one batch.
+
+    Args:
+        worksheet: gspread ``Worksheet``
+        spreadsheet_id: Spreadsheet the worksheet belongs to
+
+    Returns:
+        dict: Counts of rows ``updated``, ``appended`` and ``dropped``
+        (partial updates for rows no longer in the sheet)
+    """
+    counts = {'updated': 0, 'appended': 0, 'dropped': 0}
+    title = worksheet.title
+    pending = list(_pending(spreadsheet_id, title).order_by('created_at', 'pk'))
+    if not pending:
+        return counts
+
+    index = SheetEmailIndex(worksheet, spreadsheet_id)
+    rows = index.locate(write.email for write in pending)
+    updates, appends, recorded = [], [], []
+    for write in pending:
+        row = rows.get(write.email)
+        if row:
+            updates.append({'range': f'A{row}:H{row}', 'values': [write.cells]})
+            if write.cells[FOLDER_URL_COLUMN - 1] is not None:
+                recorded.append((write.email, row, write.cells[FOLDER_URL_COLUMN - 1]))
+        elif write.cells[EMAIL_COLUMN - 1] is None:
+            logger.warning("Dropping sheet update for %s: no row for it in %s", write.email, title)
+            counts['dropped'] += 1
+        else:
+            appends.append(['' if cell is None else cell for cell in write.cells])
+
+    if updates:
+        # Null values in a batch update leave those cells untouched.
+        worksheet.batch_update(updates, value_input_option='USER_ENTERED')
+        for email, row, folder_url in recorded:
+            index.record(email, row, folder_url)
+        counts['updated'] = len(updates)
+    if appends:
+        index.append_rows(appends)
+        counts['appended'] = len(appends)
+
+    # Writes merged while we were flushing stay pending for the next flush.
+    flushed = {write.pk: write.updated_at for write in pending}
+    with transaction.atomic():
+        current = _pending(spreadsheet_id, title).select_for_update().filter(pk__in=flushed)
+        unchanged = [pk for pk, updated_at in current.values_list('pk', 'updated_at') if flushed[pk] == updated_at]
+        PendingSheetWrite.objects.filter(pk__in=unchanged).delete()
+
+    logger.info(
+        "Flushed %s: %s updated, %s appended, %s dropped",
+        title, counts['updated'], counts['appended'], counts['dropped'],
+    )
+    return counts
+
+
+@jobs.register(SHEET_FLUSH_JOB)
+def flush_job(spreadsheet_id, worksheet):
+    """Job: flush the pending writes of one worksheet."""
+    from .google_api_utils import get_worksheet
+
+    flush_sheet_writes(get_worksheet(spreadsheet_id, worksheet), spreadsheet_id)
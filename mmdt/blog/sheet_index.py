@@ -0,0 +1,203 @@
+"""
+Email -> row index for worksheets keyed by email in column B (``raw_registration``).
+
+Finding a subscriber's row used to download the whole sheet
+(``get_all_values()`` or ``find()``) on every lookup and upsert.
+``SheetEmailIndex`` keeps ``SheetRowIndex`` rows (email, row number,
+folder URL) in the database instead:
+
+* the index is built from one read of columns B and H;
+* a lookup for an indexed email reads just that row (``A{row}:H{row}``)
+  and checks column B still holds the email: if rows were moved, sorted
+  or deleted, the index is rebuilt and the lookup retried;
+* a lookup for an email that is not indexed reads the single cell below
+  the sheet's last row (``SheetIndexState.last_row``, the last row with any
+  column B value, duplicates included): if it is empty nobody appended
+  rows behind our back and the email is not in the sheet, otherwise the
+  index is rebuilt;
+* ``locate()`` checks many emails at once: one ``batch_get`` of their
+  column B cells plus the cell below the last row;
+* our own appends are added from the ``updatedRange`` of the append
+  response, so they never need a rebuild.
+
+A lookup therefore costs one targeted range read; writes are buffered
+and flushed in batches by ``blog.sheet_buffer``.
+"""
+import logging
+import re
+
+from django.db import transaction
+
+from .models import SheetIndexState, SheetRowIndex
+
+logger = logging.getLogger(__name__)
+
+EMAIL_COLUMN = 2  # B
+FOLDER_URL_COLUMN = 8  # H
+_ROW_RE = re.compile(r'![A-Z]+(\d+)')
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def _cell(values, column):
+    return values[column - 1] if len(values) >= column else ''
+
+
+class SheetEmailIndex:
+    """
+    Index of column B emails in one worksheet.
+
+    Args:
+        worksheet: gspread ``Worksheet``
+        spreadsheet_id: Spreadsheet the worksheet belongs to
+    """
+
+    def __init__(self, worksheet, spreadsheet_id):
+        self.worksheet = worksheet
+        self.spreadsheet_id = spreadsheet_id
+        self.title = worksheet.title
+
+    def _entries(self):
+        return SheetRowIndex.objects.filter(spreadsheet_id=self.spreadsheet_id, worksheet=self.title)
+
+    def rebuild(self):
+        """
+        Re-read columns B and H and replace the stored index.
+
+        Returns:
+            int: Number of indexed emails
+        """
+        emails, urls = self.worksheet.batch_get(['B:B', 'H:H'])
+        entries = {}
+        last_row = 0
+        for row, values in enumerate(emails, start=1):
+            email = normalize_email(values[0] if values else '')
+            if email:
+                last_row = row
+            if email and email not in entries:
+                url_values = urls[row - 1] if row <= len(urls) else []
+                entries[email] = SheetRowIndex(
+                    spreadsheet_id=self.spreadsheet_id,
+                    worksheet=self.title,
+                    email=email,
+                    row=row,
+                    folder_url=url_values[0] if url_values else '',
+                )
+        with transaction.atomic():
+            self._entries().delete()
+            SheetRowIndex.objects.bulk_create(entries.values())
+            self._set_last_row(last_row)
+        logger.info("Rebuilt sheet index %s/%s: %s emails", self.spreadsheet_id, self.title, len(entries))
+        return len(entries)
+
+    def _state(self):
+        return SheetIndexState.objects.filter(spreadsheet_id=self.spreadsheet_id, worksheet=self.title)
+
+    def _last_row(self):
+        """Last row with a column B value when the index was last updated, or None before the first rebuild."""
+        return self._state().values_list('last_row', flat=True).first()
+
+    def _set_last_row(self, last_row):
+        SheetIndexState.objects.update_or_create(
+            spreadsheet_id=self.spreadsheet_id, worksheet=self.title, defaults={'last_row': last_row},
+        )
+
+    def lookup(self, email):
+        """
+        Find the row of ``email`` in column B (case-insensitive, first match).
+
+        Returns:
+            tuple: ``(row_number, row_values)`` with ``row_values`` for
+            columns A-H, or ``(None, None)`` if the email is not in the sheet
+        """
+        email = normalize_email(email)
+        if not email:
+            return None, None
+        for attempt in range(2):
+            entry = self._entries().filter(email=email).first()
+            if entry is not None:
+                values = self.worksheet.get(f'A{entry.row}:H{entry.row}')
+                values = values[0] if values else []
+                if normalize_email(_cell(values, EMAIL_COLUMN)) == email:
+                    folder_url = _cell(values, FOLDER_URL_COLUMN)
+                    if folder_url != entry.folder_url:
+                        entry.folder_url = folder_url
+                        entry.save(update_fields=['folder_url', 'updated_at'])
+                    return entry.row, values
+            elif attempt == 0:
+                last_row = self._last_row()
+                if last_row is not None and not self.worksheet.get(f'B{last_row + 1}'):
+                    return None, None
+            else:
+                return None, None
+            if attempt == 0:
+                logger.info("Sheet index %s/%s is stale; rebuilding", self.spreadsheet_id, self.title)
+                self.rebuild()
+        return None, None
+
+    def locate(self, emails):
+        """
+        Find the rows of several emails with one read (plus one rebuild if stale).
+
+        Returns:
+            dict: Normalized email -> row number, for the emails in the sheet
+        """
+        emails = {normalize_email(e) for e in emails} - {''}
+        if not emails:
+            return {}
+        rows = dict(self._entries().filter(email__in=emails).values_list('email', 'row'))
+        last_row = self._last_row()
+        if last_row is not None:
+            ranges = [f'B{row}' for row in rows.values()] + [f'B{last_row + 1}']
+            cells = self.worksheet.batch_get(ranges)
+            found = [normalize_email(cell[0][0] if cell and cell[0] else '') for cell in cells]
+            if found == list(rows) + ['']:
+                return rows
+            logger.info("Sheet index %s/%s is stale; rebuilding", self.spreadsheet_id, self.title)
+        self.rebuild()
+        return dict(self._entries().filter(email__in=emails).values_list('email', 'row'))
+
+    def record(self, email, row, folder_url=''):
+        """Store that ``email`` is in ``row`` (after writing that row ourselves)."""
+        SheetRowIndex.objects.update_or_create(
+            spreadsheet_id=self.spreadsheet_id,
+            worksheet=self.title,
+            email=normalize_email(email),
+            defaults={'row': row, 'folder_url': folder_url or ''},
+        )
+
+    def append(self, row_data, **kwargs):
+        """
+        Append ``row_data`` (columns A-H) and index it.
+
+        Returns:
+            int | None: Row number the sheet appended to
+        """
+        return self.append_rows([row_data], **kwargs)
+
+    def append_rows(self, rows, **kwargs):
+        """
+        Append several rows (columns A-H) in one request and index them.
+
+        Returns:
+            int | None: Row number of the first appended row
+        """
+        response = self.worksheet.append_rows(rows, **kwargs)
+        updated_range = ((response or {}).get('updates') or {}).get('updatedRange', '')
+        match = _ROW_RE.search(updated_range)
+        if not match:
+            logger.warning("Append to %s returned no row number; rebuilding index", self.title)
+            self.rebuild()
+            return None
+        first_row = int(match.group(1))
+        for offset, row_data in enumerate(rows):
+            self.record(_cell(row_data, EMAIL_COLUMN), first_row + offset, _cell(row_data, FOLDER_URL_COLUMN))
+        last_row = self._last_row()
+        if last_row is not None and first_row == last_row + 1:
+            self._set_last_row(first_row + len(rows) - 1)
+        else:
+            # Someone else appended too: the next lookup checks the gap and rebuilds.
+            logger.info("Append to %s landed at row %s after %s; index will be rebuilt", self.title, first_row, last_row)
+        return first_row
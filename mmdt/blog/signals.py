@@ -1,24 +1,40 @@
 """
-Django signals for subscriber automation.
+Django signals (and their background jobs) for subscriber automation, post
+and cohort cache invalidation, the post search index and post image variants.
 """
-from django.db.models.signals import post_save
+import logging
+
+from django.db.models.signals import post_delete, post_save
+from django.db import DatabaseError, transaction
 from django.dispatch import receiver
-from django.core.mail import send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from datetime import timedelta
 
-from .models import SubscriberRequest
+from .models import Cohort, Post, SubscriberRequest
+from .cohorts import cohorts_changed
+from .post_cache import bump_post_cache_version
+from . import jobs, search
+from .images import get_variants
+from .outbox import queue_email
 from .google_api_utils import get_or_create_subscriber_folder_url
 
+logger = logging.getLogger(__name__)
+
+
+SUBSCRIBER_FOLDER_JOB = 'subscriber_request.folder'
+
 
 @receiver(post_save, sender=SubscriberRequest)
 def handle_subscriber_request_automation(sender, instance, created, **kwargs):
     """
-    Automate Google Drive folder, spreadsheet row, and confirmation email for
+    Queue the Google Drive folder, spreadsheet row, and confirmation email for
     all new subscriber requests (paid and fee waiver). Fee waiver applicants
     use the same folder link to upload supporting evidence (see email template).
+
+    The work runs in ``manage.py run_jobs`` (see ``blog.jobs``), so the
+    registration form does not wait for Google or SMTP round-trips.
     """
     if not created:
         return
@@ -28,22 +44,33 @@ def handle_subscriber_request_automation(sender, instance, created, **kwargs):
         return
 
     instance._automation_done = True
+    jobs.enqueue(SUBSCRIBER_FOLDER_JOB, subscriber_request_id=instance.pk)
+
 
-    # Step 1–2: Reuse folder URL from sheet if email already exists; else create folder + upsert sheet
-    folder_url = get_or_create_subscriber_folder_url(instance)
+@jobs.register(SUBSCRIBER_FOLDER_JOB)
+def create_subscriber_folder(subscriber_request_id):
+    """
+    Step 1–2: Reuse folder URL from sheet if email already exists; else create
+    folder + upsert sheet. Then queue the payment instructions email.
+    """
+    subscriber_request = SubscriberRequest.objects.filter(pk=subscriber_request_id).first()
+    if subscriber_request is None:
+        logger.info("Subscriber request %s was deleted; skipping automation", subscriber_request_id)
+        return
 
+    folder_url = get_or_create_subscriber_folder_url(subscriber_request)
     if not folder_url:
-        print(f"Warning: No folder URL for {instance.email} (sheet lookup and folder creation both failed or empty)")
-        # TODO: Send notification to admin about failure
-        # Continue with email using placeholder link
+        # Sheet lookup and folder creation both failed or empty: retried with backoff.
+        raise RuntimeError(f"No folder URL for {subscriber_request.email}")
 
-    # Step 3: Send payment instructions email
-    send_payment_instructions_email(instance, folder_url)
+    # Step 3: Queue the payment instructions email
+    send_payment_instructions_email(subscriber_request, folder_url)
 
 
 def send_payment_instructions_email(subscriber_request, folder_url):
     """
-    Send email with payment instructions and folder link.
+    Queue the email with payment instructions and folder link in the outbox
+    (sent by ``manage.py send_queued_emails``, see ``blog.outbox``).
 
     Args:
         subscriber_request: SubscriberRequest instance
@@ -65,20 +92,59 @@ def send_payment_instructions_email(subscriber_request, folder_url):
         'free_waiver': subscriber_request.free_waiver,
     }
 
+    html_message = render_to_string('emails/paid_user_confirmation.html', context)
+    plain_message = strip_tags(html_message)
+
+    queue_email(
+        subject='Thank you for your subscription request',
+        body=plain_message,
+        to=[subscriber_request.email],
+        html_body=html_message,
+        from_email=settings.EMAIL_HOST_USER,
+    )
+
+    logger.info("Payment instructions email queued for %s", subscriber_request.email)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_cache(sender, instance, **kwargs):
+    """Drop cached post list pages whenever a post changes."""
+    bump_post_cache_version()
+
+
+@receiver(post_save, sender=Cohort)
+@receiver(post_delete, sender=Cohort)
+def invalidate_cohort_timeline(sender, instance, using, **kwargs):
+    """Make every process reload its in-memory cohort timeline."""
+    cohorts_changed(using)
+
+
+@receiver(post_save, sender=Post)
+def update_post_search_index(sender, instance, **kwargs):
+    """Keep the full-text search index in sync with the saved post."""
+    try:
+        with transaction.atomic():
+            search.index_post(instance)
+    except DatabaseError:
+        logger.exception("Failed to index post %s; run rebuild_search_index", instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_search_index(sender, instance, **kwargs):
+    try:
+        with transaction.atomic():
+            search.remove_post(instance.pk)
+    except DatabaseError:
+        logger.exception("Failed to remove post %s from the search index", instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def generate_post_image_variants(sender, instance, **kwargs):
+    """Create resized/WebP copies of a newly uploaded post image."""
+    if not instance.image:
+        return
     try:
-        html_message = render_to_string('emails/paid_user_confirmation.html', context)
-        plain_message = strip_tags(html_message)
-
-        send_mail(
-            subject='Thank you for your subscription request',
-            message=plain_message,
-            from_email=settings.EMAIL_HOST_USER,
-            recipient_list=[subscriber_request.email],
-            html_message=html_message,
-            fail_silently=True,
-        )
-
-        print(f"Payment instructions email sent to {subscriber_request.email}")
-
-    except Exception as e:
-        print(f"Error sending payment email to {subscriber_request.email}: {e}")
+        get_variants(instance.image, generate=True)
+    except Exception:
+        logger.exception("Failed to generate image variants for post %s", instance.pk)
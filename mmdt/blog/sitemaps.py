@@ -0,0 +1,65 @@
+"""
+Sitemap of public posts, active surveys and the static pages.
+
+Post items come from ``get_cached_list()`` (invalidated on every ``Post``
+change); survey items are cached for ``POST_LIST_CACHE_TIMEOUT`` seconds.
+Subscriber-only posts are left out because crawlers cannot read them.
+"""
+from django.contrib.sitemaps import Sitemap
+from django.core.cache import cache
+from django.urls import reverse
+
+from survey.models import Survey
+
+from .models import Post
+from .post_cache import get_cached_list, get_timeout
+
+SURVEY_CACHE_KEY = 'blog:sitemap:surveys'
+
+
+class PostSitemap(Sitemap):
+    changefreq = 'weekly'
+    priority = 0.8
+
+    def items(self):
+        queryset = Post.objects.filter(status=1, subscribers_only=False).only('slug', 'updated_on').order_by('-created_on')
+        return get_cached_list('public', 'sitemap', queryset)
+
+    def location(self, item):
+        return reverse('post_detail', args=[item.slug])
+
+    def lastmod(self, item):
+        return item.updated_on
+
+
+class SurveySitemap(Sitemap):
+    changefreq = 'weekly'
+    priority = 0.5
+
+    def items(self):
+        return cache.get_or_set(
+            SURVEY_CACHE_KEY,
+            lambda: list(Survey.objects.filter(is_active=True).only('slug').order_by('pk')),
+            get_timeout(),
+        )
+
+    def location(self, item):
+        return reverse('survey:survey_detail', args=[item.slug])
+
+
+class StaticViewSitemap(Sitemap):
+    changefreq = 'monthly'
+    priority = 0.5
+
+    def items(self):
+        return ['home', 'about', 'our_projects', 'our_instructors', 'st_projects', 'our_playground', 'survey:index']
+
+    def location(self, item):
+        return reverse(item)
+
+
+sitemaps = {
+    'posts': PostSitemap,
+    'surveys': SurveySitemap,
+    'static': StaticViewSitemap,
+}
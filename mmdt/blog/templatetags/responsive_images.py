@@ -0,0 +1,44 @@
+"""
+Template helpers for responsive images (see ``blog.images``).
+
+Usage::
+
+    {% load responsive_images %}
+    {% responsive_image post.image alt=post.title sizes="(max-width: 736px) 100vw, 33vw" %}
+
+renders a ``<picture>`` with a WebP ``<source>`` and an ``<img>`` whose
+``srcset`` lists the resized copies, falling back to a plain ``<img>`` of the
+original when no variants exist.
+"""
+from django import template
+from django.utils.html import format_html
+
+from blog.images import CONTENT_TYPES, build_srcsets, get_variants
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(field_file, alt='', sizes='100vw', css_class='', loading='lazy'):
+    if not field_file:
+        return ''
+    manifest = get_variants(field_file)
+    if not manifest or not manifest['variants']:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}"/>',
+            field_file.url, alt, css_class, loading,
+        )
+
+    srcsets = build_srcsets(field_file, manifest)
+    fallback = next(ext for ext in srcsets if ext != 'webp')
+    sources = ''
+    if 'webp' in srcsets:
+        sources = format_html(
+            '<source type="{}" srcset="{}" sizes="{}"/>', CONTENT_TYPES['webp'], srcsets['webp'], sizes,
+        )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" '
+        'loading="{}"/></picture>',
+        sources, field_file.url, srcsets[fallback], sizes,
+        manifest['width'], manifest['height'], alt, css_class, loading,
+    )
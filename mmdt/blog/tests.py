@@ -1,19 +1,80 @@
-from datetime import timedelta
-from unittest.mock import patch
+import csv
+import json
+import os
+import pickle
+import re
+import shutil
+import smtplib
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from importlib import import_module
+from io import BytesIO, StringIO
+from unittest.mock import MagicMock, patch
+
+import httplib2
+import numpy as np
+from PIL import Image
+from googleapiclient.errors import HttpError
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase, Client
+from django.template import Context, Template
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
 from django.core import mail
+from django.core.mail import get_connection
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import AccessToken
 
-from .models import Post, Comment, SubscriberRequest, Cohort
+from .classifier import (
+    ClassifierUnavailable,
+    MicroBatcher,
+    PredictionCache,
+    classify_text,
+    classify_texts,
+    get_classifier,
+    get_prediction_cache,
+    predict_texts,
+    reset_classifier,
+    warm_classifier,
+)
+from .classifier.artifact import ArtifactClassifier, UnsupportedPipeline, export_artifact
+from .classifier.registry import ClassifierRegistry
+from .models import (
+    BackgroundJob, OutboundEmail, PendingSheetWrite, Post, Comment, SubscriberRequest, Cohort, RelatedPost,
+    SheetRowIndex,
+)
+from polls.models import Question
+from survey.models import Question as SurveyQuestion, Survey
+from users.models import UserProfile
+
+from .cohorts import CohortTimeline, get_timeline
+from .google_clients import GoogleClientPool
+from .images import get_variants
+from .sheet_buffer import SHEET_FLUSH_JOB, buffer_row, flush_sheet_writes
+from .sheet_index import SheetEmailIndex
+from .pagination import InvalidCursor, KeysetPaginator
+from .rendering import sanitize_html
 from .forms import CommentForm, SubscriberRequestForm, FeedbackAnalyzerForm
+from .feeds import get_subscriber_feed_url
+from . import cohorts, google_api_utils, jobs, related, search, views
+from .jobs import run_pending_jobs
+from .outbox import queue_email, send_queued_emails
+from .views import PostDetailView
+from .view_counter import ViewCounter, flush_view_counts, record_view, view_counter
 
 
 class PostModelTest(TestCase):
@@ -475,12 +536,653 @@ class PostListViewTest(TestCase):
         self.assertEqual(len(response.context['post_list']), 6)  # paginate_by = 6
 
 
+class PostListCacheTest(TestCase):
+    """Test cases for the cached post list pages."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username='cacheauthor', password='testpass123')
+        for i in range(8):
+            Post.objects.create(title=f'Cached {i}', slug=f'cached-{i}', author=self.user,
+                                content=f'Body {i}', status=1)
+
+    def _post_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [q['sql'] for q in queries if 'blog_post' in q['sql']]
+
+    def test_repeated_page_hits_cache(self):
+        """Test that a second visit to the same page does not query posts."""
+        first, first_queries = self._post_queries(reverse('home'))
+        second, second_queries = self._post_queries(reverse('home'))
+        self.assertEqual(len(first_queries), 2)  # COUNT(*) + page
+        self.assertEqual(second_queries, [])
+        self.assertEqual(list(first.context['post_list']), list(second.context['post_list']))
+        self.assertEqual(first.content, second.content)
+
+    def test_page_is_computed_once_per_request(self):
+        """Test that the ETag and the template share one pagination of the list."""
+        self.client.get(reverse('home'))
+        with patch('blog.views.get_cached_posts', wraps=views.get_cached_posts) as mock_posts, \
+                patch('blog.views.get_cached_count', wraps=views.get_cached_count) as mock_count:
+            response = self.client.get(reverse('home'))
+        self.assertTrue(response.has_header('ETag'))
+        self.assertEqual(mock_posts.call_count, 1)
+        self.assertEqual(mock_count.call_count, 1)
+
+    def test_pages_are_cached_separately(self):
+        """Test that each page number has its own entry."""
+        page1 = self.client.get(reverse('home'))
+        page2 = self.client.get(reverse('home') + '?page=2')
+        self.assertEqual(len(page1.context['post_list']), 6)
+        self.assertEqual(len(page2.context['post_list']), 2)
+        self.assertNotEqual(page1.content, page2.content)
+        self.assertEqual(self.client.get(reverse('home') + '?page=last').context['page_obj'].number, 2)
+        self.assertEqual(self.client.get(reverse('home') + '?page=9').status_code, 404)
+
+    def test_saving_post_invalidates_cache(self):
+        """Test that creating, editing and deleting posts is visible immediately."""
+        self.client.get(reverse('home'))
+        post = Post.objects.create(title='Fresh news', slug='fresh-news', author=self.user,
+                                   content='New', status=1)
+        self.assertContains(self.client.get(reverse('home')), 'Fresh news')
+
+        post.title = 'Edited news'
+        post.save()
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Edited news')
+        self.assertNotContains(response, 'Fresh news')
+
+        post.delete()
+        self.assertNotContains(self.client.get(reverse('home')), 'Edited news')
+
+    def test_audiences_are_cached_separately(self):
+        """Test that subscriber-only posts never leak into the public list."""
+        Post.objects.create(title='Members only', slug='members-only', author=self.user,
+                            content='Secret', status=1, subscribers_only=True)
+        self.assertNotContains(self.client.get(reverse('home')), 'Members only')
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('post_list_only_subscriber'))
+        self.assertContains(response, 'Members only')
+        self.assertEqual(len(response.context['object_list']), 1)
+
+
+class KeysetPaginationTest(TestCase):
+    """Test cases for cursor pagination (blog.pagination)."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username='keyset', password='testpass123')
+        for i in range(14):
+            Post.objects.create(title=f'Keyset {i}', slug=f'keyset-{i}', author=self.user,
+                                content=f'Body {i}', status=1)
+        # Ties on created_on must still be ordered by id.
+        Post.objects.filter(slug__in=['keyset-3', 'keyset-4', 'keyset-5', 'keyset-6']).update(
+            created_on=timezone.now() - timedelta(days=1))
+        self.expected = list(Post.objects.order_by('-created_on', '-id'))
+
+    def _walk(self, paginator, cursor=None, forward=True):
+        seen = []
+        while True:
+            page = paginator.page(cursor)
+            seen = seen + list(page) if forward else list(page) + seen
+            cursor = page.next_cursor if forward else page.previous_cursor
+            if cursor is None:
+                return seen, page
+
+    def test_walks_every_row_once_in_both_directions(self):
+        """Test that next and previous cursors cover the rows without gaps."""
+        paginator = KeysetPaginator(Post.objects.all(), 4)
+        forward, last = self._walk(paginator)
+        self.assertEqual(forward, self.expected)
+        self.assertEqual(len(last), 2)
+        backward, first = self._walk(paginator, last.previous_cursor, forward=False)
+        self.assertEqual(backward + list(last), self.expected)
+        self.assertFalse(first.has_previous())
+
+    def test_page_costs_one_query(self):
+        """Test that deep pages take a single query and no COUNT(*)."""
+        paginator = KeysetPaginator(Post.objects.all(), 4)
+        cursor = paginator.cursor_after(self.expected[-3])
+        with CaptureQueriesContext(connection) as queries:
+            page = paginator.page(cursor)
+        self.assertEqual(list(page), self.expected[-2:])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT', queries[0]['sql'])
+        self.assertNotIn('OFFSET', queries[0]['sql'])
+
+    def test_nullable_keys_sort_last(self):
+        """Test that NULL ordering values are paged through as well."""
+        survey = Survey.objects.create(title='Keyset Survey', slug='keyset-survey')
+        questions = [SurveyQuestion.objects.create(survey=survey, question_text=f'Q{i}',
+                                                   pub_date=None if i % 3 == 0 else timezone.now())
+                     for i in range(7)]
+        expected = sorted(questions, key=lambda q: (q.pub_date is None, q.pub_date or timezone.now(), q.pk))
+        paginator = KeysetPaginator(survey.questions.all(), 2, ordering=('pub_date', 'id'))
+        forward, last = self._walk(paginator)
+        self.assertEqual(forward, expected)
+        backward, _ = self._walk(paginator, last.previous_cursor, forward=False)
+        self.assertEqual(backward + list(last), expected)
+
+    def test_invalid_cursor(self):
+        """Test that unreadable cursors are rejected."""
+        paginator = KeysetPaginator(Post.objects.all(), 4)
+        for cursor in ('garbage', 'WyJ4IixbXV0', paginator.encode_cursor(['yesterday', 1], 'n')):
+            with self.assertRaises(InvalidCursor):
+                paginator.page(cursor)
+        self.assertEqual(self.client.get(reverse('home'), {'cursor': 'garbage'}).status_code, 404)
+
+    def test_post_list_links_use_cursors(self):
+        """Test that the home page links to cursor pages, which are cached."""
+        first = self.client.get(reverse('home'))
+        cursor = first.context['page_obj'].next_cursor
+        self.assertContains(first, f'?cursor={cursor}')
+        second = self.client.get(reverse('home'), {'cursor': cursor})
+        self.assertEqual(list(second.context['post_list']), self.expected[6:12])
+        self.assertTrue(second.context['is_paginated'])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('home'), {'cursor': cursor})
+        self.assertFalse([q for q in queries if 'blog_post' in q['sql']])
+
+
+class PostSearchTest(TestCase):
+    """Test cases for the full-text post search index and views."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='searcher', password='testpass123')
+        self.title_hit = Post.objects.create(
+            title='Python workshop', slug='python-workshop', author=self.user,
+            content='<p>Hands-on session.</p>', status=1)
+        self.body_hit = Post.objects.create(
+            title='Weekly update', slug='weekly-update', author=self.user,
+            content='<p>We also discussed <strong>python</strong> packaging.</p>', status=1)
+        self.members_post = Post.objects.create(
+            title='Members python notes', slug='members-python', author=self.user,
+            content='<p>Secret</p>', status=1, subscribers_only=True)
+        self.draft = Post.objects.create(
+            title='Draft python post', slug='draft-python', author=self.user,
+            content='<p>Draft</p>', status=0)
+
+    def _search(self, query):
+        return self.client.get(reverse('post_search'), {'q': query})
+
+    def test_results_are_ranked(self):
+        """Test that title matches rank above body matches and drafts are hidden."""
+        response = self._search('python')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['post_list']), [self.title_hit, self.body_hit])
+
+    def test_markup_is_not_indexed(self):
+        """Test that HTML tags are stripped before indexing."""
+        self.assertEqual(search.search_post_ids('strong'), [])
+        self.assertEqual(search.search_post_ids('packag'), [self.body_hit.pk])
+
+    def test_index_follows_save_and_delete(self):
+        """Test that signals keep the index in sync with posts."""
+        self.body_hit.content = '<p>Now about statistics.</p>'
+        self.body_hit.save()
+        self.assertNotIn(self.body_hit.pk, search.search_post_ids('python'))
+        self.assertEqual(search.search_post_ids('statistics'), [self.body_hit.pk])
+
+        self.title_hit.delete()
+        self.assertEqual(search.search_post_ids('workshop'), [])
+
+    def test_subscriber_posts_need_login(self):
+        """Test that subscriber-only posts are only found by logged-in users."""
+        self.assertNotIn(self.members_post, self._search('python').context['post_list'])
+        self.client.force_login(self.user)
+        self.assertIn(self.members_post, self._search('python').context['post_list'])
+
+    def test_query_syntax_is_escaped(self):
+        """Test that FTS5 operators in user input do not raise errors."""
+        for query in ['python AND', '"unbalanced', 'NEAR(python', '*', '-python']:
+            self.assertEqual(self._search(query).status_code, 200)
+        self.assertEqual(len(self._search('').context['post_list']), 0)
+
+    def test_search_url_is_not_a_post_slug(self):
+        """Test that /blog/search/ is not routed to PostDetailView."""
+        self.assertEqual(reverse('post_search'), '/blog/search/')
+        self.assertTemplateUsed(self._search('python'), 'post_search.html')
+
+    def test_admin_search_uses_index(self):
+        """Test that the admin changelist search goes through the index."""
+        admin = User.objects.create_superuser(username='searchadmin', password='testpass123')
+        self.client.force_login(admin)
+        with patch('blog.admin.search.search_post_ids', wraps=search.search_post_ids) as mock_search:
+            response = self.client.get(reverse('admin:blog_post_changelist'), {'q': 'workshop'})
+        mock_search.assert_called_once_with('workshop')
+        self.assertEqual(list(response.context['cl'].result_list), [self.title_hit])
+
+    def test_rebuild_command(self):
+        """Test that the rebuild command restores a wiped index."""
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {search.FTS_TABLE}')
+        self.assertEqual(search.search_post_ids('python'), [])
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 4 posts', out.getvalue())
+        self.assertEqual(len(search.search_post_ids('python')), 4)
+
+
+class ConditionalGetTest(TestCase):
+    """Test cases for ETag / Last-Modified handling."""
+
+    def setUp(self):
+        cache.clear()
+        view_counter.clear()
+        self.addCleanup(view_counter.clear)
+        self.user = User.objects.create_user(username='etaguser', password='testpass123')
+        self.post = Post.objects.create(title='Etag post', slug='etag-post', author=self.user,
+                                        content='Body', status=1)
+        self.url = reverse('post_detail', kwargs={'slug': self.post.slug})
+
+    def test_post_detail_not_modified(self):
+        """Test that a matching ETag returns 304 without rendering, but counts the view."""
+        response = self.client.get(self.url)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with patch.object(PostDetailView, 'render_to_response') as mock_render:
+            repeat = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(repeat.status_code, 304)
+        mock_render.assert_not_called()
+        self.assertEqual(view_counter.pending(self.post.pk), 2)
+
+        crawler = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(crawler.status_code, 304)
+
+    def test_post_detail_changes_invalidate_etag(self):
+        """Test that editing the post or approving a comment changes the ETag."""
+        etag = self.client.get(self.url)['ETag']
+        comment = Comment.objects.create(post=self.post, name='A', email='a@example.com', body='Hi')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        comment.active = True
+        comment.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        self.post.content = 'Edited'
+        self.post.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_depends_on_viewer(self):
+        """Test that a logged-in user never gets the anonymous copy."""
+        anonymous = self.client.get(self.url)
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=anonymous['ETag'],
+                                   HTTP_IF_MODIFIED_SINCE=anonymous['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_post_list_not_modified_until_posts_change(self):
+        """Test that the home page returns 304 until a post is published."""
+        etag = self.client.get(reverse('home'))['ETag']
+        self.assertEqual(self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(
+            self.client.get(reverse('home') + '?page=2', HTTP_IF_NONE_MATCH=etag).status_code, 404
+        )
+        Post.objects.create(title='Another', slug='another', author=self.user, content='x', status=1)
+        self.assertEqual(self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_static_pages_use_deploy_version(self):
+        """Test that template-only pages change ETag with DEPLOY_VERSION."""
+        with self.settings(DEPLOY_VERSION='v1'):
+            etag = self.client.get(reverse('about'))['ETag']
+            self.assertEqual(self.client.get(reverse('about'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.settings(DEPLOY_VERSION='v2'):
+            self.assertEqual(self.client.get(reverse('about'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_post_still_404(self):
+        """Test that unknown slugs are not short-circuited."""
+        response = self.client.get(reverse('post_detail', kwargs={'slug': 'nope'}), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 404)
+
+
+def _image_upload(name='photo.jpg', size=(1200, 800), image_format='JPEG'):
+    buffer = BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, format=image_format)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f'image/{image_format.lower()}')
+
+
+class ResponsiveImageTest(TestCase):
+    """Test cases for responsive image variants."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = self.settings(MEDIA_ROOT=self.media_root, IMAGE_VARIANT_WIDTHS=[320, 640, 1600])
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username='imageauthor', password='testpass123')
+
+    def test_variants_generated_on_upload(self):
+        """Test that saving a post stores resized and WebP copies next to the original."""
+        post = Post.objects.create(title='Photo', slug='photo', author=self.user, content='x',
+                                   status=1, image=_image_upload())
+        root = os.path.splitext(post.image.name)[0]
+        for name in (f'{root}__w320.webp', f'{root}__w320.jpg', f'{root}__w640.webp', f'{root}__w640.jpg'):
+            self.assertTrue(default_storage.exists(name), name)
+        self.assertFalse(default_storage.exists(f'{root}__w1600.webp'))  # never upscaled
+        with default_storage.open(f'{root}__w640.webp') as f_in:
+            variant = Image.open(f_in)
+            self.assertEqual((variant.format, variant.size), ('WEBP', (640, 427)))
+
+    def test_template_tag_emits_srcset(self):
+        """Test that list pages render a <picture> with WebP and fallback srcsets."""
+        post = Post.objects.create(title='Photo', slug='photo', author=self.user, content='x',
+                                   status=1, image=_image_upload())
+        response = self.client.get(reverse('home'))
+        root = os.path.splitext(post.image.url)[0]
+        self.assertContains(response, '<source type="image/webp" srcset="'
+                                      f'{root}__w320.webp 320w, {root}__w640.webp 640w"')
+        self.assertContains(response, f'{root}__w640.jpg 640w, {post.image.url} 1200w')
+        self.assertContains(response, 'width="1200" height="800"')
+
+    def test_lazy_generation_and_manifest_cache(self):
+        """Test that missing variants are created on first render and then cached."""
+        with self.settings(IMAGE_VARIANTS_LAZY=False):
+            post = Post(title='Old', slug='old', author=self.user, content='x', status=1)
+            post.image.save('old.png', _image_upload('old.png', image_format='PNG'), save=False)
+            Post.objects.bulk_create([post])  # bypasses the upload signal
+            self.assertIsNone(get_variants(post.image))
+
+        manifest = get_variants(post.image)
+        self.assertEqual([v['width'] for v in manifest['variants']], [320, 640])
+        self.assertIn('png', manifest['variants'][0])
+        with patch.object(default_storage, 'open') as mock_open:
+            self.assertEqual(get_variants(post.image), manifest)
+        mock_open.assert_not_called()
+
+    def test_unreadable_image_falls_back_to_original(self):
+        """Test that a non-image upload renders a plain <img> without errors."""
+        post = Post.objects.create(title='Broken', slug='broken', author=self.user, content='x', status=1,
+                                   image=SimpleUploadedFile('broken.jpg', b'not an image'))
+        html = Template('{% load responsive_images %}{% responsive_image post.image %}').render(
+            Context({'post': post})
+        )
+        self.assertEqual(html, f'<img src="{post.image.url}" alt="" class="" loading="lazy"/>')
+
+    def test_backfill_command(self):
+        """Test that the command generates variants for posts and poll questions."""
+        question = Question(question_text='Best?', pub_date=timezone.now())
+        question.image.save('q.jpg', _image_upload('q.jpg'), save=False)
+        Question.objects.bulk_create([question])
+        out = StringIO()
+        call_command('generate_image_variants', stdout=out)
+        self.assertIn('Image variants ready for 1 images', out.getvalue())
+        self.assertTrue(default_storage.exists(os.path.splitext(question.image.name)[0] + '__w320.webp'))
+
+
+class PostRenderedFieldsTest(TestCase):
+    """Test cases for the pre-rendered post columns."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='renderer', password='testpass123')
+
+    def test_fields_computed_on_save(self):
+        """Test that sanitized HTML, excerpt and reading time are stored on save."""
+        content = ('<p onclick="steal()">Hello <b>world</b> &amp; friends</p>'
+                   '<script>alert(1)</script><a href="javascript:alert(1)">x</a>' + '<p>word </p>' * 450)
+        post = Post.objects.create(title='Rendered', slug='rendered', author=self.user, content=content)
+        post.refresh_from_db()
+
+        self.assertIn('<p>Hello <b>world</b> &amp; friends</p>', post.content_html)
+        self.assertNotIn('onclick', post.content_html)
+        self.assertNotIn('<script', post.content_html)
+        self.assertNotIn('javascript:', post.content_html)
+        self.assertTrue(post.excerpt.startswith('Hello world & friends x word word'))
+        self.assertLessEqual(len(post.excerpt), 401)
+        self.assertTrue(post.excerpt.endswith('…'))
+        self.assertEqual(post.reading_time, 3)  # 455 words at 200 wpm
+
+    def test_update_fields_includes_rendered_columns(self):
+        """Test that save(update_fields=['content']) also refreshes derived columns."""
+        post = Post.objects.create(title='Partial', slug='partial', author=self.user, content='<p>Old</p>')
+        post.content = '<p>New text</p>'
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, 'New text')
+        self.assertEqual(post.content_html, '<p>New text</p>')
+
+    def test_sanitizer_keeps_styles_and_image_data_only(self):
+        """Test that inline styles survive and data: URIs are kept only as image sources."""
+        html = sanitize_html(
+            '<p style="text-align: center; color: red; position: fixed">Hi</p>'
+            '<img src="data:image/png;base64,AAAA" style="width: 50%;">'
+            '<a href="data:text/html;base64,PHNjcmlwdD4=">x</a>'
+            '<a href=" DATA:text/html,x">y</a>'
+            '<img src="data:text/html,x">'
+            '<a href="https://example.com">ok</a>'
+        )
+        self.assertIn('<p style="text-align: center; color: red;">Hi</p>', html)
+        self.assertIn('<img src="data:image/png;base64,AAAA" style="width: 50%;">', html)
+        self.assertIn('<a>x</a><a>y</a><img>', html)
+        self.assertIn('<a href="https://example.com">ok</a>', html)
+
+    def test_sanitizer_drops_script_and_style_contents(self):
+        """Test that script and style bodies are removed, not left behind as text."""
+        content = '<p>Hi</p><script>alert(1)</script><STYLE type="text/css">.x{}</style ><p>Bye</p><script>open('
+        migration = import_module('blog.migrations.0017_post_rendered_content')
+        for html in (sanitize_html(content), migration.render_post_fields(content)['content_html']):
+            self.assertEqual(html, '<p>Hi</p><p>Bye</p>')
+
+    def test_list_does_not_load_content(self):
+        """Test that the post list query defers the full HTML."""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        Post.objects.create(title='Deferred', slug='deferred', author=self.user,
+                            content='<p>' + 'long ' * 1000 + '</p>', status=1)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('home'))
+        page_sql = [q['sql'] for q in queries if 'blog_post' in q['sql'] and 'LIMIT' in q['sql']]
+        self.assertEqual(len(page_sql), 1)
+        self.assertNotIn('"blog_post"."content"', page_sql[0])
+        self.assertContains(response, 'long long')
+        self.assertContains(response, '5 min read')
+
+    def test_render_posts_command(self):
+        """Test that the backfill command fills rows written without save()."""
+        post = Post.objects.create(title='Stale', slug='stale', author=self.user, content='<p>Old</p>')
+        Post.objects.filter(pk=post.pk).update(content='<p>Imported text</p>', excerpt='', content_html='')
+        out = StringIO()
+        call_command('render_posts', stdout=out)
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, 'Imported text')
+        self.assertIn('Re-rendered 1 posts', out.getvalue())
+
+
+class RelatedPostsTest(TestCase):
+    """Test cases for the precomputed related-posts index."""
+
+    def setUp(self):
+        view_counter.clear()
+        self.addCleanup(view_counter.clear)
+        self.user = User.objects.create_user(username='relator', password='testpass123')
+        make = lambda slug, content, **kw: Post.objects.create(  # noqa: E731
+            title=slug.replace('-', ' ').title(), slug=slug, author=self.user, content=content, status=1, **kw)
+        self.pandas = make('pandas-basics', '<p>pandas dataframe groupby merge pivot tables</p>')
+        self.pandas2 = make('advanced-pandas', '<p>pandas dataframe indexing groupby performance</p>')
+        self.sql = make('sql-joins', '<p>sql joins queries database indexes groupby</p>')
+        self.private = make('members-pandas', '<p>pandas dataframe groupby merge pivot tables</p>',
+                            subscribers_only=True)
+
+    def test_top_k_neighbours_matches_brute_force(self):
+        """Test the blocked sparse top-k against a dense similarity matrix."""
+        rng = np.random.default_rng(0)
+        dense = rng.random((40, 15)) * (rng.random((40, 15)) > 0.6)
+        dense /= np.maximum(np.linalg.norm(dense, axis=1, keepdims=True), 1e-12)
+        from scipy import sparse
+        result = related.top_k_neighbours(sparse.csr_matrix(dense), 3, block_size=7)
+
+        similarities = dense @ dense.T
+        np.fill_diagonal(similarities, -np.inf)
+        for row, row_neighbours in enumerate(result):
+            expected = sorted((s for s in similarities[row] if s > 0), reverse=True)[:3]
+            self.assertEqual(len(row_neighbours), len(expected))
+            np.testing.assert_allclose([score for _, score in row_neighbours], expected)
+
+    def test_rebuild_is_incremental(self):
+        """Test that only posts whose neighbours changed are rewritten."""
+        first = related.rebuild_related_posts(k=2)
+        self.assertEqual(first, {'posts': 4, 'updated': 4, 'removed': 0})
+        self.assertEqual(related.rebuild_related_posts(k=2)['updated'], 0)
+
+        self.sql.status = 0
+        self.sql.save()
+        result = related.rebuild_related_posts(k=2)
+        self.assertEqual(result['removed'], 1)
+        self.assertFalse(RelatedPost.objects.filter(related=self.sql).exists())
+
+    def test_public_posts_never_link_to_subscriber_posts(self):
+        """Test the audience rule of the index."""
+        related.rebuild_related_posts(k=3)
+        self.assertEqual(related.get_related_posts(self.pandas, include_subscriber_posts=True)[0], self.pandas2)
+        self.assertNotIn(self.private, [link.related for link in RelatedPost.objects.filter(post=self.pandas)])
+        self.assertEqual(RelatedPost.objects.filter(post=self.private).first().related, self.pandas)
+
+    def test_detail_page_shows_related_posts_in_one_query(self):
+        """Test the related block on PostDetailView."""
+        related.rebuild_related_posts(k=2)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('post_detail', kwargs={'slug': self.pandas.slug}))
+        self.assertEqual(response.context['related_posts'][0], self.pandas2)
+        self.assertContains(response, 'Related posts')
+        block_sql = [q for q in queries if 'blog_relatedpost' in q['sql'] and 'INNER JOIN' in q['sql']
+                     and 'MAX(' not in q['sql']]  # the ETag aggregate
+        self.assertEqual(len(block_sql), 1)
+
+    def test_renaming_related_post_changes_etag(self):
+        """Test that the detail ETag follows changes to the related posts themselves."""
+        related.rebuild_related_posts(k=2)
+        url = reverse('post_detail', kwargs={'slug': self.pandas.slug})
+        etag = self.client.get(url)['ETag']
+        self.pandas2.title = 'Pandas In Depth'
+        self.pandas2.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Pandas In Depth')
+
+    def test_web_import_does_not_load_sklearn(self):
+        """Test that importing the views does not import scikit-learn."""
+        code = (
+            'import os, sys, django; os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mmdt.settings"); '
+            'django.setup(); import blog.views; print("sklearn" in sys.modules)'
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=settings.BASE_DIR, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+    def test_command(self):
+        """Test the rebuild_related_posts command output."""
+        out = StringIO()
+        call_command('rebuild_related_posts', stdout=out)
+        self.assertIn('4 posts, 4 updated', out.getvalue())
+
+
+class FeedAndSitemapTest(TestCase):
+    """Test cases for the RSS/Atom feeds and the sitemap."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='feeder', password='testpass123')
+        self.public = Post.objects.create(title='Public Feed Post', slug='public-feed-post', author=self.user,
+                                          content='<p>Open to everyone</p>', status=1)
+        self.private = Post.objects.create(title='Members Feed Post', slug='members-feed-post', author=self.user,
+                                           content='<p>Members only</p>', status=1, subscribers_only=True)
+        self.draft = Post.objects.create(title='Draft Feed Post', slug='draft-feed-post', author=self.user,
+                                         content='<p>Not yet</p>', status=0)
+
+    def test_public_feeds_list_public_posts(self):
+        """Test that RSS and Atom feeds contain only published public posts."""
+        for name in ('post_feed', 'post_feed_atom'):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            body = response.content.decode()
+            self.assertIn('Public Feed Post', body)
+            self.assertIn('Open to everyone', body)
+            self.assertIn(reverse('post_detail', args=['public-feed-post']), body)
+            self.assertNotIn('Members Feed Post', body)
+            self.assertNotIn('Draft Feed Post', body)
+
+    def test_subscriber_feed_requires_token(self):
+        """Test that the subscriber feed needs a valid user token, not a session."""
+        url = get_subscriber_feed_url(self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Members Feed Post', response.content.decode())
+        self.assertNotIn('Public Feed Post', response.content.decode())
+
+        forged = reverse('post_feed_subscribers', kwargs={'token': f'{url.split("/")[-2]}x'})
+        self.assertEqual(self.client.get(forged).status_code, 404)
+        self.user.profile.expired = True  # deactivates the user
+        self.user.profile.save()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_subscriber_feed_url_follows_subscription(self):
+        """Test that a renewal replaces the feed URL and an ended subscription closes it."""
+        profile = self.user.profile
+        profile.expiry_date = timezone.now() + timedelta(days=30)
+        profile.save()
+        url = get_subscriber_feed_url(self.user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        profile.expiry_date += timedelta(days=365)
+        profile.save()
+        renewed = get_subscriber_feed_url(self.user)
+        self.assertNotEqual(renewed, url)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(renewed).status_code, 200)
+
+        # Past its expiry before check_expired_users has marked the profile.
+        UserProfile.objects.filter(pk=profile.pk).update(expiry_date=timezone.now() - timedelta(days=1))
+        self.user.refresh_from_db()
+        self.assertEqual(self.client.get(get_subscriber_feed_url(self.user)).status_code, 404)
+
+    def test_subscriber_list_shows_feed_url(self):
+        """Test that the subscriber post list links the reader's own feed URL."""
+        self.client.login(username='feeder', password='testpass123')
+        response = self.client.get(reverse('post_list_only_subscriber'))
+        self.assertContains(response, get_subscriber_feed_url(self.user))
+
+    def test_feed_items_are_cached_until_post_saved(self):
+        """Test that repeated polls do not query and a post save refreshes the feed."""
+        self.client.get(reverse('post_feed'))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('post_feed'))
+
+        self.public.title = 'Renamed Feed Post'
+        self.public.save()
+        self.assertIn('Renamed Feed Post', self.client.get(reverse('post_feed')).content.decode())
+
+    def test_sitemap_lists_posts_surveys_and_static_pages(self):
+        """Test the sitemap sections."""
+        Survey.objects.create(title='Sitemap Survey', slug='sitemap-survey')
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn(reverse('post_detail', args=['public-feed-post']), body)
+        self.assertNotIn('members-feed-post', body)
+        self.assertNotIn('draft-feed-post', body)
+        self.assertIn(reverse('survey:survey_detail', args=['sitemap-survey']), body)
+        self.assertIn(reverse('about'), body)
+        with self.assertNumQueries(0):
+            self.client.get('/sitemap.xml')
+
+
 class PostDetailViewTest(TestCase):
     """Test cases for PostDetailView."""
     
     def setUp(self):
         """Set up test data."""
         self.client = Client()
+        view_counter.clear()
+        self.addCleanup(view_counter.clear)
         self.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
@@ -514,9 +1216,25 @@ class PostDetailViewTest(TestCase):
         """Test that PostDetailView increments view count."""
         initial_count = self.post.view_count
         self.client.get(reverse('post_detail', kwargs={'slug': self.post.slug}))
+        flush_view_counts()
         
         self.post.refresh_from_db()
         self.assertEqual(self.post.view_count, initial_count + 1)
+
+    def test_post_detail_views_are_coalesced(self):
+        """Test that views are written in one batch and shown before the flush."""
+        url = reverse('post_detail', kwargs={'slug': self.post.slug})
+        updated_on = self.post.updated_on
+        for _ in range(3):
+            response = self.client.get(url)
+        self.assertEqual(response.context['post'].view_count, 3)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 0)
+        self.assertEqual(flush_view_counts(), 3)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 3)
+        self.assertEqual(self.post.updated_on, updated_on)
     
     def test_post_detail_view_subscriber_only_redirects_anonymous(self):
         """Test that subscriber-only posts redirect anonymous users."""
@@ -607,12 +1325,285 @@ class SubscriberRequestViewTest(TestCase):
 
         response = self.client.post(reverse('subscriber_request'), data=form_data)
 
-        # Paid users receive payment instructions email from signal
+        # The signal only queues the automation; the worker sends the email
+        self.assertEqual(len(mail.outbox), 0)
+        self.mock_get_folder_url.assert_not_called()
+        run_pending_jobs()
+        self.assertEqual(len(mail.outbox), 0)
+        send_queued_emails()
+
+        # Paid users receive payment instructions email from the outbox
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, 'Thank you for your subscription request')
         self.assertEqual(mail.outbox[0].to, ['subscriber@example.com'])
 
 
+class BackgroundJobTest(TestCase):
+    """Test cases for the background job queue (blog.jobs)."""
+
+    def setUp(self):
+        patcher = patch(
+            'blog.signals.get_or_create_subscriber_folder_url',
+            return_value='https://drive.google.com/mock-folder',
+        )
+        self.mock_get_folder_url = patcher.start()
+        self.addCleanup(patcher.stop)
+        now = timezone.now()
+        self.cohort = Cohort.objects.create(
+            cohort_id='TEST_JOBS',
+            name='Test Jobs Cohort',
+            reg_start_date=now - timedelta(days=1),
+            reg_end_date=now + timedelta(days=30),
+            exp_date_6=now + timedelta(days=180),
+            exp_date_12=now + timedelta(days=365),
+            is_active=True
+        )
+
+    def _create_request(self, email='jobs@example.com'):
+        return SubscriberRequest.objects.create(name='Job Tester', email=email, country='Myanmar',
+                                                city='Yangon', plan='6month')
+
+    def test_new_request_is_queued_once(self):
+        """Test that only creating a request queues automation."""
+        subscriber_request = self._create_request()
+        subscriber_request.status = 'approved'
+        subscriber_request.save()
+        job = BackgroundJob.objects.get(name='subscriber_request.folder')
+        self.assertEqual(job.payload, {'subscriber_request_id': subscriber_request.pk})
+        self.assertEqual(job.status, BackgroundJob.QUEUED)
+
+    def test_folder_job_queues_email(self):
+        """Test that the folder job completes and puts the email in the outbox."""
+        self._create_request()
+        result = run_pending_jobs()
+        self.assertEqual(result, {'done': 1, 'retried': 0, 'failed': 0})
+        self.assertEqual(BackgroundJob.objects.get().status, BackgroundJob.DONE)
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.to, ['jobs@example.com'])
+        self.assertIn('https://drive.google.com/mock-folder', email.html_body)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_failures_are_retried_with_backoff(self):
+        """Test that a failing job is rescheduled, then marked failed."""
+        self.mock_get_folder_url.return_value = None
+        self._create_request()
+        with self.settings(BACKGROUND_JOB_RETRY_DELAY=60):
+            self.assertEqual(run_pending_jobs(), {'done': 0, 'retried': 1, 'failed': 0})
+            job = BackgroundJob.objects.get()
+            self.assertEqual(job.attempts, 1)
+            self.assertIn('No folder URL', job.last_error)
+            self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=50))
+            # Not due yet
+            self.assertEqual(run_pending_jobs(), {'done': 0, 'retried': 0, 'failed': 0})
+
+            BackgroundJob.objects.update(run_at=timezone.now(), attempts=job.max_attempts - 1)
+            self.assertEqual(run_pending_jobs(), {'done': 0, 'retried': 0, 'failed': 1})
+        self.assertEqual(BackgroundJob.objects.get().status, BackgroundJob.FAILED)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(jobs.retry_delay(3), 240)
+
+    def test_abandoned_running_job_is_reclaimed(self):
+        """Test that a job locked by a dead worker runs again after the lock timeout."""
+        self._create_request()
+        job = jobs.claim_job(worker='dead-worker')
+        self.assertIsNone(jobs.claim_job(worker='other'))
+        BackgroundJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        reclaimed = jobs.claim_job(worker='other')
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertEqual(reclaimed.attempts, 2)
+
+    def test_handler_runs_outside_a_transaction(self):
+        """Test that handlers do not run inside a transaction opened by the worker."""
+        depth = []
+        jobs.register('tests.depth')(lambda: depth.append(len(connection.atomic_blocks)))
+        self.addCleanup(jobs._handlers.pop, 'tests.depth')
+        jobs.enqueue('tests.depth')
+        outside = len(connection.atomic_blocks)
+        run_pending_jobs()
+        self.assertEqual(depth, [outside])
+
+    def test_prune_done_jobs(self):
+        """Test that only old done jobs are deleted."""
+        self._create_request('old@example.com')
+        self._create_request('new@example.com')
+        self._create_request('failed@example.com')
+        BackgroundJob.objects.update(status=BackgroundJob.DONE, finished_at=timezone.now() - timedelta(days=30))
+        BackgroundJob.objects.filter(payload__subscriber_request_id=SubscriberRequest.objects.get(
+            email='new@example.com').pk).update(finished_at=timezone.now())
+        BackgroundJob.objects.filter(payload__subscriber_request_id=SubscriberRequest.objects.get(
+            email='failed@example.com').pk).update(status=BackgroundJob.FAILED)
+        self.assertEqual(jobs.prune_done_jobs(days=14), 1)
+        self.assertEqual(BackgroundJob.objects.count(), 2)
+
+    def test_run_jobs_command(self):
+        """Test the worker command in --once mode."""
+        self._create_request()
+        out = StringIO()
+        call_command('run_jobs', '--once', stdout=out)
+        self.assertIn('Jobs: 1 done, 0 retried, 0 failed', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('run_jobs', '--max-jobs', '0')
+
+
+class OutboxTest(TestCase):
+    """Test cases for the email outbox (blog.outbox)."""
+
+    def setUp(self):
+        rate = self.settings(EMAIL_OUTBOX_RATE_LIMIT=0)
+        rate.enable()
+        self.addCleanup(rate.disable)
+
+    def _queue(self, count):
+        return [queue_email(f'Subject {i}', f'Body {i}', [f'user{i}@example.com'], html_body=f'<p>{i}</p>')
+                for i in range(count)]
+
+    def test_batch_reuses_one_connection(self):
+        """Test that a batch opens a single connection and sends every message."""
+        self._queue(3)
+        with patch('blog.outbox.get_connection', wraps=get_connection) as mock_connection:
+            result = send_queued_emails(batch_size=10)
+        self.assertEqual(result, {'sent': 3, 'retried': 0, 'failed': 0})
+        mock_connection.assert_called_once()
+        self.assertEqual([m.subject for m in mail.outbox], ['Subject 0', 'Subject 1', 'Subject 2'])
+        self.assertEqual(mail.outbox[0].alternatives[0][0], '<p>0</p>')
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.SENT).exists())
+        self.assertEqual(send_queued_emails(), {'sent': 0, 'retried': 0, 'failed': 0})
+
+    def test_failed_send_is_retried_then_given_up(self):
+        """Test per-message retry counters and status."""
+        first, second = self._queue(2)
+        calls = []
+
+        def flaky_send(message, fail_silently=False):
+            calls.append(message.subject)
+            if message.subject == 'Subject 0':
+                raise smtplib.SMTPRecipientsRefused({})
+            return 1
+
+        with patch('django.core.mail.EmailMessage.send', flaky_send):
+            self.assertEqual(send_queued_emails(), {'sent': 1, 'retried': 1, 'failed': 0})
+            first.refresh_from_db()
+            self.assertEqual(first.status, OutboundEmail.QUEUED)
+            self.assertEqual(first.attempts, 1)
+            self.assertIn('SMTPRecipientsRefused', first.last_error)
+            self.assertGreater(first.send_after, timezone.now())
+
+            OutboundEmail.objects.filter(pk=first.pk).update(send_after=timezone.now(), attempts=4)
+            self.assertEqual(send_queued_emails(), {'sent': 0, 'retried': 0, 'failed': 1})
+        first.refresh_from_db()
+        self.assertEqual(first.status, OutboundEmail.FAILED)
+        self.assertEqual(calls, ['Subject 0', 'Subject 1', 'Subject 0'])
+
+    def test_rate_limit_spaces_messages(self):
+        """Test that EMAIL_OUTBOX_RATE_LIMIT throttles sends."""
+        self._queue(3)
+        clock = [1000.0]
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        with self.settings(EMAIL_OUTBOX_RATE_LIMIT=120), \
+                patch('blog.outbox.time.monotonic', side_effect=lambda: clock[0]), \
+                patch('blog.outbox.time.sleep', side_effect=fake_sleep):
+            send_queued_emails()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(sleeps, [0.5, 0.5])
+
+    def test_send_queued_emails_command(self):
+        """Test the sender command in --once mode."""
+        self._queue(2)
+        out = StringIO()
+        call_command('send_queued_emails', '--once', '--batch-size', '1', stdout=out)
+        self.assertIn('Emails: 2 sent, 0 retried, 0 failed', out.getvalue())
+
+
+class ViewCounterTest(TestCase):
+    """Test cases for the write-coalescing post view counter."""
+
+    def setUp(self):
+        user = User.objects.create_user(username='counter', password='testpass123')
+        self.posts = [
+            Post.objects.create(title=f'Post {i}', slug=f'post-{i}', author=user, content='x', status=1)
+            for i in range(3)
+        ]
+
+    def test_flush_uses_atomic_increments(self):
+        """Test that flushed deltas are added to the stored count, not overwritten."""
+        counter = ViewCounter(flush_interval=3600, flush_threshold=1000)
+        counter.increment(self.posts[0].pk, 2)
+        counter.increment(self.posts[1].pk, 2)
+        counter.increment(self.posts[2].pk)
+        Post.objects.filter(pk=self.posts[0].pk).update(view_count=10)
+
+        with self.assertNumQueries(4):  # savepoint, one UPDATE per distinct delta, release
+            self.assertEqual(counter.flush(), 5)
+        counts = dict(Post.objects.values_list('pk', 'view_count'))
+        self.assertEqual(counts[self.posts[0].pk], 12)
+        self.assertEqual(counts[self.posts[1].pk], 2)
+        self.assertEqual(counts[self.posts[2].pk], 1)
+        self.assertEqual(counter.pending(self.posts[0].pk), 0)
+
+    def test_threshold_triggers_flush(self):
+        """Test that reaching the threshold writes the batch immediately."""
+        counter = ViewCounter(flush_interval=3600, flush_threshold=3)
+        counter.increment(self.posts[0].pk)
+        counter.increment(self.posts[0].pk)
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).view_count, 0)
+        counter.increment(self.posts[0].pk)
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).view_count, 3)
+
+    def test_concurrent_increments_are_not_lost(self):
+        """Test that increments from many threads all reach the pending total."""
+        counter = ViewCounter(flush_interval=3600, flush_threshold=10 ** 6)
+        post_id = self.posts[0].pk
+
+        def hit():
+            for _ in range(500):
+                counter.increment(post_id)
+
+        threads = [threading.Thread(target=hit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.pending(post_id), 4000)
+        self.assertEqual(counter.current(self.posts[0]), 4000)
+
+    def test_record_view_counts_flushed_views(self):
+        """Test that the count shown when a view triggers a flush includes the flushed views."""
+        post = self.posts[0]
+        counter = ViewCounter(flush_interval=3600, flush_threshold=3)
+        with patch('blog.view_counter.view_counter', counter):
+            self.assertEqual(record_view(post), 1)
+            self.assertEqual(record_view(post), 2)
+            self.assertEqual(record_view(post), 3)  # flushed here
+            self.assertEqual(counter.pending(post.pk), 0)
+            post.refresh_from_db()  # the next request loads the flushed count
+            self.assertEqual(record_view(post), 4)
+
+    def test_due_batch_is_flushed_at_request_end(self):
+        """Test that a due batch is written by the next request, even one without views."""
+        counter = ViewCounter(flush_interval=3600, flush_threshold=1000)
+        counter.increment(self.posts[0].pk)
+        with patch('blog.view_counter.view_counter', counter):
+            self.client.get(reverse('home'))
+            self.assertEqual(counter.pending(self.posts[0].pk), 1)
+            counter.flush_interval = 0
+            self.client.get(reverse('home'))
+        self.assertEqual(counter.pending(self.posts[0].pk), 0)
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).view_count, 1)
+
+    def test_null_view_count_is_incremented(self):
+        """Test that posts with a NULL view_count start counting from zero."""
+        Post.objects.filter(pk=self.posts[0].pk).update(view_count=None)
+        counter = ViewCounter(flush_interval=3600, flush_threshold=1000)
+        counter.increment(self.posts[0].pk)
+        counter.flush()
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).view_count, 1)
+
+
 class PlayGroundViewTest(TestCase):
     """Test cases for PlayGround view."""
     
@@ -639,6 +1630,351 @@ class PlayGroundViewTest(TestCase):
         self.assertIn('confidence', response.context)
 
 
+class FeedbackClassifierRegistryTest(TestCase):
+    """Test cases for the process-wide feedback classifier registry."""
+
+    def setUp(self):
+        reset_classifier()
+        self.addCleanup(reset_classifier)
+
+    def test_classifier_loaded_once(self):
+        """Test that the model is read from disk only once per process."""
+        with patch.object(ClassifierRegistry, '_load', autospec=True, side_effect=ClassifierRegistry._load) as mock_load:
+            first = get_classifier()
+            second = get_classifier()
+        self.assertIs(first, second)
+        self.assertEqual(mock_load.call_count, 1)
+
+    def test_playground_requests_share_classifier(self):
+        """Test that PlayGround requests do not reload the model."""
+        warm_classifier()
+        with patch.object(ClassifierRegistry, '_load') as mock_load:
+            self.client.post(reverse('our_playground'), data={'feedback': 'Great class.'})
+            self.client.post(reverse('our_playground'), data={'feedback': 'Too fast.'})
+        mock_load.assert_not_called()
+
+    def test_missing_model_returns_none(self):
+        """Test that a missing model file yields None instead of raising."""
+        with self.settings(FEEDBACK_CLASSIFIER_PATH='/nonexistent/model.bin',
+                           FEEDBACK_CLASSIFIER_ARTIFACT_DIR=''):
+            reset_classifier()
+            self.assertIsNone(get_classifier())
+
+    def test_pickle_fallback_without_artifact(self):
+        """Test that the sklearn pickle is used when no artifact is exported."""
+        with self.settings(FEEDBACK_CLASSIFIER_ARTIFACT_DIR=''):
+            reset_classifier()
+            self.assertFalse(isinstance(get_classifier(), ArtifactClassifier))
+
+
+class ClassifierArtifactTest(TestCase):
+    """Test cases for the pickle-free classifier artifact."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with open(settings.FEEDBACK_CLASSIFIER_PATH, 'rb') as f_in:
+            cls.pipeline = pickle.load(f_in)
+        cls.artifact_dir = tempfile.mkdtemp()
+        export_artifact(cls.pipeline, cls.artifact_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.artifact_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_artifact_matches_pipeline(self):
+        """Test that the artifact engine reproduces the pickled pipeline."""
+        engine = ArtifactClassifier(self.artifact_dir)
+        texts = [
+            'The instructor explained everything clearly',
+            'The class was BORING, boring and too long!!',
+            'ok',
+            '',
+            'zzzz unknownword qqqq',
+        ]
+        self.assertEqual(list(engine.classes_), list(self.pipeline.classes_))
+        self.assertEqual(list(engine.predict(texts)), list(self.pipeline.predict(texts)))
+        np.testing.assert_allclose(
+            engine.predict_proba(texts), self.pipeline.predict_proba(texts), rtol=0, atol=1e-12
+        )
+
+    def test_artifact_arrays_are_memory_mapped(self):
+        """Test that the large arrays are memory-mapped, not copied."""
+        engine = ArtifactClassifier(self.artifact_dir)
+        self.assertIsInstance(engine._feature_log_prob, np.memmap)
+        self.assertIsInstance(engine._vocabulary, np.memmap)
+
+    def test_registry_prefers_artifact(self):
+        """Test that the registry loads the artifact when it exists."""
+        self.addCleanup(reset_classifier)
+        with self.settings(FEEDBACK_CLASSIFIER_ARTIFACT_DIR=self.artifact_dir):
+            reset_classifier()
+            self.assertIsInstance(get_classifier(), ArtifactClassifier)
+
+    def test_export_rejects_unsupported_pipeline(self):
+        """Test that pipelines the engine cannot reproduce are refused."""
+        with self.assertRaises(UnsupportedPipeline):
+            export_artifact(object(), self.artifact_dir)
+
+
+class MicroBatcherTest(TestCase):
+    """Test cases for the classification micro-batcher."""
+
+    def test_concurrent_submissions_share_one_call(self):
+        """Test that items submitted within the wait window are scored together."""
+        calls = []
+
+        def predict_batch(items):
+            calls.append(list(items))
+            return [item.upper() for item in items]
+
+        batcher = MicroBatcher(predict_batch, max_batch_size=10, max_wait=0.2)
+        futures = [batcher.submit(text) for text in ['a', 'b', 'c']]
+
+        self.assertEqual([f.result(timeout=2) for f in futures], ['A', 'B', 'C'])
+        self.assertEqual(calls, [['a', 'b', 'c']])
+
+    def test_batch_size_limit(self):
+        """Test that a full batch is scored without waiting for the deadline."""
+        calls = []
+
+        def predict_batch(items):
+            calls.append(len(items))
+            return items
+
+        batcher = MicroBatcher(predict_batch, max_batch_size=2, max_wait=0.2)
+        futures = [batcher.submit(i) for i in range(5)]
+
+        self.assertEqual([f.result(timeout=2) for f in futures], [0, 1, 2, 3, 4])
+        self.assertTrue(all(size <= 2 for size in calls))
+
+    def test_errors_reach_every_caller(self):
+        """Test that a failing batch raises in each waiting caller."""
+        def predict_batch(items):
+            raise ClassifierUnavailable('missing model')
+
+        batcher = MicroBatcher(predict_batch, max_batch_size=4, max_wait=0.05)
+        futures = [batcher.submit(text) for text in ['a', 'b']]
+        for future in futures:
+            with self.assertRaises(ClassifierUnavailable):
+                future.result(timeout=2)
+
+    def test_playground_reports_predicted_label_confidence(self):
+        """Test that PlayGround shows the probability of the predicted label."""
+        feedback = 'The instructor explained everything clearly'
+        response = self.client.post(reverse('our_playground'), data={'feedback': feedback})
+
+        classifier = get_classifier()
+        proba = classifier.predict_proba([feedback])[0]
+        self.assertEqual(response.context['result'], classifier.predict([feedback])[0].title())
+        self.assertAlmostEqual(response.context['confidence'], round(proba.max(), 3))
+
+
+class FeedbackClassificationAPITests(TestCase):
+    """Test cases for POST /api/feedback/classify."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='apiuser',
+            email='apiuser@example.com',
+            password='testpass123'
+        )
+        access_token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def test_classify_batch_matches_model(self):
+        """Test that each text gets the model's label and top probability."""
+        texts = ['The instructor explained everything clearly', 'The class was boring and too long']
+        response = self.client.post('/api/feedback/classify', {'texts': texts}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        classifier = get_classifier()
+        expected_labels = list(classifier.predict(texts))
+        expected_confidence = classifier.predict_proba(texts).max(axis=1)
+        for result, label, confidence in zip(response.data['results'], expected_labels, expected_confidence):
+            self.assertEqual(result['label'], label)
+            self.assertAlmostEqual(result['confidence'], confidence)
+
+    def test_classify_requires_authentication(self):
+        """Test that anonymous requests are rejected."""
+        self.client.credentials()
+        response = self.client.post('/api/feedback/classify', {'texts': ['hello']}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_classify_rejects_oversized_batch(self):
+        """Test that batches above FEEDBACK_CLASSIFIER_MAX_BATCH_SIZE are rejected."""
+        with self.settings(FEEDBACK_CLASSIFIER_MAX_BATCH_SIZE=2):
+            response = self.client.post(
+                '/api/feedback/classify', {'texts': ['a b', 'c d', 'e f']}, format='json'
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['status'], 'error')
+
+    def test_classify_rejects_blank_text(self):
+        """Test that blank texts inside the batch are rejected."""
+        response = self.client.post('/api/feedback/classify', {'texts': ['ok', '']}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    @patch('api.views.classify_texts', side_effect=ClassifierUnavailable('Feedback classifier is not available.'))
+    def test_classify_without_model(self, mock_classify):
+        """Test that a missing model returns 503."""
+        with self.assertLogs('django.request', level='ERROR'):
+            response = self.client.post('/api/feedback/classify', {'texts': ['hello']}, format='json')
+        self.assertEqual(response.status_code, 503)
+
+
+class PredictionCacheTest(TestCase):
+    """Test cases for the feedback classifier prediction cache."""
+
+    def setUp(self):
+        get_prediction_cache().clear()
+        self.addCleanup(get_prediction_cache().clear)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = PredictionCache(maxsize=2, ttl=0)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_ttl_expiry(self):
+        """Test that entries older than the TTL are treated as misses."""
+        cache = PredictionCache(maxsize=10, ttl=60)
+        with patch('blog.classifier.cache.time.monotonic', return_value=1000.0):
+            cache.set('a', 1)
+        with patch('blog.classifier.cache.time.monotonic', return_value=1059.0):
+            self.assertEqual(cache.get('a'), 1)
+        with patch('blog.classifier.cache.time.monotonic', return_value=1061.0):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_zero_size_disables_cache(self):
+        """Test that a cache of size 0 never stores anything."""
+        cache = PredictionCache(maxsize=0)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_repeated_texts_skip_inference(self):
+        """Test that cached and duplicate texts are not sent to the model again."""
+        with patch('blog.classifier.scoring.predict_texts', wraps=predict_texts) as mock_predict:
+            first = classify_texts(['Great class', 'Too much homework', 'Great class'])
+            second = classify_texts(['Too much homework', 'great   CLASS!'])
+
+        self.assertEqual(mock_predict.call_count, 1)
+        self.assertEqual(mock_predict.call_args[0][0], ['Great class', 'Too much homework'])
+        self.assertEqual(first[0], first[2])
+        self.assertEqual(second, [first[1], first[0]])
+        stats = get_prediction_cache().stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 2))
+
+    def test_cached_results_match_model(self):
+        """Test that cache hits return the same prediction as the model."""
+        texts = ['The instructor explained everything clearly', 'boring']
+        classify_texts(texts)
+        self.assertEqual(classify_texts(texts), predict_texts(texts))
+
+    def test_model_version_is_part_of_key(self):
+        """Test that a new model version does not reuse old predictions."""
+        classify_texts(['Great class'])
+        with patch.object(ClassifierRegistry, 'version', new='another-model'):
+            with patch('blog.classifier.scoring.predict_texts', wraps=predict_texts) as mock_predict:
+                classify_texts(['Great class'])
+        mock_predict.assert_called_once()
+
+    def test_playground_and_api_share_cache(self):
+        """Test that a text scored through the API is a cache hit in PlayGround."""
+        user = User.objects.create_user(username='cacheuser', password='testpass123')
+        api_client = APIClient()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        api_client.post('/api/feedback/classify', {'texts': ['Loved the projects']}, format='json')
+
+        with patch('blog.classifier.batching.predict_texts') as mock_predict:
+            response = self.client.post(reverse('our_playground'), data={'feedback': 'Loved the projects'})
+            self.assertEqual(classify_text('loved the PROJECTS.'), classify_texts(['Loved the projects'])[0])
+        mock_predict.assert_not_called()
+        self.assertIsNotNone(response.context['result'])
+        self.assertGreaterEqual(get_prediction_cache().stats()['hits'], 3)
+
+    def test_stats_endpoint_requires_admin(self):
+        """Test that cache statistics are only visible to admins."""
+        api_client = APIClient()
+        user = User.objects.create_user(username='plainuser', password='testpass123')
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        self.assertEqual(api_client.get('/api/feedback/stats').status_code, 403)
+
+        admin = User.objects.create_superuser(username='statsadmin', password='testpass123')
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}")
+        classify_texts(['Great class', 'Great class'])
+        response = api_client.get('/api/feedback/stats')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['cache']['misses'], 1)
+        self.assertTrue(response.data['model_version'])
+
+
+class ClassifyFeedbackCommandTest(TestCase):
+    """Test cases for the classify_feedback management command."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def test_csv_is_scored_in_chunks(self):
+        """Test that CSV rows keep their columns and gain label/confidence."""
+        texts = ['Great class', 'Too much homework', '', 'The instructor explained everything clearly']
+        with open(self._path('in.csv'), 'w', newline='') as f_out:
+            writer = csv.writer(f_out)
+            writer.writerow(['id', 'feedback'])
+            writer.writerows([[i, text] for i, text in enumerate(texts)])
+
+        out = StringIO()
+        call_command('classify_feedback', self._path('in.csv'), output=self._path('out.csv'),
+                     chunk_size=3, stdout=out)
+
+        with open(self._path('out.csv'), newline='') as f_in:
+            rows = list(csv.DictReader(f_in))
+        self.assertEqual([row['id'] for row in rows], ['0', '1', '2', '3'])
+        self.assertEqual(rows[2]['label'], '')
+        expected = predict_texts([texts[0], texts[1], texts[3]])
+        self.assertEqual([rows[i]['label'] for i in (0, 1, 3)], [p['label'] for p in expected])
+        self.assertAlmostEqual(float(rows[3]['confidence']), expected[2]['confidence'], places=6)
+        self.assertIn('Classified 3 of 4 rows', out.getvalue())
+
+    def test_jsonl_with_process_pool(self):
+        """Test that JSONL input scored by worker processes keeps input order."""
+        texts = [f'feedback number {i} was great' if i % 2 else f'lesson {i} was boring' for i in range(10)]
+        with open(self._path('in.jsonl'), 'w') as f_out:
+            for i, text in enumerate(texts):
+                f_out.write(json.dumps({'id': i, 'text': text}) + '\n')
+
+        call_command('classify_feedback', self._path('in.jsonl'), output=self._path('out.jsonl'),
+                     text_column='text', chunk_size=3, workers=2, stdout=StringIO())
+
+        with open(self._path('out.jsonl')) as f_in:
+            rows = [json.loads(line) for line in f_in]
+        self.assertEqual([row['id'] for row in rows], list(range(10)))
+        self.assertEqual([row['label'] for row in rows], [p['label'] for p in predict_texts(texts)])
+
+    def test_missing_text_column(self):
+        """Test that an unknown text column is reported as a command error."""
+        with open(self._path('in.csv'), 'w') as f_out:
+            f_out.write('id,comment\n1,hello\n')
+        with self.assertRaises(CommandError):
+            call_command('classify_feedback', self._path('in.csv'), output=self._path('out.csv'),
+                         stdout=StringIO())
+
+
 class URLPatternsTest(TestCase):
     """Test cases for URL patterns."""
     
@@ -682,6 +2018,8 @@ class IntegrationTest(TestCase):
         self.addCleanup(patcher.stop)
         """Set up test data."""
         self.client = Client()
+        view_counter.clear()
+        self.addCleanup(view_counter.clear)
         self.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
@@ -846,3 +2184,633 @@ class CohortAPITests(TestCase):
         self.assertEqual(response.status_code, 403)
         self.assertEqual(response.data["status"], "error")
         self.assertIn("Registration is currently closed", response.data["message"])
+
+
+class CohortTimelineTest(TestCase):
+    """Test cases for the in-process cohort timeline."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.now = now = timezone.now()
+
+        def make(cohort_id, start, end, is_active=True):
+            return Cohort.objects.create(
+                cohort_id=cohort_id, name=cohort_id,
+                reg_start_date=now + timedelta(days=start), reg_end_date=now + timedelta(days=end),
+                exp_date_6=now + timedelta(days=end + 180), exp_date_12=now + timedelta(days=end + 365),
+                is_active=is_active,
+            )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # A long inactive window overlapping two shorter ones, and a gap.
+            make('LONG', -100, 40, is_active=False)
+            make('EARLY', -60, -30)
+            make('CURRENT', -10, 10)
+            make('NEXT', 20, 30)
+            make('LATER', 60, 90)
+
+    def test_lookups_match_queries(self):
+        """Test that timeline lookups give the same cohorts as the equivalent queries."""
+        for days in range(-120, 120, 5):
+            when = self.now + timedelta(days=days)
+            expected_active = Cohort.objects.filter(
+                is_active=True, reg_start_date__lte=when, reg_end_date__gte=when).first()
+            expected_any = Cohort.objects.filter(
+                reg_start_date__lte=when, reg_end_date__gte=when).order_by('-reg_start_date').first()
+            expected_next = Cohort.objects.filter(reg_start_date__gt=when).order_by('reg_start_date').first()
+            self.assertEqual(Cohort.get_active_cohort(when), expected_active, days)
+            self.assertEqual(Cohort.get_registration_cohort(when), expected_any, days)
+            self.assertEqual(Cohort.get_upcoming_cohort(when), expected_next, days)
+
+    def test_get_next_cohort(self):
+        """Test that get_next_cohort skips the requested number of cohorts."""
+        current = Cohort.objects.get(cohort_id='CURRENT')
+        self.assertEqual(current.get_next_cohort().cohort_id, 'NEXT')
+        self.assertEqual(current.get_next_cohort(skip=2).cohort_id, 'LATER')
+        self.assertIsNone(current.get_next_cohort(skip=3))
+
+    def test_lookups_are_served_from_memory(self):
+        """Test that lookups run no queries and skip the shared version between checks."""
+        with self.settings(COHORT_VERSION_CHECK_INTERVAL=60):
+            get_timeline()
+            with self.assertNumQueries(0), patch.object(cohorts, 'get_cohort_version') as mock_version:
+                self.assertEqual(Cohort.get_active_cohort().cohort_id, 'CURRENT')
+                self.assertEqual(Cohort.get_upcoming_cohort().cohort_id, 'NEXT')
+        mock_version.assert_not_called()
+
+    def test_returned_cohorts_are_copies(self):
+        """Test that changing a returned cohort does not change the timeline."""
+        Cohort.get_active_cohort().name = 'Changed'
+        self.assertEqual(Cohort.get_active_cohort().name, 'CURRENT')
+
+    def test_save_and_delete_invalidate(self):
+        """Test that saving or deleting a cohort is seen by the next lookup."""
+        get_timeline()
+        with self.captureOnCommitCallbacks(execute=True):
+            current = Cohort.objects.get(cohort_id='CURRENT')
+            current.is_active = False
+            current.save()
+        self.assertIsNone(Cohort.get_active_cohort())
+        with self.captureOnCommitCallbacks(execute=True):
+            Cohort.objects.get(cohort_id='NEXT').delete()
+        self.assertEqual(Cohort.get_upcoming_cohort().cohort_id, 'LATER')
+
+    def test_change_by_another_worker_is_seen_after_check_interval(self):
+        """Test that a version bump in the shared cache reloads this process's timeline."""
+        with self.settings(COHORT_VERSION_CHECK_INTERVAL=60):
+            get_timeline()
+            # Another worker saved the cohort: the row changed and it bumped the shared version.
+            Cohort.objects.filter(cohort_id='CURRENT').update(is_active=False)
+            cache.set(cohorts.VERSION_KEY, time.time_ns(), None)
+            self.assertEqual(Cohort.get_active_cohort().cohort_id, 'CURRENT')
+        self.assertIsNone(Cohort.get_active_cohort())
+
+    def test_admin_registration_actions_invalidate(self):
+        """Test that opening or closing registration in the admin is seen by the next lookup."""
+        admin_user = User.objects.create_superuser(username='cohortadmin', password='testpass123')
+        self.client.force_login(admin_user)
+        current = Cohort.objects.get(cohort_id='CURRENT')
+        url = reverse('admin:blog_cohort_changelist')
+        with self.settings(COHORT_VERSION_CHECK_INTERVAL=60):
+            get_timeline()
+            self.client.post(url, {'action': 'close_registration', '_selected_action': [current.pk]})
+            self.assertIsNone(Cohort.get_active_cohort())
+            self.client.post(url, {'action': 'open_registration', '_selected_action': [current.pk]})
+            self.assertEqual(Cohort.get_active_cohort().cohort_id, 'CURRENT')
+
+    def test_rolled_back_change_is_not_kept(self):
+        """Test that a cohort created in a rolled-back transaction disappears."""
+        try:
+            with transaction.atomic():
+                Cohort.objects.create(
+                    cohort_id='GHOST', name='Ghost', reg_start_date=self.now + timedelta(days=1),
+                    reg_end_date=self.now + timedelta(days=2), exp_date_6=self.now, exp_date_12=self.now,
+                )
+                self.assertEqual(Cohort.get_upcoming_cohort().cohort_id, 'GHOST')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(Cohort.get_upcoming_cohort().cohort_id, 'NEXT')
+
+    def test_empty_timeline(self):
+        """Test that lookups on an empty timeline return None."""
+        timeline = CohortTimeline([])
+        self.assertIsNone(timeline.registration_cohort(self.now))
+        self.assertIsNone(timeline.starting_after(self.now))
+
+
+class FakeCredentials:
+    """Stand-in for google.oauth2 Credentials with a settable expiry."""
+
+    def __init__(self, expires_in):
+        self.expiry = datetime.utcnow() + timedelta(seconds=expires_in)
+        self.refresh_token = 'refresh'
+        self.refreshed = 0
+
+    @property
+    def valid(self):
+        return self.expiry > datetime.utcnow()
+
+    def refresh(self, request):
+        self.refreshed += 1
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+
+class GoogleClientPoolTest(TestCase):
+    """Test cases for blog.google_clients.GoogleClientPool."""
+
+    def setUp(self):
+        self.loaded = []
+        self.saved = []
+
+        def load():
+            credentials = FakeCredentials(expires_in=3600)
+            self.loaded.append(credentials)
+            return credentials
+
+        self.pool = GoogleClientPool(load, self.saved.append)
+
+    def test_credentials_are_loaded_once(self):
+        """Test that the token file is read once per process."""
+        first = self.pool.credentials()
+        self.assertIs(self.pool.credentials(), first)
+        self.assertEqual(len(self.loaded), 1)
+
+    def test_credentials_refreshed_ahead_of_expiry(self):
+        """Test that credentials close to expiry are refreshed and saved."""
+        credentials = self.pool.credentials()
+        credentials.expiry = datetime.utcnow() + timedelta(seconds=60)
+        self.assertIs(self.pool.credentials(), credentials)
+        self.assertEqual(credentials.refreshed, 1)
+        self.assertEqual(self.saved, [credentials])
+        self.pool.credentials()
+        self.assertEqual(credentials.refreshed, 1)
+
+    @patch('blog.google_clients.build')
+    def test_drive_service_per_thread(self, mock_build):
+        """Test that the Drive service is built once per thread."""
+        mock_build.side_effect = lambda *args, **kwargs: object()
+        service = self.pool.drive()
+        self.assertIs(self.pool.drive(), service)
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.pool.drive()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], service)
+        self.assertEqual(mock_build.call_count, 2)
+
+    @patch('blog.google_clients.gspread.authorize')
+    def test_worksheet_handles_are_cached(self, mock_authorize):
+        """Test that worksheets are opened once and reopened after a reset."""
+        client = mock_authorize.return_value
+        worksheet = self.pool.worksheet('sheet-id', 'raw_registration')
+        self.assertIs(self.pool.worksheet('sheet-id', 'raw_registration'), worksheet)
+        self.assertEqual(client.open_by_key.call_count, 1)
+        self.assertEqual(mock_authorize.call_count, 1)
+
+        with self.settings(GOOGLE_WORKSHEET_CACHE_TIMEOUT=0):
+            self.pool.worksheet('sheet-id', 'raw_registration')
+        self.assertEqual(client.open_by_key.call_count, 2)
+
+        self.pool.reset()
+        self.pool.worksheet('sheet-id', 'raw_registration')
+        self.assertEqual(len(self.loaded), 2)
+        self.assertEqual(mock_authorize.call_count, 2)
+
+
+class FakeWorksheet:
+    """In-memory worksheet answering the gspread calls used by blog.sheet_index."""
+
+    title = 'raw_registration'
+
+    def __init__(self, rows):
+        self.rows = [list(row) for row in rows]
+        self.calls = []
+
+    def _column(self, letter):
+        index = ord(letter) - ord('A')
+        column = [[row[index]] if len(row) > index and row[index] else [] for row in self.rows]
+        while column and not column[-1]:
+            column.pop()
+        return column
+
+    def _cell(self, range_name):
+        index, row = ord(range_name[0]) - ord('A'), int(range_name[1:])
+        if row > len(self.rows) or len(self.rows[row - 1]) <= index or not self.rows[row - 1][index]:
+            return []
+        return [[self.rows[row - 1][index]]]
+
+    def batch_get(self, ranges):
+        self.calls.append(('batch_get', tuple(ranges)))
+        return [self._cell(r) if r[1:].isdigit() else self._column(r[0]) for r in ranges]
+
+    def get(self, range_name):
+        self.calls.append(('get', range_name))
+        start = range_name.split(':')[0]
+        row = int(start[1:])
+        if row > len(self.rows):
+            return []
+        values = self.rows[row - 1][ord(start[0]) - ord('A'):]
+        if ':' not in range_name:
+            values = values[:1]
+        return [values] if any(values) else []
+
+    def update(self, range_name, values, **kwargs):
+        self.calls.append(('update', range_name))
+        row = int(range_name.split(':')[0][1:])
+        self.rows[row - 1] = list(values[0])
+
+    def batch_update(self, data, **kwargs):
+        self.calls.append(('batch_update', len(data)))
+        for item in data:
+            row = int(item['range'].split(':')[0][1:])
+            old = self.rows[row - 1] + [''] * (8 - len(self.rows[row - 1]))
+            self.rows[row - 1] = [o if v is None else v for v, o in zip(item['values'][0], old)]
+
+    def append_row(self, values, **kwargs):
+        self.calls.append(('append_row',))
+        self.rows.append(list(values))
+        n = len(self.rows)
+        return {'updates': {'updatedRange': f'{self.title}!A{n}:H{n}'}}
+
+    def append_rows(self, values, **kwargs):
+        self.calls.append(('append_rows', len(values)))
+        first = len(self.rows) + 1
+        self.rows.extend(list(row) for row in values)
+        return {'updates': {'updatedRange': f'{self.title}!A{first}:H{len(self.rows)}'}}
+
+
+class SheetEmailIndexTest(TestCase):
+    """Test cases for the raw_registration email -> row index."""
+
+    HEADER = ['name', 'email', 'tele_name', 'country', 'plan', 'status', 'created_at', 'payment_url']
+
+    def setUp(self):
+        self.sheet = FakeWorksheet([
+            self.HEADER,
+            ['Ann', 'ann@example.com', '', 'MM', '6-Month Plan', 'Pending', '', 'https://drive/ann'],
+            ['Bob', 'Bob@Example.com ', '', 'MM', 'Annual Plan', 'Pending', '', ''],
+        ])
+        self.index = SheetEmailIndex(self.sheet, 'sheet-id')
+
+    def _lookup_calls(self, email):
+        self.sheet.calls.clear()
+        result = self.index.lookup(email)
+        return result, [call[0] for call in self.sheet.calls]
+
+    def test_lookup_reads_one_row(self):
+        """Test that an indexed email costs one row read."""
+        self.index.rebuild()
+        (row, values), calls = self._lookup_calls('ANN@example.com')
+        self.assertEqual(row, 2)
+        self.assertEqual(values[7], 'https://drive/ann')
+        self.assertEqual(calls, ['get'])
+        (row, _), _ = self._lookup_calls('bob@example.com')
+        self.assertEqual(row, 3)
+
+    def test_missing_email_reads_one_cell(self):
+        """Test that an unknown email is answered by checking the row below the index."""
+        self.index.rebuild()
+        result, calls = self._lookup_calls('nobody@example.com')
+        self.assertEqual(result, (None, None))
+        self.assertEqual(calls, ['get'])
+
+    def test_first_lookup_builds_index(self):
+        """Test that an empty index is built from one column read."""
+        (row, _), calls = self._lookup_calls('bob@example.com')
+        self.assertEqual(row, 3)
+        self.assertEqual(calls, ['batch_get', 'get'])
+        self.assertEqual(SheetRowIndex.objects.filter(worksheet='raw_registration').count(), 3)
+
+    def test_moved_rows_trigger_rebuild(self):
+        """Test that a row deleted in the sheet is detected and the index rebuilt."""
+        self.index.rebuild()
+        del self.sheet.rows[1]
+        (row, values), calls = self._lookup_calls('bob@example.com')
+        self.assertEqual(row, 2)
+        self.assertEqual(values[1].strip(), 'Bob@Example.com')
+        self.assertEqual(calls, ['get', 'batch_get', 'get'])
+
+    def test_rows_appended_elsewhere_are_found(self):
+        """Test that rows added outside the app are picked up."""
+        self.index.rebuild()
+        self.sheet.rows.append(['Cy', 'cy@example.com', '', '', '', '', '', 'https://drive/cy'])
+        (row, values), _ = self._lookup_calls('cy@example.com')
+        self.assertEqual(row, 4)
+        self.assertEqual(values[7], 'https://drive/cy')
+
+    def test_duplicate_last_row_does_not_force_rebuilds(self):
+        """Test that misses stay one-cell reads when the last row repeats an earlier email."""
+        self.sheet.rows.append(['Ann', 'ANN@example.com', '', '', '', '', '', ''])
+        self.index.rebuild()
+        for email in ('new1@example.com', 'new2@example.com', 'new3@example.com'):
+            self.assertEqual(self._lookup_calls(email), ((None, None), ['get']))
+            self.assertEqual(self.sheet.calls, [('get', 'B5')])
+        self.assertEqual(self.index.locate(['ann@example.com', 'new@example.com']), {'ann@example.com': 2})
+        self.assertEqual(self.sheet.calls[-1], ('batch_get', ('B2', 'B5')))
+
+    def test_own_appends_are_indexed(self):
+        """Test that appending through the index records the new row without a rebuild."""
+        self.index.rebuild()
+        self.assertEqual(self.index.append(['Dee', 'dee@example.com', '', '', '', '', '', 'https://drive/dee']), 4)
+        entry = SheetRowIndex.objects.get(email='dee@example.com')
+        self.assertEqual((entry.row, entry.folder_url), (4, 'https://drive/dee'))
+        (row, _), calls = self._lookup_calls('dee@example.com')
+        self.assertEqual((row, calls), (4, ['get']))
+
+    @patch('blog.google_api_utils.get_worksheet')
+    def test_upsert_updates_or_appends(self, mock_get_worksheet):
+        """Test that upsert_log_to_spreadsheet writes one row per subscriber."""
+        mock_get_worksheet.return_value = self.sheet
+        now = timezone.now()
+        Cohort.objects.create(
+            cohort_id='SHEET_2024', name='Sheet', reg_start_date=now - timedelta(days=1),
+            reg_end_date=now + timedelta(days=30), exp_date_6=now + timedelta(days=180),
+            exp_date_12=now + timedelta(days=365),
+        )
+        with patch('blog.signals.jobs.enqueue'):
+            existing = SubscriberRequest.objects.create(
+                name='Ann Again', email='ann@example.com', country='MM', city='Yangon')
+            new = SubscriberRequest.objects.create(
+                name='Eve', email='eve@example.com', country='MM', city='Yangon')
+
+        with self.assertLogs('blog.google_api_utils', level='INFO'):
+            self.assertTrue(google_api_utils.upsert_log_to_spreadsheet(existing, 'https://drive/ann2'))
+            self.assertTrue(google_api_utils.upsert_log_to_spreadsheet(new, 'https://drive/eve'))
+            self.assertTrue(google_api_utils.upsert_log_to_spreadsheet(new, 'https://drive/eve2'))
+            self.assertEqual(google_api_utils.find_url_in_spreadsheet('eve@example.com'), 'https://drive/eve2')
+        self.assertEqual(self.sheet.calls, [])
+        self.assertEqual(PendingSheetWrite.objects.count(), 2)
+
+        with self.assertLogs('blog.sheet_buffer', level='INFO'):
+            flush_sheet_writes(self.sheet, google_api_utils.SPREADSHEET_ID)
+        self.assertEqual(self.sheet.rows[1][0], 'Ann Again')
+        self.assertEqual(len(self.sheet.rows), 4)
+        self.assertEqual(self.sheet.rows[3][7], 'https://drive/eve2')
+        self.assertEqual(
+            [call[0] for call in self.sheet.calls], ['batch_get', 'batch_update', 'append_rows'])
+        self.assertFalse(PendingSheetWrite.objects.exists())
+
+
+class SheetWriteBufferTest(TestCase):
+    """Test cases for buffered, batched worksheet writes."""
+
+    def setUp(self):
+        self.sheet = FakeWorksheet([
+            SheetEmailIndexTest.HEADER,
+            ['Ann', 'ann@example.com', '', 'MM', '6-Month Plan', 'Pending', 'Jan. 1, 2024', 'https://drive/ann'],
+        ])
+
+    def _row(self, name, email, plan='Annual Plan', url=''):
+        return [name, email, '', 'MM', plan, 'Pending', 'Feb. 1, 2024', url]
+
+    def test_repeated_writes_are_merged(self):
+        """Test that writes for the same email are merged into one pending row."""
+        buffer_row('sheet-id', 'raw_registration', 'Eve@Example.com', self._row('Eve', 'eve@example.com'))
+        buffer_row('sheet-id', 'raw_registration', 'eve@example.com',
+                   [None, None, None, None, None, 'Renewal Requested', None, 'https://drive/eve'])
+        pending = PendingSheetWrite.objects.get()
+        self.assertEqual(pending.email, 'eve@example.com')
+        self.assertEqual(pending.cells[0], 'Eve')
+        self.assertEqual(pending.cells[5:], ['Renewal Requested', 'Feb. 1, 2024', 'https://drive/eve'])
+        self.assertEqual(BackgroundJob.objects.filter(name=SHEET_FLUSH_JOB).count(), 1)
+
+    def test_flush_is_one_update_and_one_append(self):
+        """Test that a flush sends one batch_update and one multi-row append."""
+        buffer_row('sheet-id', 'raw_registration', 'ann@example.com',
+                   [None, None, None, None, 'Annual Plan', 'Renewal Requested', None, None])
+        for name in ('Cy', 'Dee', 'Eve'):
+            buffer_row('sheet-id', 'raw_registration', f'{name}@example.com',
+                       self._row(name, f'{name.lower()}@example.com'))
+
+        with self.assertLogs('blog.sheet_buffer', level='INFO'):
+            counts = flush_sheet_writes(self.sheet, 'sheet-id')
+        self.assertEqual(counts, {'updated': 1, 'appended': 3, 'dropped': 0})
+        self.assertEqual(self.sheet.calls[1:], [('batch_update', 1), ('append_rows', 3)])
+        self.assertEqual(self.sheet.rows[1][4:], ['Annual Plan', 'Renewal Requested', 'Jan. 1, 2024', 'https://drive/ann'])
+        self.assertEqual([row[1] for row in self.sheet.rows[2:]], ['cy@example.com', 'dee@example.com', 'eve@example.com'])
+        self.assertFalse(PendingSheetWrite.objects.exists())
+        self.assertEqual(SheetRowIndex.objects.get(email='eve@example.com').row, 5)
+
+        # The next flush finds the rows from the index with a single read.
+        buffer_row('sheet-id', 'raw_registration', 'dee@example.com', self._row('Dee', 'dee@example.com', url='u'))
+        self.sheet.calls.clear()
+        flush_sheet_writes(self.sheet, 'sheet-id')
+        self.assertEqual([call[0] for call in self.sheet.calls], ['batch_get', 'batch_update'])
+        self.assertEqual(self.sheet.rows[3][7], 'u')
+
+    def test_partial_update_for_missing_row_is_dropped(self):
+        """Test that a status-only update is not appended as a half-empty row."""
+        buffer_row('sheet-id', 'raw_registration', 'gone@example.com',
+                   [None, None, None, None, None, 'Renewal Requested', None, None])
+        with self.assertLogs('blog.sheet_buffer', level='WARNING'):
+            counts = flush_sheet_writes(self.sheet, 'sheet-id')
+        self.assertEqual(counts['dropped'], 1)
+        self.assertEqual(len(self.sheet.rows), 2)
+        self.assertFalse(PendingSheetWrite.objects.exists())
+
+    @override_settings(SHEET_WRITE_BATCH_SIZE=3, SHEET_WRITE_MAX_DELAY=60)
+    def test_flush_scheduled_on_size_or_delay(self):
+        """Test that the flush job waits for the delay unless the batch is full."""
+        buffer_row('sheet-id', 'raw_registration', 'a@example.com', self._row('A', 'a@example.com'))
+        job = BackgroundJob.objects.get(name=SHEET_FLUSH_JOB)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=50))
+        buffer_row('sheet-id', 'raw_registration', 'b@example.com', self._row('B', 'b@example.com'))
+        buffer_row('sheet-id', 'raw_registration', 'c@example.com', self._row('C', 'c@example.com'))
+        job.refresh_from_db()
+        self.assertLessEqual(job.run_at, timezone.now())
+        self.assertEqual(BackgroundJob.objects.filter(name=SHEET_FLUSH_JOB).count(), 1)
+
+        with patch('blog.google_api_utils.get_worksheet', return_value=self.sheet), \
+                self.assertLogs('blog.sheet_buffer', level='INFO'):
+            run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.DONE)
+        self.assertEqual(len(self.sheet.rows), 5)
+
+
+class FakeDriveBatch:
+    """Drive batch request that runs its requests on execute() (one HTTP call)."""
+
+    def __init__(self, callback, batches):
+        self.callback = callback
+        self.requests = []
+        batches.append(self)
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            try:
+                response, exception = request.execute(), None
+            except Exception as e:
+                response, exception = None, e
+            self.callback(request_id, response, exception)
+
+
+class DriveFolderStoreTest(TestCase):
+    """Test cases for Drive folder ids stored on Cohort and SubscriberRequest."""
+
+    def setUp(self):
+        google_api_utils._cohort_folder_ids.clear()
+        self.addCleanup(google_api_utils._cohort_folder_ids.clear)
+        now = timezone.now()
+        self.cohort = Cohort.objects.create(
+            cohort_id='DRIVE_2024', name='Drive', reg_start_date=now - timedelta(days=1),
+            reg_end_date=now + timedelta(days=30), exp_date_6=now + timedelta(days=180),
+            exp_date_12=now + timedelta(days=365),
+        )
+        with patch('blog.signals.jobs.enqueue'):
+            self.ann = SubscriberRequest.objects.create(
+                name='Ann', email='ann@example.com', country='MM', city='Yangon')
+            self.bob = SubscriberRequest.objects.create(
+                name='Bob', email='bob@example.com', country='MM', city='Yangon')
+        self.drive = MagicMock()
+        self.listings = {}
+        self.drive.files.return_value.list.side_effect = self._list
+        self.drive.files.return_value.create.side_effect = self._create
+        self.drive.permissions.return_value.create.side_effect = self._share
+        self.batches = []
+        self.drive.new_batch_http_request.side_effect = lambda callback: FakeDriveBatch(callback, self.batches)
+        self.created = []
+        self.unshareable = set()
+
+    def _create(self, body, fields):
+        folder = self._folder(f'new{len(self.created) + 1}', body['name'])
+        self.created.append(folder)
+        return MagicMock(**{'execute.return_value': folder})
+
+    def _share(self, fileId, body, sendNotificationEmail):
+        if body['emailAddress'] in self.unshareable:
+            return MagicMock(**{'execute.side_effect': RuntimeError('invalid sharing request')})
+        return MagicMock(**{'execute.return_value': {'id': 'perm'}})
+
+    def _list(self, q, **kwargs):
+        """Answer ``files().list`` from ``self.listings`` (folders by parent id)."""
+        files = self.listings.get(re.search(r"'([^']*)' in parents", q).group(1), [])
+        name = re.match(r"name='([^']*)'", q)
+        if name:
+            files = [f for f in files if f['name'] == name.group(1)]
+        return MagicMock(**{'execute.return_value': {'files': files}})
+
+    def _folder(self, folder_id, name):
+        return {'id': folder_id, 'name': name, 'webViewLink': f'https://drive.google.com/drive/folders/{folder_id}'}
+
+    def test_cohort_folder_id_is_stored(self):
+        """Test that a cohort folder is searched for once, then read from the database."""
+        self.listings[google_api_utils.PARENT_FOLDER_ID] = [self._folder('c1', 'DRIVE_2024')]
+        self.assertEqual(google_api_utils.get_or_create_cohort_folder(self.drive, 'DRIVE_2024'), 'c1')
+        google_api_utils._cohort_folder_ids.clear()
+        self.assertEqual(google_api_utils.get_or_create_cohort_folder(self.drive, 'DRIVE_2024'), 'c1')
+        self.assertEqual(self.drive.files.return_value.list.call_count, 1)
+        self.cohort.refresh_from_db()
+        self.assertEqual(self.cohort.drive_folder_id, 'c1')
+
+    @patch('blog.google_api_utils.get_drive_service')
+    def test_subscriber_folder_is_stored(self, mock_get_drive_service):
+        """Test that a subscriber folder found on Drive is stored and reused without Drive calls."""
+        mock_get_drive_service.return_value = self.drive
+        Cohort.objects.filter(pk='DRIVE_2024').update(drive_folder_id='c1')
+        self.listings['c1'] = [self._folder('f1', 'Ann|ann@example.com')]
+        with self.assertLogs('blog.google_api_utils', level='INFO'):
+            url = google_api_utils.get_folder_upload_url(self.ann)
+        self.assertEqual(url, 'https://drive.google.com/drive/folders/f1')
+
+        ann = SubscriberRequest.objects.get(pk=self.ann.pk)
+        self.assertEqual((ann.drive_folder_id, ann.drive_folder_url), ('f1', url))
+        mock_get_drive_service.reset_mock()
+        with patch('blog.google_api_utils._raw_registration_index') as mock_index, \
+                self.assertLogs('blog.google_api_utils', level='INFO'):
+            self.assertEqual(google_api_utils.get_or_create_renewal_url(ann, 'annual'), (url, True))
+        mock_get_drive_service.assert_not_called()
+        mock_index.assert_not_called()
+        # Only plan and status: the registration timestamp and details in the row are kept.
+        self.assertEqual(
+            PendingSheetWrite.objects.get(email='ann@example.com').cells,
+            [None, None, None, None, 'annual', 'Renewal Requested', None, None],
+        )
+
+    @patch('blog.google_api_utils._raw_registration_index')
+    @patch('blog.google_api_utils.get_drive_service')
+    def test_backfill_command(self, mock_get_drive_service, mock_index):
+        """Test that backfill_drive_folders fills folders from the sheet and Drive listings."""
+        mock_get_drive_service.return_value = self.drive
+        sheet = FakeWorksheet([
+            SheetEmailIndexTest.HEADER,
+            ['Ann', 'ann@example.com', '', 'MM', '', '', '', 'https://drive.google.com/drive/folders/sheet1'],
+        ])
+        mock_index.return_value = SheetEmailIndex(sheet, google_api_utils.SPREADSHEET_ID)
+        self.listings[google_api_utils.PARENT_FOLDER_ID] = [self._folder('c1', 'DRIVE_2024')]
+        self.listings['c1'] = [self._folder('f2', 'Bob|bob@example.com')]
+        with patch('blog.signals.jobs.enqueue'):
+            SubscriberRequest.objects.create(name='Cy', email='cy@example.com', country='MM', city='Yangon')
+
+        out = StringIO()
+        with self.assertLogs('blog.google_api_utils', level='INFO'), self.assertLogs('blog.sheet_index', level='INFO'):
+            call_command('backfill_drive_folders', stdout=out)
+        self.assertIn('Stored 1 cohort folders and 2 subscriber folders (1 subscribers', out.getvalue())
+        self.assertEqual(Cohort.objects.get(pk='DRIVE_2024').drive_folder_id, 'c1')
+        self.assertEqual(
+            dict(SubscriberRequest.objects.values_list('email', 'drive_folder_id')),
+            {'ann@example.com': 'sheet1', 'bob@example.com': 'f2', 'cy@example.com': ''},
+        )
+        self.assertEqual(self.drive.files.return_value.list.call_count, 2)
+
+    @patch('blog.google_api_utils.get_drive_service')
+    def test_permissions_are_granted_in_one_batch(self, mock_get_drive_service):
+        """Test that a new folder's two permission grants are one batch request."""
+        mock_get_drive_service.return_value = self.drive
+        Cohort.objects.filter(pk='DRIVE_2024').update(drive_folder_id='c1')
+        with self.assertLogs('blog.google_api_utils', level='INFO'):
+            url = google_api_utils.create_subscriber_folder(self.ann)
+        self.assertEqual(url, 'https://drive.google.com/drive/folders/new1')
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(
+            [request_id for request_id, _ in self.batches[0].requests],
+            ['new1:ann@example.com', f'new1:{google_api_utils.MMDT_ADMIN_EMAIL}'],
+        )
+        self.assertEqual(SubscriberRequest.objects.get(pk=self.ann.pk).drive_folder_id, 'new1')
+
+    @patch('blog.google_api_utils.get_drive_service')
+    def test_cohort_folder_forgotten_only_when_gone(self, mock_get_drive_service):
+        """Test that the stored cohort folder survives other errors but not a 404."""
+        mock_get_drive_service.return_value = self.drive
+        Cohort.objects.filter(pk='DRIVE_2024').update(drive_folder_id='c1')
+        self.unshareable.add('ann@example.com')
+        with self.assertLogs('blog.google_api_utils', level='ERROR'):
+            self.assertIsNone(google_api_utils.create_subscriber_folder(self.ann))
+        self.assertEqual(Cohort.objects.get(pk='DRIVE_2024').drive_folder_id, 'c1')
+
+        self.drive.files.return_value.create.side_effect = HttpError(
+            httplib2.Response({'status': 404}), b'File not found: c1')
+        with self.assertLogs('blog.google_api_utils', level='ERROR'):
+            self.assertIsNone(google_api_utils.create_subscriber_folder(self.ann))
+        self.assertEqual(Cohort.objects.get(pk='DRIVE_2024').drive_folder_id, '')
+
+    @patch('blog.google_api_utils.DRIVE_BATCH_SIZE', 4)
+    @patch('blog.google_api_utils.get_drive_service')
+    def test_provision_cohort_folders_in_batches(self, mock_get_drive_service):
+        """Test that a cohort's folders are listed, created and shared in batch requests."""
+        mock_get_drive_service.return_value = self.drive
+        Cohort.objects.filter(pk='DRIVE_2024').update(drive_folder_id='c1')
+        self.listings['c1'] = [self._folder('ann1', 'Ann|ann@example.com')]
+        with patch('blog.signals.jobs.enqueue'):
+            for name in ('Cy', 'Dee', 'Eve'):
+                SubscriberRequest.objects.create(
+                    name=name, email=f'{name.lower()}@example.com', country='MM', city='Yangon')
+        self.unshareable.add('dee@example.com')
+
+        out = StringIO()
+        with self.assertLogs('blog.google_api_utils', level='INFO'):
+            call_command('provision_drive_folders', 'DRIVE_2024', stdout=out)
+        self.assertIn('Drive folders ready for 4 subscriber requests (1 failed)', out.getvalue())
+        # One listing; 4 creates in one batch; 2 permissions each for 3 folders in two batches.
+        self.assertEqual(self.drive.files.return_value.list.call_count, 1)
+        self.assertEqual([len(batch.requests) for batch in self.batches], [4, 4, 4])
+        self.assertEqual(
+            dict(SubscriberRequest.objects.values_list('email', 'drive_folder_id')),
+            {'ann@example.com': 'ann1', 'bob@example.com': 'new1', 'cy@example.com': 'new2',
+             'dee@example.com': '', 'eve@example.com': 'new4'},
+        )
@@ -1,11 +1,17 @@
 from django.urls import path
 
+from .feeds import LatestPostsAtomFeed, LatestPostsFeed, SubscriberPostsFeed
+
 from .views import AboutUs, OurProject, StProject, PlayGround, OurInstructors, PostDetailView, PostListView, PostListOnlySubscriberView, \
-    subscriber_request, subscriber_request_success
+    PostSearchView, subscriber_request, subscriber_request_success
 
 urlpatterns = [
     path('', PostListView.as_view(), name='home'),
     path('blog/', PostListOnlySubscriberView.as_view(), name='post_list_only_subscriber'),
+    path('blog/search/', PostSearchView.as_view(), name='post_search'),
+    path('blog/feed/', LatestPostsFeed(), name='post_feed'),
+    path('blog/feed/atom/', LatestPostsAtomFeed(), name='post_feed_atom'),
+    path('blog/feed/subscribers/<str:token>/', SubscriberPostsFeed(), name='post_feed_subscribers'),
     path('blog/<slug:slug>/', PostDetailView.as_view(), name='post_detail'),
     path('st_project/', StProject.as_view(), name='st_projects'),
     path('our_instructors/', OurInstructors.as_view(), name='our_instructors'),
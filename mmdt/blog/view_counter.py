@@ -0,0 +1,156 @@
+"""
+Write-coalescing view counter for blog posts.
+
+Post views are added up in memory per worker process and written to the
+database in batches, one ``UPDATE ... SET view_count = view_count + n`` per
+distinct delta, instead of a full-row save on every page view. A batch is
+flushed when ``POST_VIEW_COUNT_FLUSH_INTERVAL`` seconds have passed since the
+last one or ``POST_VIEW_COUNT_FLUSH_THRESHOLD`` views are pending (checked on
+each view and at the end of every request), and once more when the process
+exits.
+
+Because the increments are atomic ``F()`` expressions, concurrent workers
+never lose views and ``Post.updated_on`` is left alone. Pending views of this
+worker are merged into reads with ``current_view_count``.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """Accumulate per-post view deltas and flush them with atomic increments."""
+
+    def __init__(self, flush_interval=30, flush_threshold=100):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._pending = defaultdict(int)
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def increment(self, post_id, count=1):
+        """
+        Record ``count`` views of ``post_id``; flushes if a batch is due.
+
+        Returns:
+            int: Views of ``post_id`` written to the database by that flush
+        """
+        with self._lock:
+            self._pending[post_id] += count
+            self._pending_total += count
+            due = self._is_due()
+        if due:
+            return self._flush().get(post_id, 0)
+        return 0
+
+    def _is_due(self):
+        return (
+            self._pending_total >= self.flush_threshold
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush_if_due(self):
+        """Flush if the interval has passed or the threshold is reached."""
+        with self._lock:
+            due = bool(self._pending) and self._is_due()
+        return self.flush() if due else 0
+
+    def pending(self, post_id):
+        """Views of ``post_id`` recorded in this process but not yet flushed."""
+        with self._lock:
+            return self._pending.get(post_id, 0)
+
+    def current(self, post):
+        """``post.view_count`` as stored plus this process's pending views."""
+        return (post.view_count or 0) + self.pending(post.pk)
+
+    def flush(self):
+        """
+        Write all pending views to the database.
+
+        Returns:
+            int: Number of views written
+        """
+        return sum(self._flush().values())
+
+    def _flush(self):
+        from .models import Post
+
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, defaultdict(int)
+                self._pending_total = 0
+                self._last_flush = time.monotonic()
+            if not pending:
+                return {}
+
+            by_delta = defaultdict(list)
+            for post_id, count in pending.items():
+                by_delta[count].append(post_id)
+            try:
+                with transaction.atomic():
+                    for count, post_ids in by_delta.items():
+                        Post.objects.filter(pk__in=post_ids).update(
+                            view_count=Coalesce(F('view_count'), Value(0)) + count
+                        )
+            except DatabaseError:
+                logger.exception("Failed to flush post view counts; keeping them for the next flush")
+                with self._lock:
+                    for post_id, count in pending.items():
+                        self._pending[post_id] += count
+                        self._pending_total += count
+                return {}
+
+        logger.debug("Flushed %s post views for %s posts", sum(pending.values()), len(pending))
+        return pending
+
+    def clear(self):
+        """Discard pending views without writing them (mainly for tests)."""
+        with self._lock:
+            self._pending = defaultdict(int)
+            self._pending_total = 0
+            self._last_flush = time.monotonic()
+
+
+view_counter = ViewCounter(
+    flush_interval=getattr(settings, 'POST_VIEW_COUNT_FLUSH_INTERVAL', 30),
+    flush_threshold=getattr(settings, 'POST_VIEW_COUNT_FLUSH_THRESHOLD', 100),
+)
+
+
+def record_view(post):
+    """Count one view of ``post`` and return its current view count."""
+    flushed = view_counter.increment(post.pk)
+    return view_counter.current(post) + flushed
+
+
+def current_view_count(post):
+    """Return ``post.view_count`` including views not yet flushed by this process."""
+    return view_counter.current(post)
+
+
+def flush_view_counts():
+    """Write this process's pending views to the database now."""
+    return view_counter.flush()
+
+
+@receiver(request_finished)
+def flush_view_counts_if_due(sender, **kwargs):
+    """Flush a due batch at the end of any request, so quiet posts are written too."""
+    view_counter.flush_if_due()
+
+
+atexit.register(flush_view_counts)
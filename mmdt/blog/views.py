@@ -1,23 +1,32 @@
-import pickle
-
 import numpy as np
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import InvalidPage
+from django.db.models import Count, Max, Sum
+from django.http import Http404
 from django.shortcuts import redirect
 from django.shortcuts import render
-from django.utils import timezone
 from django.views import generic
 from django.views.generic import TemplateView
 
+from .classifier import ClassifierUnavailable, classify_text
+from .feeds import get_subscriber_feed_url
+from .conditional import ConditionalGetMixin, StaticPageMixin
 from .forms import CommentForm, FeedbackAnalyzerForm, SubscriberRequestForm
-from .models import Post, Cohort
+from .models import Comment, Post, Cohort, RelatedPost
+from .related import get_related_posts
+from .search import search_posts
+from .pagination import InvalidCursor, KeysetPaginator
+from .post_cache import get_cached_count, get_cached_keyset_page, get_cached_posts, get_post_cache_version
+from .post_cache import get_timeout as get_post_cache_timeout
+from .view_counter import record_view, view_counter
 
 
 class Home(TemplateView):
     template_name = 'index.html'
 
 
-class AboutUs(TemplateView):
+class AboutUs(StaticPageMixin, TemplateView):
     template_name = 'about.html'
 
 
@@ -25,46 +34,191 @@ class SubscriberInfo(TemplateView):
     template_name = 'subscriber.html'
 
 
-class OurProject(TemplateView):
+class OurProject(StaticPageMixin, TemplateView):
     template_name = 'index.html'
 
 
-class OurInstructors(TemplateView):
+class OurInstructors(StaticPageMixin, TemplateView):
     template_name = 'our_instructors.html'
 
-class StProject(TemplateView):
+class StProject(StaticPageMixin, TemplateView):
     template_name = 'st_project.html'
 
 
-class PostListView(generic.ListView):
+class CachedPostListMixin:
+    """
+    Serve list pages from the post cache (see ``blog.post_cache``).
+
+    Each page's posts and the total count are cached per audience and page
+    number; templates get ``post_cache_version`` / ``post_cache_timeout`` to
+    cache the rendered fragment too.
+
+    Previous/next links use keyset cursors (``?cursor=``, see
+    ``blog.pagination``), which cost one query however deep the page;
+    ``?page=N`` keeps working for old links. The page is computed once per
+    request, so validators and the context share it.
+    """
+    post_cache_audience = None
+    keyset_ordering = ('-created_on', '-id')
+
+    def paginate_queryset(self, queryset, page_size):
+        if getattr(self, '_paginated', None) is None:
+            self._paginated = self._paginate(queryset, page_size)
+        return self._paginated
+
+    def _paginate(self, queryset, page_size):
+        keyset = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        cursor = self.request.GET.get('cursor')
+        if cursor:
+            try:
+                page = get_cached_keyset_page(self.post_cache_audience, keyset, cursor)
+            except InvalidCursor as e:
+                raise Http404(f'Invalid cursor: {e}')
+            return (keyset, page, page.object_list, page.has_other_pages())
+
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        # Paginator.count is a cached_property; seed it so no COUNT(*) query runs.
+        paginator.__dict__['count'] = get_cached_count(self.post_cache_audience, queryset)
+        page = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        try:
+            page_number = int(page)
+        except ValueError:
+            if page == 'last':
+                page_number = paginator.num_pages
+            else:
+                raise Http404('Page is not "last", nor can it be converted to an int.')
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as e:
+            raise Http404(f'Invalid page ({page_number}): {e}')
+        page.object_list = get_cached_posts(self.post_cache_audience, page)
+        page.cursor = None
+        page.next_cursor = page.previous_cursor = None
+        if page.object_list:
+            if page.has_next():
+                page.next_cursor = keyset.cursor_after(page.object_list[-1])
+            if page.has_previous():
+                page.previous_cursor = keyset.cursor_before(page.object_list[0])
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post_cache_version'] = get_post_cache_version()
+        context['post_cache_timeout'] = get_post_cache_timeout()
+        return context
+
+
+class PostListView(ConditionalGetMixin, CachedPostListMixin, generic.ListView):
     model = Post
     template_name = 'post_list.html'
     context_object_name = 'post_list'
     paginate_by = 6
+    post_cache_audience = 'public'
 
     def get_queryset(self):
-        return Post.objects.filter(status=1, subscribers_only=False).order_by('-created_on')
+        return Post.objects.filter(status=1, subscribers_only=False).defer('content', 'content_html').order_by('-created_on', '-id')
+
+    def _current_page(self):
+        # Served from the post cache and reused by get_context_data(), so
+        # computing validators costs no extra queries or cache reads.
+        return self.paginate_queryset(self.get_queryset(), self.get_paginate_by(None))[1]
+
+    def get_etag_parts(self):
+        page = self._current_page()
+        return ('post_list', page.number, page.cursor, page.has_previous(), page.has_next(),
+                tuple((post.pk, post.updated_on) for post in page.object_list))
+
+    def get_last_modified(self):
+        return max((post.updated_on for post in self._current_page().object_list), default=None)
 
 
-class PostListOnlySubscriberView(LoginRequiredMixin, generic.ListView):
+class PostListOnlySubscriberView(LoginRequiredMixin, CachedPostListMixin, generic.ListView):
+    post_cache_audience = 'subscribers'
     model = Post
     template_name = 'post_list_only_subscriber.html'
     context_object_name = 'post_list_only_subscriber'
     paginate_by = 6
 
     def get_queryset(self):
-        return Post.objects.filter(status=1, subscribers_only=True).order_by('-created_on')
+        return Post.objects.filter(status=1, subscribers_only=True).defer('content', 'content_html').order_by('-created_on', '-id')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['subscriber_feed_url'] = self.request.build_absolute_uri(get_subscriber_feed_url(self.request.user))
+        return context
+
+
+class PostSearchView(generic.ListView):
+    """Ranked full-text search over published posts (see ``blog.search``)."""
+    model = Post
+    template_name = 'post_search.html'
+    context_object_name = 'post_list'
+    paginate_by = 6
+
+    def get_search_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        query = self.get_search_query()
+        if not query:
+            return Post.objects.none()
+        queryset = Post.objects.filter(status=1).defer('content', 'content_html')
+        if not self.request.user.is_authenticated:
+            queryset = queryset.filter(subscribers_only=False)
+        return search_posts(queryset, query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['search_query'] = self.get_search_query()
+        return context
 
 
 def subscriptions_upgrade(request):
     return render(request, 'subscriptions_upgrade.html')
 
 
-class PostDetailView(generic.DetailView):
+class PostDetailView(ConditionalGetMixin, generic.DetailView):
     model = Post
     template_name = 'post_detail.html'
     context_object_name = 'post'
 
+    def _content_state(self):
+        if not hasattr(self, '_state'):
+            post = Post.objects.filter(slug=self.kwargs.get(self.slug_url_kwarg)).values('pk', 'updated_on').first()
+            if post is not None:
+                post.update(Comment.objects.filter(post_id=post['pk'], active=True).aggregate(
+                    comment_count=Count('pk'), comment_ids=Sum('pk'), latest_comment=Max('created_on'),
+                ))
+                # Renaming, unpublishing or deleting a related post changes the block too.
+                post.update(RelatedPost.objects.filter(post_id=post['pk']).aggregate(
+                    related_at=Max('computed_at'), related_count=Count('pk'),
+                    related_updated=Max('related__updated_on'),
+                ))
+            self._state = post
+        return self._state
+
+    def get_etag_parts(self):
+        state = self._content_state()
+        if state is None:
+            return None  # let the normal path raise 404
+        return ('post_detail', state['pk'], state['updated_on'],
+                state['comment_count'], state['comment_ids'], state['latest_comment'],
+                state['related_at'], state['related_count'], state['related_updated'])
+
+    def get_last_modified(self):
+        state = self._content_state()
+        return max(filter(None, [state['updated_on'], state['latest_comment']]))
+
+    def not_modified(self, response):
+        # A cached copy is still a view.
+        view_counter.increment(self._content_state()['pk'])
+        return response
+
     def get(self, request, *args, **kwargs):
         self.object = self.get_object(self.get_queryset())
 
@@ -77,13 +231,16 @@ class PostDetailView(generic.DetailView):
 
     def get_object(self, queryset=None):
         post = super().get_object()
-        post.view_count += 1
-        post.save()
+        # Coalesced in memory and flushed in batches; see blog.view_counter.
+        post.view_count = record_view(post)
         return post
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['comments'] = self.object.comments.filter(active=True)
+        context['related_posts'] = get_related_posts(
+            self.object, include_subscriber_posts=self.request.user.is_authenticated,
+        )
         if 'comment_form' not in context:
             context['comment_form'] = CommentForm()
         return context
@@ -93,33 +250,18 @@ class PlayGround(generic.FormView):
     template_name = 'playground/feedback_analyzer.html'
     form_class = FeedbackAnalyzerForm
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.cls = self.load_classifier()
-
-    @staticmethod
-    def load_classifier():
+    def status(self, feedback):
+        # Batched with concurrent requests in this worker; None if the model is missing.
         try:
-            input_file = 'ml_models/model_C=1.0.bin'
-            with open(input_file, 'rb') as f_in:
-                cls = pickle.load(f_in)
-            return cls
-        except FileNotFoundError:
+            return classify_text(feedback)
+        except ClassifierUnavailable:
             return None
 
-    def status(self, df):
-        if self.cls is not None:
-            y_class = self.cls.predict([df])
-            y_pred_prob = self.cls.predict_proba([df])
-            return y_class, y_pred_prob
-        else:
-            return None, None
-
     def form_valid(self, form):
         input_feedback = form.cleaned_data['feedback']
-        y_class, confidence = self.status(input_feedback)
-        result = y_class[0].title() if y_class else 0.0
-        confidence = np.round(confidence[0][0], 3) if confidence is not None else "We can't estimate it"
+        prediction = self.status(input_feedback)
+        result = prediction['label'].title() if prediction else 0.0
+        confidence = np.round(prediction['confidence'], 3) if prediction else "We can't estimate it"
         return self.render_to_response(self.get_context_data(form=form, result=result, confidence=confidence))
 
 
@@ -134,7 +276,7 @@ def subscriber_request(request):
     active_cohort = Cohort.get_active_cohort()
 
     if not active_cohort:
-        next_cohort = Cohort.objects.filter(reg_start_date__gt=timezone.now()).order_by('reg_start_date').first()
+        next_cohort = Cohort.get_upcoming_cohort()
         messages.error(request, 'Registration is currently closed. Please check back during the next registration window.')
         return render(request, 'subscriber_registration_closed.html', {'next_cohort': next_cohort})
 
@@ -145,8 +287,9 @@ def subscriber_request(request):
         if form.is_valid():
 
             form.save()
-            # Google Drive, Sheets, and email (with folder URL) are handled by
-            # blog.signals.handle_subscriber_request_automation for all new requests.
+            # Google Drive, Sheets, and email (with folder URL) are queued by
+            # blog.signals.handle_subscriber_request_automation for all new requests
+            # and run by `manage.py run_jobs`.
 
             messages.success(request, 'Your subscriber request has been submitted successfully.')
             return redirect('subscriber_request_success')
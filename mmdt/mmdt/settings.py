@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 import logging
@@ -60,6 +61,7 @@ INSTALLED_APPS = [
     'django_bootstrap_icons',
     'nested_admin',
     'django.contrib.sites',
+    'django.contrib.sitemaps',
     'django.contrib.auth',
     'django.contrib.messages',
     'allauth',
@@ -75,6 +77,9 @@ INSTALLED_APPS = [
 ]
 
 SITE_ID = 1
+# Domain of the Site row (set by migration users 0006); links in emails sent from
+# background jobs, which have no request, are built from it.
+SITE_DOMAIN = config('SITE_DOMAIN', default='mmdt.istarvz.com')
 
 CSRF_TRUSTED_ORIGINS = ['https://*.istarvz.com', 'https://*.127.0.0.1']
 
@@ -240,6 +245,90 @@ GOOGLE_MEMBERS_WORKSHEET_NAME = config(
     default='members',
 )
 
+# Google credentials/clients are reused per process (blog.google_clients): the token is
+# refreshed this many seconds before it expires, worksheet handles are reopened after the timeout.
+GOOGLE_CREDENTIALS_REFRESH_MARGIN = config('GOOGLE_CREDENTIALS_REFRESH_MARGIN', default=300, cast=int)
+GOOGLE_WORKSHEET_CACHE_TIMEOUT = config('GOOGLE_WORKSHEET_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Sheet row writes are buffered (blog.sheet_buffer) and flushed by run_jobs in one batch
+# this many seconds after the first pending write, or as soon as this many are pending.
+SHEET_WRITE_MAX_DELAY = config('SHEET_WRITE_MAX_DELAY', default=30, cast=int)
+SHEET_WRITE_BATCH_SIZE = config('SHEET_WRITE_BATCH_SIZE', default=20, cast=int)
+
+# Feedback classifier behind the PlayGround view. Loaded once per worker process;
+# set FEEDBACK_CLASSIFIER_PRELOAD=True to load it at startup instead of on first use.
+FEEDBACK_CLASSIFIER_PATH = os.path.join(BASE_DIR, 'ml_models', 'model_C=1.0.bin')
+# Pickle-free export of the same model (``manage.py export_classifier``); preferred when present
+FEEDBACK_CLASSIFIER_ARTIFACT_DIR = os.path.join(BASE_DIR, 'ml_models', 'feedback_classifier')
+FEEDBACK_CLASSIFIER_PRELOAD = config('FEEDBACK_CLASSIFIER_PRELOAD', default=False, cast=bool)
+# Maximum number of texts accepted per call to POST /api/feedback/classify
+FEEDBACK_CLASSIFIER_MAX_BATCH_SIZE = config('FEEDBACK_CLASSIFIER_MAX_BATCH_SIZE', default=1000, cast=int)
+# Micro-batching of concurrent PlayGround requests: wait up to MAX_WAIT_MS for up to
+# MAX_SIZE texts before running one prediction (MAX_WAIT_MS=0 disables batching)
+FEEDBACK_CLASSIFIER_BATCH_MAX_SIZE = config('FEEDBACK_CLASSIFIER_BATCH_MAX_SIZE', default=32, cast=int)
+FEEDBACK_CLASSIFIER_BATCH_MAX_WAIT_MS = config('FEEDBACK_CLASSIFIER_BATCH_MAX_WAIT_MS', default=5, cast=float)
+# Per-process LRU cache of predictions keyed by model version + normalized text
+# (CACHE_SIZE=0 disables it; CACHE_TTL is in seconds, 0 means no expiry)
+FEEDBACK_CLASSIFIER_CACHE_SIZE = config('FEEDBACK_CLASSIFIER_CACHE_SIZE', default=4096, cast=int)
+FEEDBACK_CLASSIFIER_CACHE_TTL = config('FEEDBACK_CLASSIFIER_CACHE_TTL', default=3600, cast=float)
+
+# Post views are counted in memory per worker and written with atomic increments
+# every FLUSH_INTERVAL seconds or FLUSH_THRESHOLD views, whichever comes first
+POST_VIEW_COUNT_FLUSH_INTERVAL = config('POST_VIEW_COUNT_FLUSH_INTERVAL', default=30, cast=float)
+POST_VIEW_COUNT_FLUSH_THRESHOLD = config('POST_VIEW_COUNT_FLUSH_THRESHOLD', default=100, cast=int)
+
+# Shared by every worker process on the host, so the version keys bumped by Post and
+# Cohort signals (blog.post_cache, blog.cohorts) invalidate cached pages and timelines
+# everywhere at once. Files rather than the database, so cache reads and writes never
+# queue on SQLite's lock. Tests use a private in-memory cache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('CACHE_DIR', default=os.path.join(BASE_DIR, 'cache')),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=5000, cast=int),
+        },
+    }
+}
+if sys.argv[1:2] == ['test']:
+    CACHES['default'] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+# Seconds a cached post list page lives; saving or deleting any Post invalidates all pages.
+POST_LIST_CACHE_TIMEOUT = config('POST_LIST_CACHE_TIMEOUT', default=300, cast=int)
+
+# Cohorts are kept in memory per process and reloaded when a Cohort is saved or deleted
+# (signalled through the shared cache, checked every COHORT_VERSION_CHECK_INTERVAL
+# seconds), or after COHORT_TIMELINE_TIMEOUT seconds.
+COHORT_TIMELINE_TIMEOUT = config('COHORT_TIMELINE_TIMEOUT', default=300, cast=int)
+COHORT_VERSION_CHECK_INTERVAL = config('COHORT_VERSION_CHECK_INTERVAL', default=5, cast=float)
+if sys.argv[1:2] == ['test']:
+    # Test rollbacks change cohorts without signals; check the version on every lookup.
+    COHORT_VERSION_CHECK_INTERVAL = 0
+
+# Part of the ETag of template-only pages (About, Projects, ...); set it per release,
+# e.g. to the git commit. When empty, every process restart counts as a new deploy.
+DEPLOY_VERSION = config('DEPLOY_VERSION', default='')
+
+# Resized + WebP copies generated for Post/poll images, stored next to the original.
+# Widths wider than the original are skipped; IMAGE_VARIANTS_LAZY creates missing
+# variants (e.g. for images uploaded before this existed) on first render.
+IMAGE_VARIANT_WIDTHS = [320, 640, 1024, 1600]
+IMAGE_VARIANTS_LAZY = config('IMAGE_VARIANTS_LAZY', default=True, cast=bool)
+
+# Related posts shown on each post page, precomputed by `manage.py rebuild_related_posts`
+RELATED_POSTS_COUNT = config('RELATED_POSTS_COUNT', default=3, cast=int)
+
+# Posts in the RSS/Atom feeds (blog/feed/); feed and sitemap items share the post list cache
+POST_FEED_ITEMS = config('POST_FEED_ITEMS', default=20, cast=int)
+
+# Background jobs (blog.jobs), executed by `manage.py run_jobs`: attempts per job,
+# retry backoff (seconds, doubling up to the max) and when a running job counts as abandoned
+BACKGROUND_JOB_MAX_ATTEMPTS = config('BACKGROUND_JOB_MAX_ATTEMPTS', default=5, cast=int)
+BACKGROUND_JOB_RETRY_DELAY = config('BACKGROUND_JOB_RETRY_DELAY', default=60, cast=int)
+BACKGROUND_JOB_RETRY_MAX_DELAY = config('BACKGROUND_JOB_RETRY_MAX_DELAY', default=3600, cast=int)
+BACKGROUND_JOB_LOCK_TIMEOUT = config('BACKGROUND_JOB_LOCK_TIMEOUT', default=900, cast=int)
+BACKGROUND_JOB_RETENTION_DAYS = config('BACKGROUND_JOB_RETENTION_DAYS', default=14, cast=int)
+
 log_dir = os.path.join(BASE_DIR, 'logs')
 if not os.path.exists(log_dir):
     os.makedirs(log_dir)
@@ -292,6 +381,10 @@ LOGGING = {
     },
 }
 
+# Keep `manage.py test` out of the project log file.
+if sys.argv[1:2] == ['test']:
+    LOGGING['handlers']['timed_rotate_file'] = {'class': 'logging.NullHandler'}
+
 # logging.basicConfig(level=logging.DEBUG) # will use in debug only
 
 LOGIN_REDIRECT_URL = '/'
@@ -307,6 +400,7 @@ ACCOUNT_EMAIL_REQUIRED = True
 ACCOUNT_EMAIL_VERIFICATION = 'mandatory'
 ACCOUNT_AUTHENTICATION_METHOD = 'email'
 ACCOUNT_USERNAME_REQUIRED = False
+ACCOUNT_DEFAULT_HTTP_PROTOCOL = config('ACCOUNT_DEFAULT_HTTP_PROTOCOL', default='https')
 
 ACCOUNT_ADAPTER = 'accounts.adapter.CustomAccountAdapter'
 
@@ -320,6 +414,11 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = 'mmdt@istarvz.com'
 EMAIL_USE_SSL = False
 
+# Outbox (blog.outbox), drained by `manage.py send_queued_emails`: messages per SMTP
+# connection and per minute (0 = unthrottled). Retries use the BACKGROUND_JOB_* settings.
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)
+EMAIL_OUTBOX_RATE_LIMIT = config('EMAIL_OUTBOX_RATE_LIMIT', default=60, cast=int)
+
 if EMAIL_HOST_PASSWORD:
     SESSION_COOKIE_SECURE = True  # Use only if your site is on HTTPS
 else:
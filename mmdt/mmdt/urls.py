@@ -17,8 +17,11 @@ Including another URLconf
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
+from django.contrib.sitemaps.views import sitemap
 from django.urls import include, path
 
+from blog.sitemaps import sitemaps
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -29,6 +32,7 @@ urlpatterns = [
     path('surveys/', include('djf_surveys.urls')),
     path('summernote/', include('django_summernote.urls')),
     path('api/', include('api.urls')),
+    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
 ]
 
 if settings.DEBUG:
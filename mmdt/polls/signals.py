@@ -0,0 +1,24 @@
+"""
+Django signals for poll questions.
+"""
+import logging
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from blog.images import get_variants
+
+from .models import Question
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Question)
+def generate_question_image_variants(sender, instance, **kwargs):
+    """Create resized/WebP copies of a newly uploaded question image."""
+    if not instance.image:
+        return
+    try:
+        get_variants(instance.image, generate=True)
+    except Exception:
+        logger.exception("Failed to generate image variants for question %s", instance.pk)
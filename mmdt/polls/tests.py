@@ -131,6 +131,33 @@ class QuestionIndexViewTests(TestCase):
         response = self.client.get(reverse("polls:index"))
         self.assertQuerySetEqual(response.context["latest_question_list"], [])
 
+    def test_pages_follow_cursors(self):
+        """
+        Next/previous cursors walk the questions five at a time without
+        repeating or skipping any.
+        """
+        questions = []
+        for i in range(12):
+            question = create_question(question_text=f"Question {i}.", days=-i)
+            question.poll_group = self.active_group
+            question.save()
+            questions.append(question)
+
+        seen = []
+        response = self.client.get(reverse("polls:index"))
+        while True:
+            page = response.context["latest_question_list"]
+            seen.extend(page)
+            if not page.has_next():
+                break
+            response = self.client.get(reverse("polls:index"), {"cursor": page.next_cursor})
+        self.assertEqual(seen, questions)
+
+        previous = self.client.get(reverse("polls:index"), {"cursor": page.previous_cursor})
+        self.assertEqual(list(previous.context["latest_question_list"]), questions[5:10])
+        garbage = self.client.get(reverse("polls:index"), {"cursor": "not-a-cursor"})
+        self.assertEqual(list(garbage.context["latest_question_list"]), questions[:5])
+
 
 class PollViewTests(TestCase):
     def setUp(self):
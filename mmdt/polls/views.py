@@ -3,8 +3,27 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.contrib import messages
 from .models import Question, Choice, ActiveGroup
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger, InvalidPage
 from django.contrib.admin.views.decorators import staff_member_required
+from django.utils.http import urlencode
+from blog.pagination import InvalidCursor, KeysetPaginator
+
+# Keyset order of the poll pages: grouped by poll group, newest first.
+QUESTION_ORDERING = ('poll_group', '-pub_date', '-id')
+
+
+def _question_page(questions, per_page, cursor):
+    paginator = KeysetPaginator(questions, per_page, QUESTION_ORDERING)
+    try:
+        return paginator.page(cursor)
+    except InvalidCursor:
+        # If the cursor is unreadable, deliver the first page.
+        return paginator.page()
+
+
+def _index_url(cursor, **params):
+    if cursor:
+        params['cursor'] = cursor
+    return reverse('polls:index') + (f'?{urlencode(params)}' if params else '')
 
 
 @staff_member_required
@@ -23,19 +42,7 @@ class PollHomePage:
        
         # Set the number of polls to display per page
         polls_per_page = 5
-        paginator = Paginator(all_questions, polls_per_page)
-
-        # Get the current page number from the request's GET parameters
-        page = request.GET.get('page')
-
-        try:
-            latest_question_list = paginator.page(page)
-        except PageNotAnInteger:
-            # If page is not an integer, deliver the first page.
-            latest_question_list = paginator.page(1)
-        except EmptyPage:
-            # If page is out of range, deliver the last page of results.
-            latest_question_list = paginator.page(paginator.num_pages)
+        latest_question_list = _question_page(all_questions, polls_per_page, request.GET.get('cursor'))
 
         for question in latest_question_list:
             question.choices = question.choice_set.all()
@@ -59,25 +66,19 @@ class PollHomePage:
         return render(request, 'polls/index.html', context)
 
     def vote(request):
-        # Get the current page number from the request's GET parameters
-        page = request.GET.get('page', 1)
+        # Get the current page cursor from the request's GET parameters
+        cursor = request.GET.get('cursor')
         active_groups = ActiveGroup.objects.filter(is_active=True)
         # Retrieve questions for the current page
-        questions = Question.objects.filter(is_enabled=True, poll_group__in=active_groups.values_list('group_id', flat=True)).order_by('poll_group', '-pub_date')  
-        paginator = Paginator(questions, 5)
-        
-        try:
-            current_page_questions = paginator.page(page)
-        except (EmptyPage, InvalidPage):
-            # If the page is out of range, deliver the last page of results.
-            current_page_questions = paginator.page(paginator.num_pages)
+        questions = Question.objects.filter(is_enabled=True, poll_group__in=active_groups.values_list('group_id', flat=True))
+        current_page_questions = _question_page(questions, 5, cursor)
 
         try:
             for question in current_page_questions:
                 # Check if the question requires registration
                 if question.poll_group and question.poll_group.registration_required and not request.user.is_authenticated:
                     messages.warning(request, f'You need to log in to vote for the questions!!')
-                    return HttpResponseRedirect(reverse('polls:index') + f"?page={page}")
+                    return HttpResponseRedirect(_index_url(cursor))
                 
                 # Proceed with normal logic
                 selected_choice_id = request.POST.get(f'question_{question.id}')
@@ -89,14 +90,14 @@ class PollHomePage:
                 selected_choice.save()
 
             if 'vote_again' in request.POST:
-                return HttpResponseRedirect(reverse('polls:index') + f"?page={page}")
+                return HttpResponseRedirect(_index_url(cursor))
             # Redirect with 'voted' flag after successful voting
-            return HttpResponseRedirect(reverse('polls:index') + f"?voted=true&page={page}")
+            return HttpResponseRedirect(_index_url(cursor, voted='true'))
 
         except (KeyError, Choice.DoesNotExist, ValueError) as e:
             # Display an error message and redirect back to the index page
             messages.error(request, str(e))
-            return HttpResponseRedirect(reverse('polls:index') + f"?page={page}")
+            return HttpResponseRedirect(_index_url(cursor))
         
     def all_results(request):
         # Fetch all questions with is_enabled=True for admins
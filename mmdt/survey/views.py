@@ -3,11 +3,12 @@ import uuid
 from collections import Counter
 
 from django.contrib import messages
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.db.models import Avg
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
+from blog.pagination import InvalidCursor, KeysetPaginator
+
 from .forms import create_survey_form
 from .models import Survey, Response, Question, Choice, UserSurveyResponse, ResponseChoice
 
@@ -70,17 +71,12 @@ class SurveyPage:
 
             # Set the number of questions to display per page
             questions_per_page = 5
-            paginator = Paginator(questions, questions_per_page)
-            # Get the current page number from the request's GET parameters
-            page = request.GET.get('page')
+            paginator = KeysetPaginator(questions, questions_per_page, ordering=('pub_date', 'id'))
             try:
-                current_page_questions = paginator.page(page)
-            except PageNotAnInteger:
-                # If page is not an integer, deliver the first page.
-                current_page_questions = paginator.page(1)
-            except EmptyPage:
-                # If page is out of range, deliver the last page of results.
-                current_page_questions = paginator.page(paginator.num_pages)
+                current_page_questions = paginator.page(request.GET.get('cursor'))
+            except InvalidCursor:
+                # If the cursor is unreadable, deliver the first page.
+                current_page_questions = paginator.page()
 
             SurveyForm = create_survey_form(survey, user_survey_response, current_page_questions)
             form = SurveyForm()
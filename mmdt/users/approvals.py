@@ -0,0 +1,246 @@
+"""
+Bulk approval of subscriber requests.
+
+Approving requests one ``.save()`` at a time runs
+``sync_subscriber_request_to_user_profile`` per request: a user lookup,
+``create_user``, the profile signals and two more saves. ``approve_subscriber_requests()`` reaches the same end state with a
+fixed number of queries per chunk:
+
+* ``SubscriberRequest`` rows get ``status``/``expiry_date`` as ``save()``
+  would set them (requests already past their expiry become ``expired``);
+* existing users are resolved by email in one query, missing ones are
+  ``bulk_create``-d with an unusable password (no key derivation inside the
+  transaction); one background job per chunk then emails each of them a
+  one-time set-password link (``send_set_password_emails``);
+* profiles are created or updated exactly as the signals would
+  (cohort, linked request, expiry date), with ``bulk_create``/``bulk_update``.
+
+Each chunk runs in its own transaction.
+"""
+import logging
+
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, make_password
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from allauth.account.adapter import get_adapter
+from allauth.account.forms import default_token_generator
+from allauth.account.utils import user_pk_to_url_str
+from allauth.utils import build_absolute_uri
+
+from blog import jobs
+from blog.models import Cohort, SubscriberRequest
+from blog.outbox import queue_emails
+
+from .models import UserProfile
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+CHUNK_SIZE = 200
+SET_PASSWORD_EMAIL_JOB = 'users.set_password_emails'
+
+
+def split_name(name):
+    """Split a full name into ``(first_name, last_name)`` like the approval signal."""
+    name_parts = name.strip().split()
+    first_name = name_parts[0] if name_parts else ''
+    last_name = ' '.join(name_parts[1:]) if len(name_parts) > 1 else ''
+    return first_name, last_name
+
+
+def set_password_url(user):
+    """
+    One-time link to allauth's password reset form for ``user``.
+
+    The token is tied to the current password hash, so it stops working
+    once the password is set (or after ``PASSWORD_RESET_TIMEOUT``).
+    """
+    key = f'{user_pk_to_url_str(user)}-{default_token_generator.make_token(user)}'
+    return get_adapter().get_reset_password_from_key_url(key)
+
+
+def queue_set_password_emails(users):
+    """
+    Queue the set-password email for newly created ``users``.
+
+    Args:
+        users: Users created with an unusable password
+
+    Returns:
+        list[OutboundEmail]: The queued messages
+    """
+    password_reset_url = build_absolute_uri(None, reverse('account_reset_password'))
+    messages = []
+    for user in users:
+        html_message = render_to_string('emails/set_password.html', {
+            'name': user.get_full_name() or user.email,
+            'email': user.email,
+            'set_password_url': set_password_url(user),
+            'password_reset_url': password_reset_url,
+        })
+        messages.append({
+            'subject': 'Your MMDT account is ready - set your password',
+            'body': strip_tags(html_message),
+            'to': [user.email],
+            'html_body': html_message,
+            'from_email': settings.EMAIL_HOST_USER,
+        })
+    return queue_emails(messages)
+
+
+@jobs.register(SET_PASSWORD_EMAIL_JOB)
+def send_set_password_emails(user_ids):
+    """
+    Job: queue set-password emails for users that still have no password.
+
+    Building the token reads (and may create) allauth email addresses per
+    user, so it runs here rather than inside the approval transaction.
+    """
+    users = User.objects.filter(pk__in=user_ids, password__startswith=UNUSABLE_PASSWORD_PREFIX).order_by('pk')
+    with transaction.atomic():
+        queued = queue_set_password_emails(users)
+    logger.info("Queued %s set-password email(s)", len(queued))
+
+
+def _cohort_for_new_user(now):
+    # Same lookup as users.signals.create_user_profile for a user joining now.
+    cohort = Cohort.get_active_cohort(now)
+    if not cohort:
+        cohort = Cohort.get_registration_cohort(now)
+    return cohort
+
+
+def _sync_profile(profile, subscriber_request):
+    # Same updates as users.signals.sync_subscriber_request_to_user_profile.
+    profile.subscriber_request = subscriber_request
+    if not profile.current_cohort_id and subscriber_request.cohort_id:
+        profile.current_cohort_id = subscriber_request.cohort_id
+    if subscriber_request.expiry_date and not profile.expiry_date:
+        profile.expiry_date = subscriber_request.expiry_date
+
+
+def _approve_chunk(ids, result):
+    now = timezone.now()
+    requests = list(SubscriberRequest.objects.select_for_update().filter(pk__in=ids).order_by('pk'))
+    cohorts = Cohort.objects.in_bulk({sr.cohort_id for sr in requests if sr.cohort_id})
+
+    approved = []
+    for sr in requests:
+        sr.cohort = cohorts.get(sr.cohort_id)
+        # What SubscriberRequest.save() does before the signals run.
+        if not sr.expiry_date:
+            sr.expiry_date = sr.calculate_expiry_date()
+        if sr.expiry_date and now >= sr.expiry_date:
+            sr.status = 'expired'
+            result['expired'].append(sr.email)
+        else:
+            sr.status = 'approved'
+            approved.append(sr)
+        sr.updated_at = now
+
+    # Keyed by lowercased email: addresses are matched case-insensitively.
+    users = {}
+    existing = (
+        User.objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in={sr.email.lower() for sr in approved})
+        .order_by('pk')
+    )
+    for user in existing:
+        users.setdefault(user.email_lower, user)
+
+    missing = [sr for sr in approved if sr.email.lower() not in users]
+    taken = set(
+        User.objects.annotate(username_lower=Lower('username'))
+        .filter(username_lower__in=[sr.email.lower() for sr in missing])
+        .values_list('username_lower', flat=True)
+    )
+    skipped = {sr.pk for sr in missing if sr.email.lower() in taken}
+    for sr in requests:
+        if sr.pk in skipped:
+            result['skipped'].append(sr.email)
+            logger.warning("Not approving %s: username taken by an account with another email", sr.email)
+    approved = [sr for sr in approved if sr.pk not in skipped]
+    missing = [sr for sr in missing if sr.pk not in skipped]
+
+    new_users, seen = [], set()
+    for sr in missing:
+        if sr.email.lower() in seen:
+            continue  # same address in another case; gets the same account
+        seen.add(sr.email.lower())
+        first_name, last_name = split_name(sr.name)
+        new_users.append(User(
+            username=User.normalize_username(sr.email),
+            email=User.objects.normalize_email(sr.email),
+            password=make_password(None),
+            first_name=first_name,
+            last_name=last_name,
+            is_active=True,
+            date_joined=now,
+        ))
+    User.objects.bulk_create(new_users)
+    created = {user.username: user for user in User.objects.filter(username__in=[u.username for u in new_users])}
+    new_user_ids = {user.pk for user in created.values()}
+    for sr in missing:
+        if sr.email.lower() not in users:
+            users[sr.email.lower()] = created[User.normalize_username(sr.email)]
+
+    profiles = {p.user_id: p for p in UserProfile.objects.filter(user_id__in=[u.pk for u in users.values()])}
+    new_user_cohort = _cohort_for_new_user(now) if missing else None
+    new_profiles, changed_profiles = [], []
+    for sr in approved:
+        user = users[sr.email.lower()]
+        profile = profiles.get(user.pk)
+        if profile is None:
+            profile = UserProfile(user=user)
+            if user.pk in new_user_ids:
+                profile.current_cohort = new_user_cohort or sr.cohort
+            profiles[user.pk] = profile
+            new_profiles.append(profile)
+        else:
+            profile.updated_at = now
+            changed_profiles.append(profile)
+        _sync_profile(profile, sr)
+        result['new_users' if user.pk in new_user_ids else 'existing_users'].append(sr.email)
+
+    SubscriberRequest.objects.bulk_update(
+        [sr for sr in requests if sr.pk not in skipped], ['status', 'expiry_date', 'updated_at']
+    )
+    UserProfile.objects.bulk_create(new_profiles)
+    UserProfile.objects.bulk_update(
+        changed_profiles, ['subscriber_request', 'current_cohort', 'expiry_date', 'updated_at']
+    )
+    if new_user_ids:
+        jobs.enqueue(SET_PASSWORD_EMAIL_JOB, user_ids=sorted(new_user_ids))
+
+
+def approve_subscriber_requests(subscriber_requests, chunk_size=CHUNK_SIZE):
+    """
+    Approve ``subscriber_requests`` and create/sync their users and profiles.
+
+    Args:
+        subscriber_requests: Queryset or iterable of ``SubscriberRequest``
+        chunk_size: Requests handled per transaction
+
+    Returns:
+        dict: Emails per outcome: ``new_users``, ``existing_users``,
+        ``expired`` (past expiry, marked expired) and ``skipped``
+        (username taken by an account with another email, left unchanged)
+    """
+    ids = sorted(sr.pk for sr in subscriber_requests)
+    result = {'new_users': [], 'existing_users': [], 'expired': [], 'skipped': []}
+    for start in range(0, len(ids), chunk_size):
+        with transaction.atomic():
+            _approve_chunk(ids[start:start + chunk_size], result)
+    logger.info(
+        "Approved %s subscriber request(s): %s new users, %s existing, %s expired, %s skipped",
+        len(result['new_users']) + len(result['existing_users']), len(result['new_users']),
+        len(result['existing_users']), len(result['expired']), len(result['skipped']),
+    )
+    return result
@@ -7,26 +7,24 @@ whose email is **not** on the sheet are left unchanged.
 
 Uses the same spreadsheet / OAuth setup as ``sync_expiry_from_sheet``.
 
-Each ``.save()`` runs separately so ``post_save`` on ``SubscriberRequest`` fires
-(user creation / profile sync).
+Matching requests are approved in bulk by ``users.approvals``, which creates
+users and syncs profiles exactly like the ``post_save`` signals would.
 """
 import logging
 
-from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
 
 from blog.google_api_utils import fetch_members_sheet_emails
 from blog.models import SubscriberRequest
+from users.approvals import approve_subscriber_requests
 
 logger = logging.getLogger(__name__)
-User = get_user_model()
 
 
 class Command(BaseCommand):
     help = (
         "Approve SubscriberRequest rows that are pending AND listed on the members sheet "
-        "(Email column); relies on post_save signals for User/UserProfile."
+        "(Email column); creates User/UserProfile rows in bulk."
     )
 
     def handle(self, *args, **options):
@@ -45,52 +43,38 @@ class Command(BaseCommand):
         pending_qs = SubscriberRequest.objects.filter(status="pending").order_by("pk")
         pending_count = pending_qs.count()
 
-        approved_new_user = 0
-        approved_existing_user = 0
-        skipped = 0
-        matched_pending = 0
-
-        with transaction.atomic():
-            for sr in pending_qs.select_for_update():
-                if sr.email.strip().lower() not in sheet_set:
-                    logger.info(f"still waiting to be approved for {sr.email}")
-                    continue
-
-                matched_pending += 1
-
-                if User.objects.filter(username__iexact=sr.email).exclude(
-                    email__iexact=sr.email
-                ).exists():
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f"Skipped {sr.email} - Username conflict (another account uses "
-                            f"this username with a different email)."
-                        )
-                    )
-                    skipped += 1
-                    continue
-
-                user_existed = User.objects.filter(email__iexact=sr.email).exists()
-
-                sr.status = "approved"
-                sr.save()
-
-                if user_existed:
-                    self.stdout.write(
-                        f"Approved {sr.email} (user already existed; profile synced via signal)."
-                    )
-                    approved_existing_user += 1
-                else:
-                    self.stdout.write(
-                        f"Approved {sr.email} and triggered user creation,"
-                    )
-                    approved_new_user += 1
-
-                logger.info(
-                    "sync_approvals: approved email=%s user_existed_before=%s",
-                    sr.email,
-                    user_existed,
+        matched = []
+        for sr in pending_qs:
+            if sr.email.strip().lower() not in sheet_set:
+                logger.info(f"still waiting to be approved for {sr.email}")
+                continue
+            matched.append(sr)
+        matched_pending = len(matched)
+
+        result = approve_subscriber_requests(matched)
+
+        for email in result['skipped']:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"Skipped {email} - Username conflict (another account uses "
+                    f"this username with a different email)."
                 )
+            )
+        for email in result['existing_users']:
+            self.stdout.write(
+                f"Approved {email} (user already existed; profile synced)."
+            )
+        for email in result['new_users']:
+            self.stdout.write(
+                f"Approved {email} and created the user."
+            )
+        for email in result['expired']:
+            self.stdout.write(
+                self.style.WARNING(f"Marked {email} expired (past expiry date).")
+            )
+        approved_new_user = len(result['new_users'])
+        approved_existing_user = len(result['existing_users'])
+        skipped = len(result['skipped'])
 
         self.stdout.write(
             self.style.SUCCESS(
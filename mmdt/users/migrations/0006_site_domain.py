@@ -0,0 +1,24 @@
+# Points the current Site at the production domain, so absolute links built
+# without a request (set-password emails sent by background jobs) use it.
+
+from django.conf import settings
+from django.db import migrations
+
+
+def set_site_domain(apps, schema_editor):
+    Site = apps.get_model("sites", "Site")
+    Site.objects.update_or_create(
+        pk=settings.SITE_ID,
+        defaults={"domain": settings.SITE_DOMAIN, "name": settings.SITE_DOMAIN},
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sites", "0002_alter_domain_unique"),
+        ("users", "0005_userprofile_renewal_approved_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(set_site_domain, migrations.RunPython.noop),
+    ]
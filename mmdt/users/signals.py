@@ -2,7 +2,9 @@ from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 from django.utils import timezone
+from blog import jobs
 from .models import UserProfile
+from .approvals import SET_PASSWORD_EMAIL_JOB
 
 
 @receiver(post_save, sender=User)
@@ -18,10 +20,7 @@ def create_user_profile(sender, instance, created, **kwargs):
         
         # If no active cohort found, find any cohort whose registration window contains the user creation date
         if not cohort:
-            cohort = Cohort.objects.filter(
-                reg_start_date__lte=user_creation_date,
-                reg_end_date__gte=user_creation_date
-            ).order_by('-reg_start_date').first()
+            cohort = Cohort.get_registration_cohort(user_creation_date)
         
         # Try to find an approved subscriber request matching the user's email
         subscriber_request = None
@@ -68,15 +67,17 @@ def sync_subscriber_request_to_user_profile(sender, instance, **kwargs):
             first_name = name_parts[0] if name_parts else ''
             last_name = ' '.join(name_parts[1:]) if len(name_parts) > 1 else ''
             
-            # Create user with default password
+            # Create user with an unusable password (no hashing cost) and
+            # email a one-time link to choose one
             user = User.objects.create_user(
                 username=instance.email,
                 email=instance.email,
-                password='mmdt@Welcome', #default password
+                password=None,
                 first_name=first_name,
                 last_name=last_name,
                 is_active=True,  # User is active by default
             )
+            jobs.enqueue(SET_PASSWORD_EMAIL_JOB, user_ids=[user.pk])
         
         # Get or create user profile
         profile, created = UserProfile.objects.get_or_create(user=user)
@@ -1,14 +1,22 @@
+import re
 from datetime import timedelta
+from io import StringIO
 from unittest.mock import patch
+from urllib.parse import urlsplit
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import AccessToken
 
+from blog.jobs import run_pending_jobs
+from users.approvals import approve_subscriber_requests
 from users.models import UserProfile
-from blog.models import Cohort, SubscriberRequest
+from blog.models import Cohort, OutboundEmail, SubscriberRequest
 
 
 User = get_user_model()
@@ -653,4 +661,186 @@ class SubscriberRequestSignalTest(TestCase):
         subscribers = SubscriberRequest.objects.all()
         # Should be ordered by -created_at (newest first)
         self.assertEqual(subscribers[0], subscriber2)
-        self.assertEqual(subscribers[1], subscriber1)
\ No newline at end of file
+        self.assertEqual(subscribers[1], subscriber1)
+
+class BulkApprovalTest(TestCase):
+    """Test cases for users.approvals.approve_subscriber_requests."""
+
+    def setUp(self):
+        patcher = patch(
+            'blog.signals.get_or_create_subscriber_folder_url',
+            return_value='https://drive.google.com/mock-folder',
+        )
+        self.mock_get_folder_url = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        now = self.now = timezone.now()
+        self.cohort = Cohort.objects.create(
+            cohort_id='BULK_2024',
+            name='Bulk Cohort',
+            reg_start_date=now - timedelta(days=1),
+            reg_end_date=now + timedelta(days=30),
+            exp_date_6=now + timedelta(days=180),
+            exp_date_12=now + timedelta(days=365),
+            is_active=True
+        )
+        self.old_cohort = Cohort.objects.create(
+            cohort_id='BULK_2023',
+            name='Old Cohort',
+            reg_start_date=now - timedelta(days=400),
+            reg_end_date=now - timedelta(days=370),
+            exp_date_6=now - timedelta(days=200),
+            exp_date_12=now + timedelta(days=10),
+            is_active=False
+        )
+
+    def _scenario(self, prefix):
+        """Requests covering every approval path; returns them in a fixed order."""
+        def make(name, cohort=self.cohort, **kw):
+            return SubscriberRequest.objects.create(
+                name=name, email=f'{prefix}-{name.split()[0].lower()}@example.com', country='Myanmar',
+                city='Yangon', cohort=cohort, **kw)
+
+        existing = User.objects.create_user(username=f'{prefix}-existing@example.com',
+                                            email=f'{prefix}-existing@example.com', password='x')
+        existing.profile.current_cohort = None
+        existing.profile.save()
+        with_expiry = User.objects.create_user(username=f'{prefix}-renewing@example.com',
+                                               email=f'{prefix}-renewing@example.com', password='x')
+        with_expiry.profile.expiry_date = self.now + timedelta(days=3)
+        with_expiry.profile.save()
+        return [
+            make('New Member Three Names'),
+            make('Solo', plan='annual'),
+            make('Existing User'),
+            make('Renewing User'),
+            make('Old Member', cohort=self.old_cohort, plan='annual'),
+            make('Lapsed Member', expiry_date=self.now - timedelta(days=1)),
+        ]
+
+    def _snapshot(self, requests, prefix):
+        rows = []
+        for sr in requests:
+            sr.refresh_from_db()
+            user = User.objects.filter(email=sr.email).first()
+            profile = getattr(user, 'profile', None)
+            rows.append((
+                sr.email.replace(f'{prefix}-', ''), sr.status, sr.expiry_date,
+                user and (user.username.replace(f'{prefix}-', ''), user.first_name, user.last_name, user.is_active,
+                          user.has_usable_password() and user.check_password('x')),
+                profile and (profile.current_cohort_id, profile.subscriber_request_id == sr.pk,
+                             profile.expiry_date, profile.expired),
+            ))
+        return rows
+
+    def test_same_end_state_as_signal_path(self):
+        """Test that bulk approval matches approving each request with save()."""
+        one_by_one = self._scenario('save')
+        for sr in one_by_one:
+            sr.status = 'approved'
+            sr.save()
+
+        bulk = self._scenario('bulk')
+        result = approve_subscriber_requests(SubscriberRequest.objects.filter(pk__in=[sr.pk for sr in bulk]),
+                                             chunk_size=4)
+
+        self.maxDiff = None
+        self.assertEqual(self._snapshot(bulk, 'bulk'), self._snapshot(one_by_one, 'save'))
+        self.assertEqual(sorted(result['new_users']),
+                         ['bulk-new@example.com', 'bulk-old@example.com', 'bulk-solo@example.com'])
+        self.assertEqual(sorted(result['existing_users']), ['bulk-existing@example.com', 'bulk-renewing@example.com'])
+        self.assertEqual(result['expired'], ['bulk-lapsed@example.com'])
+        run_pending_jobs()
+        self.assertEqual(
+            sorted(email for (email,) in OutboundEmail.objects.filter(subject__contains='set your password')
+                   .values_list('to', flat=True)),
+            ['bulk-new@example.com', 'bulk-old@example.com', 'bulk-solo@example.com',
+             'save-new@example.com', 'save-old@example.com', 'save-solo@example.com'],
+        )
+
+    def test_set_password_link_works_once(self):
+        """Test that a new user can set a password through the emailed link, only once."""
+        sr = SubscriberRequest.objects.create(name='Link User', email='link@example.com', country='Myanmar',
+                                              city='Yangon', cohort=self.cohort)
+        approve_subscriber_requests([sr])
+        user = User.objects.get(email='link@example.com')
+        self.assertFalse(user.has_usable_password())
+        run_pending_jobs()
+
+        outbound = OutboundEmail.objects.get(subject__contains='set your password')
+        url = re.search(r'href="([^"]*/password/reset/key/[^"]*)"', outbound.html_body).group(1)
+        self.assertIn(url, outbound.body)
+        path = urlsplit(url).path
+        response = self.client.get(path, follow=True)
+        form_path = response.redirect_chain[-1][0]
+        self.client.post(form_path, {'password1': 'Fresh-Passw0rd!', 'password2': 'Fresh-Passw0rd!'})
+        user.refresh_from_db()
+        self.assertTrue(user.check_password('Fresh-Passw0rd!'))
+
+        self.client.logout()
+        response = self.client.get(path, follow=True)
+        self.assertTrue(response.context['token_fail'])
+
+    def test_set_password_link_uses_site_domain_over_https(self):
+        """Test that the link emailed from the background job points at the production site."""
+        sr = SubscriberRequest.objects.create(name='Domain User', email='domain@example.com', country='Myanmar',
+                                              city='Yangon', cohort=self.cohort)
+        approve_subscriber_requests([sr])
+        run_pending_jobs()
+
+        outbound = OutboundEmail.objects.get(subject__contains='set your password')
+        url = re.search(r'href="([^"]*/password/reset/key/[^"]*)"', outbound.html_body).group(1)
+        self.assertEqual(urlsplit(url)[:2], ('https', settings.SITE_DOMAIN))
+        self.assertEqual(Site.objects.get_current().domain, settings.SITE_DOMAIN)
+
+    def test_query_count_does_not_grow_with_requests(self):
+        """Test that a chunk costs a fixed number of queries."""
+        requests = [
+            SubscriberRequest.objects.create(name=f'Member {i}', email=f'member{i}@example.com',
+                                             country='Myanmar', city='Yangon', cohort=self.cohort)
+            for i in range(40)
+        ]
+        with self.assertNumQueries(13):
+            result = approve_subscriber_requests(requests)
+        self.assertEqual(len(result['new_users']), 40)
+        self.assertEqual(UserProfile.objects.filter(subscriber_request__in=requests).count(), 40)
+        self.assertFalse(SubscriberRequest.objects.exclude(status='approved').exists())
+
+    def test_username_conflict_is_skipped(self):
+        """Test that a request whose email is another account's username stays pending."""
+        User.objects.create_user(username='taken@example.com', email='other@example.com', password='x')
+        sr = SubscriberRequest.objects.create(name='Taken', email='taken@example.com', country='Myanmar',
+                                              city='Yangon', cohort=self.cohort)
+        result = approve_subscriber_requests([sr])
+        self.assertEqual(result['skipped'], ['taken@example.com'])
+        sr.refresh_from_db()
+        self.assertEqual(sr.status, 'pending')
+
+    def test_existing_user_matched_case_insensitively(self):
+        """Test that an account stored as Foo@x.com is linked to a request for foo@x.com."""
+        user = User.objects.create_user(username='Mixed@example.com', email='Mixed@example.com', password='x')
+        sr = SubscriberRequest.objects.create(name='Mixed Case', email='mixed@example.com', country='Myanmar',
+                                              city='Yangon', cohort=self.cohort)
+        result = approve_subscriber_requests([sr])
+        self.assertEqual(result['existing_users'], ['mixed@example.com'])
+        self.assertEqual(result['skipped'], [])
+        self.assertEqual(User.objects.filter(email__iexact='mixed@example.com').count(), 1)
+        user.profile.refresh_from_db()
+        self.assertEqual(user.profile.subscriber_request, sr)
+
+    @patch('users.management.commands.sync_approvals.fetch_members_sheet_emails')
+    def test_sync_approvals_uses_bulk_service(self, mock_fetch):
+        """Test that sync_approvals approves only pending requests listed on the sheet."""
+        listed = SubscriberRequest.objects.create(name='Listed', email='listed@example.com', country='Myanmar',
+                                                  city='Yangon', cohort=self.cohort)
+        unlisted = SubscriberRequest.objects.create(name='Unlisted', email='unlisted@example.com',
+                                                    country='Myanmar', city='Yangon', cohort=self.cohort)
+        mock_fetch.return_value = ['LISTED@example.com ']
+        out = StringIO()
+        call_command('sync_approvals', stdout=out)
+        listed.refresh_from_db()
+        unlisted.refresh_from_db()
+        self.assertEqual(listed.status, 'approved')
+        self.assertEqual(unlisted.status, 'pending')
+        self.assertTrue(User.objects.filter(email='listed@example.com').exists())
+        self.assertIn('Approved (new user path): 1', out.getvalue())